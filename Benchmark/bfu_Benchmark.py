@@ -0,0 +1,583 @@
+#====================== BEGIN GPL LICENSE BLOCK ============================
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.	 See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.	 If not, see <http://www.gnu.org/licenses/>.
+#  All rights reserved.
+#
+#======================= END GPL LICENSE BLOCK =============================
+
+# ----------------------------------------------
+#  Benchmark of the Blender for UnrealEngine add-on (2.8).
+#  Build a synthetic scene and time each stage of the export pipeline.
+#
+#  Run without GPU:
+#  blender --background --factory-startup --python bfu_Benchmark.py -- [options]
+#
+#  Options:
+#  --preset small|medium|large|huge    Scene size preset (default: small)
+#                                 huge (10k assets, 100k frames) is made for the text writers, use it with --noexport
+#  --static N --sockets N --collisions N --subdiv N
+#  --armatures N --bones N --actions N --frames N
+#  --cameras N --markers N --collections N --collectionobjects N
+#  --repeat N                     Number of run of each stage (default: 3)
+#  --bake                         Compare the NLA bake operator and the fast bake of bakeArmatureAction (one run)
+#  --bakebones N --bakeframes N   Size of the rig baked with --bake (default: 200 bones, 10000 frames)
+#  --bakeepsilon X                Max difference allowed between the two bakes, else exit with code 1 (default: 0.0001)
+#  --noexport                     Skip the ExportForUnrealEngine stage, the exported assets list is filled from the export plan
+#  --output path.json             Save the results (default: print only)
+#  --compare path.json            Compare with the results of a previous run
+#  --keep                         Keep the temporary folder
+# ----------------------------------------------
+
+
+import bpy
+import bmesh
+import sys
+import os
+import time
+import json
+import shutil
+import argparse
+import tempfile
+import platform
+import importlib
+import addon_utils
+from mathutils import Vector
+
+
+addonName = "blender-for-unrealengine"
+addonFolder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "blender-for-unrealengine - 2.8")
+
+presets = {
+	"small": {
+		"static": 20, "sockets": 1, "collisions": 1, "subdiv": 2,
+		"armatures": 2, "bones": 20, "actions": 4, "frames": 50,
+		"cameras": 2, "markers": 4, "collections": 2, "collectionobjects": 5,
+		},
+	"medium": {
+		"static": 200, "sockets": 2, "collisions": 2, "subdiv": 3,
+		"armatures": 5, "bones": 60, "actions": 10, "frames": 200,
+		"cameras": 5, "markers": 20, "collections": 10, "collectionobjects": 10,
+		},
+	"large": {
+		"static": 1000, "sockets": 4, "collisions": 4, "subdiv": 3,
+		"armatures": 10, "bones": 120, "actions": 20, "frames": 500,
+		"cameras": 10, "markers": 100, "collections": 20, "collectionobjects": 20,
+		},
+	"huge": {
+		"static": 10000, "sockets": 0, "collisions": 0, "subdiv": 0,
+		"armatures": 2, "bones": 10, "actions": 4, "frames": 100000,
+		"cameras": 2, "markers": 100, "collections": 0, "collectionobjects": 0,
+		},
+	}
+
+
+def ParseArguments():
+	#Only the arguments after "--" are for this script
+
+	argv = sys.argv[sys.argv.index("--")+1:] if "--" in sys.argv else []
+	parser = argparse.ArgumentParser(description="Blender for UnrealEngine benchmark")
+	parser.add_argument("--preset", default="small", choices=sorted(presets.keys()))
+	for key in presets["small"].keys():
+		parser.add_argument("--"+key, type=int, default=None)
+	parser.add_argument("--repeat", type=int, default=3)
+	parser.add_argument("--noexport", action="store_true")
+	parser.add_argument("--bake", action="store_true")
+	parser.add_argument("--bakebones", type=int, default=200)
+	parser.add_argument("--bakeframes", type=int, default=10000)
+	parser.add_argument("--bakeepsilon", type=float, default=1e-4)
+	parser.add_argument("--output", default=None)
+	parser.add_argument("--compare", default=None)
+	parser.add_argument("--keep", action="store_true")
+	args = parser.parse_args(argv)
+
+	config = dict(presets[args.preset])
+	for key in config.keys():
+		if getattr(args, key) is not None:
+			config[key] = getattr(args, key)
+	return args, config
+
+
+def EnableAddon(workDir):
+	#The add-on must be loaded with the name "blender-for-unrealengine" because it find his preferences with it
+
+	addonsDir = os.path.join(workDir, "addons")
+	os.makedirs(addonsDir)
+	target = os.path.join(addonsDir, addonName)
+	try:
+		os.symlink(addonFolder, target, target_is_directory=True)
+	except (OSError, NotImplementedError):
+		shutil.copytree(addonFolder, target, ignore=shutil.ignore_patterns("__pycache__"))
+	sys.path.insert(0, addonsDir)
+	addon_utils.enable(addonName, default_set=True)
+	if addonName not in sys.modules:
+		raise RuntimeError("Unable to enable the add-on from "+addonFolder)
+
+
+def GetAddonModule(name):
+	return importlib.import_module(addonName+"."+name)
+
+
+def NewMeshObject(name, subdiv, collection):
+	#Create a mesh object with a subdivided cube
+
+	bm = bmesh.new()
+	bmesh.ops.create_cube(bm, size=2.0)
+	if subdiv > 0:
+		bmesh.ops.subdivide_edges(bm, edges=bm.edges[:], cuts=subdiv, use_grid_fill=True)
+	mesh = bpy.data.meshes.new(name)
+	bm.to_mesh(mesh)
+	bm.free()
+	mesh.uv_layers.new(name="UVMap")
+	obj = bpy.data.objects.new(name, mesh)
+	collection.objects.link(obj)
+	return obj
+
+
+def CreateStaticMeshes(config, collection):
+	for x in range(config["static"]):
+		obj = NewMeshObject("SM_Bench_"+str(x), config["subdiv"], collection)
+		obj.location = Vector(((x % 32)*4.0, (x // 32)*4.0, 0.0))
+		obj.ExportEnum = "export_recursive"
+		for y in range(config["collisions"]):
+			collision = NewMeshObject("UCX_"+obj.name+"_"+str(y+1).zfill(2), 0, collection)
+			collision.parent = obj
+			collision.scale = Vector((0.5, 0.5, 0.5))
+		for y in range(config["sockets"]):
+			socket = bpy.data.objects.new("SOCKET_"+obj.name+"_"+str(y+1).zfill(2), None)
+			collection.objects.link(socket)
+			socket.parent = obj
+			socket.location = Vector((0.0, 0.0, 1.0+y))
+
+
+def CreateArmatures(config, collection):
+	for x in range(config["armatures"]):
+		armature = bpy.data.armatures.new("SK_Bench_"+str(x))
+		obj = bpy.data.objects.new("SK_Bench_"+str(x), armature)
+		collection.objects.link(obj)
+		obj.location = Vector((-10.0-x*4.0, 0.0, 0.0))
+		obj.ExportEnum = "export_recursive"
+		obj.exportActionEnum = "export_auto"
+
+		#Bone chain
+		bpy.context.view_layer.objects.active = obj
+		bpy.ops.object.mode_set(mode='EDIT')
+		boneNames = []
+		parent = None
+		for y in range(config["bones"]):
+			bone = armature.edit_bones.new("Bone_"+str(y).zfill(3))
+			bone.head = Vector((0.0, 0.0, y*0.2))
+			bone.tail = Vector((0.0, 0.0, y*0.2+0.2))
+			if parent is not None:
+				bone.parent = parent
+				bone.use_connect = True
+			parent = bone
+			boneNames.append(bone.name)
+		bpy.ops.object.mode_set(mode='OBJECT')
+
+		#Skinned mesh
+		mesh = NewMeshObject("SK_Bench_"+str(x)+"_Mesh", config["subdiv"], collection)
+		mesh.parent = obj
+		mesh.scale = Vector((0.5, 0.5, config["bones"]*0.1))
+		mesh.location = Vector((0.0, 0.0, config["bones"]*0.1))
+		modifier = mesh.modifiers.new("Armature", 'ARMATURE')
+		modifier.object = obj
+		groups = [mesh.vertex_groups.new(name=name) for name in boneNames]
+		for vertex in mesh.data.vertices:
+			index = min(int((vertex.co.z+1.0)*0.5*len(groups)), len(groups)-1)
+			groups[index].add([vertex.index], 1.0, 'REPLACE')
+
+		#Actions
+		obj.animation_data_create()
+		for y in range(config["actions"]):
+			action = bpy.data.actions.new("Anim_Bench_"+str(x)+"_"+str(y))
+			action.use_fake_user = True
+			for name in boneNames:
+				dataPath = 'pose.bones["'+name+'"].rotation_quaternion'
+				for index in range(4):
+					fcurve = action.fcurves.new(dataPath, index=index, action_group=name)
+					fcurve.keyframe_points.add(config["frames"])
+					coords = []
+					for frame in range(config["frames"]):
+						value = 1.0 if index == 0 else 0.1*((frame+y+index) % 7)
+						coords.extend((frame+1, value))
+					fcurve.keyframe_points.foreach_set("co", coords)
+					fcurve.update()
+			obj.animation_data.action = action
+
+
+def CreateCameras(config, collection):
+	scene = bpy.context.scene
+	cameras = []
+	for x in range(config["cameras"]):
+		camera = bpy.data.cameras.new("Cam_Bench_"+str(x))
+		obj = bpy.data.objects.new("Cam_Bench_"+str(x), camera)
+		collection.objects.link(obj)
+		obj.location = Vector((0.0, -20.0-x*2.0, 2.0))
+		obj.ExportEnum = "export_recursive"
+		cameras.append(obj)
+
+	if len(cameras) > 0:
+		sectionLength = max(1, (scene.frame_end-scene.frame_start+1) // max(1, config["markers"]))
+		for x in range(config["markers"]):
+			marker = scene.timeline_markers.new("Marker_"+str(x), frame=scene.frame_start+x*sectionLength)
+			marker.camera = cameras[x % len(cameras)]
+		scene.camera = cameras[0]
+
+
+def CreateCollections(config):
+	scene = bpy.context.scene
+	for x in range(config["collections"]):
+		collection = bpy.data.collections.new("COL_Bench_"+str(x))
+		scene.collection.children.link(collection)
+		for y in range(config["collectionobjects"]):
+			obj = NewMeshObject("COL_Bench_"+str(x)+"_"+str(y), config["subdiv"], collection)
+			obj.location = Vector((y*3.0, 40.0+x*4.0, 0.0))
+			obj.ExportEnum = "dont_export"
+		col = scene.CollectionExportList.add()
+		col.name = collection.name
+		col.use = True
+
+
+def CheckLayoutInstances():
+	#A mesh parented to a other mesh of a layout collection is exported in the FBX of his parent,
+	#it must not be placed again as a instance of the layout. Return True if the instances are valid
+
+	bfu_Utils = GetAddonModule("bfu_Utils")
+	collection = bpy.data.collections.new("COL_Bench_LayoutCheck")
+	bpy.context.scene.collection.children.link(collection)
+	parent = NewMeshObject("COL_Bench_LayoutCheck_Parent", 0, collection)
+	child = NewMeshObject("COL_Bench_LayoutCheck_Child", 0, collection)
+	child.parent = parent
+	other = NewMeshObject("COL_Bench_LayoutCheck_Other", 0, collection)
+	expected = sorted([parent.name, other.name])
+	instances = sorted(obj.name for obj, matrix in bfu_Utils.GetCollectionInstances(collection))
+	for obj in (parent, child, other):
+		bpy.data.objects.remove(obj)
+	bpy.data.collections.remove(collection)
+	print("Layout instances with a parented mesh: "+str(instances)+(" OK" if instances == expected else " expected "+str(expected)))
+	return instances == expected
+
+
+def BuildScene(config, workDir):
+	#Build the synthetic scene and save it, the export need a saved blend file
+
+	scene = bpy.context.scene
+	scene.frame_start = 1
+	scene.frame_end = max(config["frames"], config["markers"])
+	collection = bpy.data.collections.new("Bench")
+	scene.collection.children.link(collection)
+
+	CreateStaticMeshes(config, collection)
+	CreateArmatures(config, collection)
+	CreateCameras(config, collection)
+	CreateCollections(config)
+
+	bpy.ops.wm.save_as_mainfile(filepath=os.path.join(workDir, "Benchmark.blend"))
+	return {
+		"objects": len(bpy.data.objects),
+		"meshes": len(bpy.data.meshes),
+		"vertices": sum(len(mesh.vertices) for mesh in bpy.data.meshes),
+		"armatures": len(bpy.data.armatures),
+		"actions": len(bpy.data.actions),
+		"fcurves": sum(len(action.fcurves) for action in bpy.data.actions),
+		"markers": len(scene.timeline_markers),
+		"collections": len(bpy.data.collections),
+		}
+
+
+def TimeStage(results, name, function, repeat):
+	#Run a stage several times and keep all timings
+
+	runs = []
+	value = None
+	for x in range(repeat):
+		start = time.perf_counter()
+		value = function()
+		runs.append(time.perf_counter()-start)
+	results[name] = {"min": min(runs), "mean": sum(runs)/len(runs), "runs": runs}
+	print("{:<40} min {:>10.4f}s  mean {:>10.4f}s".format(name, min(runs), sum(runs)/len(runs)))
+	return value
+
+
+def RunStages(args, timings, ruleTimings):
+	scene = bpy.context.scene
+	addon_prefs = bpy.context.preferences.addons[addonName].preferences
+	addon_prefs.useGeneratedScripts = True
+	scene.text_ExportLog = True
+	scene.text_ImportAssetScript = True
+	scene.text_ImportSequenceScript = True
+	scene.text_AdditionalData = True
+
+	bfu_Utils = GetAddonModule("bfu_Utils")
+	bfu_ExportSettings = GetAddonModule("bfu_ExportSettings")
+	bfu_CheckPotentialError = GetAddonModule("bfu_CheckPotentialError")
+	bfu_ExportAsset = GetAddonModule("bfu_ExportAsset")
+	bfu_WriteText = GetAddonModule("bfu_WriteText")
+	bfu_WriteImportAssetScript = GetAddonModule("bfu_WriteImportAssetScript")
+	bfu_WriteImportSequencerScript = GetAddonModule("bfu_WriteImportSequencerScript")
+
+	TimeStage(timings, "GetFinalAssetToExport", bfu_Utils.GetFinalAssetToExport, args.repeat)
+	settings = bfu_ExportSettings.ExportSettings.FromScene(scene)
+	TimeStage(timings, "DeduplicateStaticMeshes (data)", lambda: bfu_Utils.DeduplicateStaticMeshes(bfu_Utils.GetFinalAssetToExport(), "data", settings), args.repeat)
+	TimeStage(timings, "DeduplicateStaticMeshes (geometry)", lambda: bfu_Utils.DeduplicateStaticMeshes(bfu_Utils.GetFinalAssetToExport(), "geometry", settings), args.repeat)
+	TimeStage(timings, "UpdateUnrealPotentialError", lambda: bfu_CheckPotentialError.UpdateUnrealPotentialError(False), args.repeat)
+	#Time of each rule in the last full check
+	ruleTimings.update(bfu_CheckPotentialError.lastCheckTiming)
+	for name, value in sorted(ruleTimings.items(), key=lambda item: item[1], reverse=True):
+		print("    {:<36} {:>10.4f}s".format(name, value))
+	TimeStage(timings, "UpdateUnrealPotentialError (cached)", bfu_CheckPotentialError.UpdateUnrealPotentialError, args.repeat)
+
+	def Export():
+		bpy.context.scene.UnrealExportedAssetsList.clear()
+		bfu_Utils.UpdateNameHierarchy()
+		bfu_ExportAsset.ExportForUnrealEngine()
+
+	def FillExportedAssetsList():
+		#Fill the exported assets list from the export plan without export the files
+		scene = bpy.context.scene
+		scene.UnrealExportedAssetsList.clear()
+		for asset in bfu_Utils.GetFinalAssetToExport():
+			if asset.obj is None:
+				continue
+			MyAsset = scene.UnrealExportedAssetsList.add()
+			MyAsset.assetName = asset.fileName
+			MyAsset.assetType = asset.type.value
+			MyAsset.exportPath = bpy.path.abspath(asset.exportDir)
+			MyAsset.exportTime = 0.0
+			MyAsset.object = asset.obj
+
+	if args.noexport == False:
+		TimeStage(timings, "ExportForUnrealEngine", Export, args.repeat)
+	else:
+		#The text writers need a list of exported assets
+		FillExportedAssetsList()
+
+	TimeStage(timings, "WriteAllTextFiles", bfu_WriteText.WriteAllTextFiles, args.repeat)
+	TimeStage(timings, "WriteExportLog", bfu_WriteText.WriteExportLog, args.repeat)
+	TimeStage(timings, "WriteImportAssetScript", lambda: bfu_WriteImportAssetScript.WriteImportAssetScript(False), args.repeat)
+	TimeStage(timings, "WriteImportAssetScript (20tab)", lambda: bfu_WriteImportAssetScript.WriteImportAssetScript(True), args.repeat)
+	TimeStage(timings, "WriteImportSequencerScript", lambda: bfu_WriteImportSequencerScript.WriteImportSequencerScript(False), args.repeat)
+	TimeStage(timings, "WriteImportSequencerScript (20tab)", lambda: bfu_WriteImportSequencerScript.WriteImportSequencerScript(True), args.repeat)
+
+	#Streamed in a file, the full text is never built
+	outputDir = bpy.path.abspath("//BenchmarkText")
+	camera = bpy.context.scene.camera
+	TimeStage(timings, "Streamed WriteImportAssetScript", lambda: bfu_WriteText.ExportSingleScript(lambda script: bfu_WriteImportAssetScript.WriteImportAssetScript(False, script), outputDir, "ImportAssetScript.py"), args.repeat)
+	if camera is not None:
+		TimeStage(timings, "WriteSingleCameraAdditionalTrack", lambda: bfu_WriteText.WriteSingleCameraAdditionalTrack(camera), args.repeat)
+		TimeStage(timings, "Streamed WriteSingleCameraAdditionalTrack", lambda: bfu_WriteText.ExportSingleScript(lambda script: bfu_WriteText.WriteSingleCameraAdditionalTrack(camera, script), outputDir, "CameraAdditionalTrack.ini"), args.repeat)
+	return len(bpy.context.scene.UnrealExportedAssetsList)
+
+
+def CreateBakeRig(boneCount, frameCount):
+	#Armature with a bone chain, the even bones are animated and the odd bones copy the rotation of their parent
+	#The odd bones use each euler rotation mode
+
+	armature = bpy.data.armatures.new("SK_Bake")
+	obj = bpy.data.objects.new("SK_Bake", armature)
+	bpy.context.scene.collection.objects.link(obj)
+	bpy.context.view_layer.objects.active = obj
+	bpy.ops.object.mode_set(mode='EDIT')
+	boneNames = []
+	parent = None
+	for y in range(boneCount):
+		bone = armature.edit_bones.new("Bone_"+str(y).zfill(4))
+		bone.head = Vector((0.0, y*0.1, 0.0))
+		bone.tail = Vector((0.0, y*0.1+0.1, 0.0))
+		if parent is not None:
+			bone.parent = parent
+			bone.use_connect = True
+		parent = bone
+		boneNames.append(bone.name)
+	bpy.ops.object.mode_set(mode='OBJECT')
+
+	obj.animation_data_create()
+	action = bpy.data.actions.new("Anim_Bake")
+	for y, name in enumerate(boneNames):
+		if y % 2 == 1:
+			obj.pose.bones[name].rotation_mode = ("XYZ", "XZY", "YXZ", "YZX", "ZXY", "ZYX")[(y//2) % 6]
+			constraint = obj.pose.bones[name].constraints.new('COPY_ROTATION')
+			constraint.target = obj
+			constraint.subtarget = boneNames[y-1]
+			constraint.mix_mode = 'ADD'
+			constraint.target_space = 'LOCAL'
+			constraint.owner_space = 'LOCAL'
+			continue
+		dataPath = 'pose.bones["'+name+'"].rotation_quaternion'
+		for index in range(4):
+			fcurve = action.fcurves.new(dataPath, index=index, action_group=name)
+			fcurve.keyframe_points.add(frameCount//10+1)
+			coords = []
+			for key in range(frameCount//10+1):
+				value = 1.0 if index == 0 else 0.2*((key+y+index) % 5)
+				coords.extend((key*10+1, value))
+			fcurve.keyframe_points.foreach_set("co", coords)
+			fcurve.update()
+	obj.animation_data.action = action
+	return obj
+
+
+def GetMaxBakeDifference(actionA, actionB):
+	#Max difference between the keys of two baked actions, the quaternions are compared up to the sign
+
+	curvesB = {(fcurve.data_path, fcurve.array_index): fcurve for fcurve in actionB.fcurves}
+	quaternions = {}
+	difference = 0.0
+	for fcurve in actionA.fcurves:
+		other = curvesB.get((fcurve.data_path, fcurve.array_index))
+		if other is None or len(other.keyframe_points) != len(fcurve.keyframe_points):
+			return float("inf")
+		valuesA = [0.0] * (len(fcurve.keyframe_points) * 2)
+		valuesB = [0.0] * (len(other.keyframe_points) * 2)
+		fcurve.keyframe_points.foreach_get("co", valuesA)
+		other.keyframe_points.foreach_get("co", valuesB)
+		if fcurve.data_path.endswith("rotation_quaternion"):
+			same, opposite = quaternions.get(fcurve.data_path, (0.0, 0.0))
+			same = max([same] + [abs(a-b) for a, b in zip(valuesA[1::2], valuesB[1::2])])
+			opposite = max([opposite] + [abs(a+b) for a, b in zip(valuesA[1::2], valuesB[1::2])])
+			quaternions[fcurve.data_path] = (same, opposite)
+		else:
+			difference = max([difference] + [abs(a-b) for a, b in zip(valuesA[1::2], valuesB[1::2])])
+	for same, opposite in quaternions.values():
+		difference = max(difference, min(same, opposite))
+	return difference
+
+
+def RunBakeStages(args, timings):
+	#Bake a copy of the same rig with the NLA bake operator and with the fast bake
+
+	scene = bpy.context.scene
+	addon_prefs = bpy.context.preferences.addons[addonName].preferences
+	bfu_ExportAssetsByType = GetAddonModule("bfu_ExportAssetsByType")
+	rig = CreateBakeRig(args.bakebones, args.bakeframes)
+	scene.frame_start = 1
+	scene.frame_end = args.bakeframes
+
+	bakedActions = {}
+	for name, useFast in (("nla.bake", False), ("fast", True)):
+		copy = rig.copy()
+		scene.collection.objects.link(copy)
+		addon_prefs.useFastArmatureBake = useFast
+		TimeStage(timings, "BakeArmatureAnimation ("+name+")", lambda: bfu_ExportAssetsByType.BakeArmatureAnimation(copy, scene.frame_start, scene.frame_end), 1)
+		bakedActions[name] = copy.animation_data.action
+	difference = GetMaxBakeDifference(bakedActions["fast"], bakedActions["nla.bake"])
+	print("Max difference between the bakes: "+str(difference))
+
+	#All the actions of the benchmark rigs, one bake per action against one shared context per rig
+	bfu_Animation = GetAddonModule("bfu_Animation")
+	bfu_Utils = GetAddonModule("bfu_Utils")
+	rigs = [obj for obj in scene.objects if obj.name.startswith("SK_Bench_") and obj.type == "ARMATURE"]
+	rigActions = [(rig, bfu_Utils.GetActionToExport(rig)) for rig in rigs]
+
+	def BakeEachAction():
+		for rig, actions in rigActions:
+			for action in actions:
+				rig.animation_data.action = action
+				frameStart, frameEnd = bfu_Utils.GetDesiredActionStartEndTime(rig, action)
+				frames = bfu_Animation.GetSampledFrames(frameStart, frameEnd, 1)
+				bakeData = bfu_Animation.ArmatureBakeData(rig)
+				localMatrices = bfu_Animation.SamplePoseMatrices(rig, frames, bakeData)
+				bfu_Animation.WriteBakedAction(bpy.data.actions.new("Action"), bakeData, frames, localMatrices)
+
+	def BakeShared():
+		rigBaker = bfu_Animation.SharedRigBaker(True)
+		for rig, actions in rigActions:
+			for action in actions:
+				rigBaker.AddAction(rig, action)
+			if len(actions) > 0:
+				rigBaker.GetBakedAction(rig, actions[0])
+		rigBaker.PrintCosts()
+
+	if sum(len(actions) for rig, actions in rigActions) > 0:
+		TimeStage(timings, "Bake each action", BakeEachAction, 1)
+		TimeStage(timings, "SharedRigBaker", BakeShared, 1)
+	return difference
+
+
+def CompareResults(results, comparePath):
+	#Print the ratio between a previous run and this run (>1 mean faster now)
+
+	with open(comparePath, "r") as file:
+		previous = json.load(file)
+	if previous.get("config") != results["config"]:
+		print("/!\\ The compared run was made with a different scene config")
+	print("")
+	print("{:<40} {:>12} {:>12} {:>8}".format("Stage", "Before", "Now", "Ratio"))
+	for name, timing in results["timings"].items():
+		if name in previous["timings"]:
+			before = previous["timings"][name]["min"]
+			ratio = before/timing["min"] if timing["min"] > 0 else float("inf")
+			print("{:<40} {:>11.4f}s {:>11.4f}s {:>7.2f}x".format(name, before, timing["min"], ratio))
+		else:
+			print("{:<40} {:>12} {:>11.4f}s".format(name, "-", timing["min"]))
+
+
+def Main():
+	args, config = ParseArguments()
+	workDir = tempfile.mkdtemp(prefix="bfu_benchmark_")
+	try:
+		bpy.ops.wm.read_factory_settings(use_empty=True)
+		EnableAddon(workDir)
+		print("========================= Blender for UnrealEngine benchmark =========================")
+		print("Work folder: "+workDir)
+
+		start = time.perf_counter()
+		sceneInfo = BuildScene(config, workDir)
+		print("Scene built in {:.2f}s: {}".format(time.perf_counter()-start, sceneInfo))
+
+		layoutValid = CheckLayoutInstances()
+
+		timings = {}
+		ruleTimings = {}
+		exportedAssets = RunStages(args, timings, ruleTimings)
+		bakeDifference = RunBakeStages(args, timings) if args.bake == True else None
+
+		results = {
+			"time": time.strftime("%Y-%m-%d %H:%M:%S"),
+			"blender": bpy.app.version_string,
+			"addon": ".".join(str(v) for v in sys.modules[addonName].bl_info["version"]),
+			"platform": platform.platform(),
+			"preset": args.preset,
+			"config": config,
+			"repeat": args.repeat,
+			"scene": sceneInfo,
+			"exportedAssets": exportedAssets,
+			"potentialErrorRules": ruleTimings,
+			"bakeDifference": bakeDifference,
+			"layoutValid": layoutValid,
+			"timings": timings,
+			}
+
+		if args.output is not None:
+			with open(args.output, "w") as file:
+				json.dump(results, file, indent=4)
+			print("Results saved in "+args.output)
+
+		if args.compare is not None:
+			CompareResults(results, args.compare)
+
+		if layoutValid == False:
+			print("/!\\ The layout instances are not valid")
+			sys.exit(1)
+
+		if bakeDifference is not None and bakeDifference > args.bakeepsilon:
+			print("/!\\ The fast bake differ from the NLA bake operator by more than "+str(args.bakeepsilon))
+			sys.exit(1)
+	finally:
+		if args.keep == False:
+			shutil.rmtree(workDir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+	Main()
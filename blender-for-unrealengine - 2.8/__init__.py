@@ -68,6 +68,19 @@ importlib.reload(bfu_ExportAsset)
 from . import bfu_WriteText
 importlib.reload(bfu_WriteText)
 
+from . import bfu_ExportJournal
+importlib.reload(bfu_ExportJournal)
+
+from . import bfu_Collision
+importlib.reload(bfu_Collision)
+
+from . import bfu_AssetBudget
+importlib.reload(bfu_AssetBudget)
+
+from . import bfu_CheckPotentialError
+importlib.reload(bfu_CheckPotentialError)
+from .bfu_CheckPotentialError import *
+
 from . import bfu_Basics
 importlib.reload(bfu_Basics)
 from .bfu_Basics import *
@@ -88,6 +101,12 @@ class BFU_AP_AddonPreferences(bpy.types.AddonPreferences):
 		default=False,
 		)
 
+	useFastArmatureBake : BoolProperty(
+		name='Fast bake',
+		description='Bake the Armature animation with NumPy in one pass on the frames instead of the NLA bake operator. The constraints are removed from the baked copy like with the operator. The benchmark option --bake compares the two bakes',
+		default=False,
+		)
+
 	correctExtremUVScale : BoolProperty(
 		name='Correct Extrem UV Scale',
 		description='Correct Extrem UV Scale for better UV quality in UE4 (Export will take more time)',
@@ -186,6 +205,65 @@ class BFU_AP_AddonPreferences(bpy.types.AddonPreferences):
 		default=False,
 		)
 
+	def UpdateBudget(self, context):
+		#The cached potential errors were checked with the previous budgets
+		bfu_CheckPotentialError.ClearPotentialErrorCache()
+
+	useBudgetCheck : BoolProperty(
+		name='Check performance budget',
+		description='Warn in the potential errors and in the export log when a StaticMesh or a SkeletalMesh is over the budgets bellow (0 is no limit)',
+		default=True,
+		update=UpdateBudget,
+		)
+
+	budgetStaticMeshTriangles : IntProperty(
+		name='StaticMesh triangles',
+		description='Max number of triangles of a StaticMesh after the modifiers',
+		min=0,
+		default=50000,
+		update=UpdateBudget,
+		)
+
+	budgetSkeletalMeshTriangles : IntProperty(
+		name='SkeletalMesh triangles',
+		description='Max number of triangles of a SkeletalMesh after the modifiers',
+		min=0,
+		default=80000,
+		update=UpdateBudget,
+		)
+
+	budgetMaterials : IntProperty(
+		name='Material slots',
+		description='Max number of materials used by a mesh. In Unreal each material is one draw call',
+		min=0,
+		default=8,
+		update=UpdateBudget,
+		)
+
+	budgetUVChannels : IntProperty(
+		name='UV channels',
+		description='Max number of UV maps of a mesh',
+		min=0,
+		default=4,
+		update=UpdateBudget,
+		)
+
+	budgetBoneInfluences : IntProperty(
+		name='Bone influences',
+		description='Max number of bones that deform a vertex. Unreal use 4 influences by default (8 with the high precision skin weights)',
+		min=0,
+		default=8,
+		update=UpdateBudget,
+		)
+
+	budgetBones : IntProperty(
+		name='Bones',
+		description='Max number of bones of a SkeletalMesh',
+		min=0,
+		default=255,
+		update=UpdateBudget,
+		)
+
 	class BFU_OT_OpenDocumentationTargetPage(Operator):
 		bl_label = "Documentation"
 		bl_idname = "object.open_documentation_target_page"
@@ -251,6 +329,9 @@ class BFU_AP_AddonPreferences(bpy.types.AddonPreferences):
 		data.prop(self, "ignoreNLAForAction")
 		PropWithDocButton(data, "correctExtremUVScale", "#uv")
 		data.prop(self, "bakeArmatureAction")
+		fastBake = data.column()
+		fastBake.enabled = self.bakeArmatureAction
+		fastBake.prop(self, "useFastArmatureBake")
 		data.prop(self, "exportWithCustomProps")
 		data.prop(self, "exportWithMetaData")
 		data.prop(self, "revertExportPath")
@@ -262,6 +343,18 @@ class BFU_AP_AddonPreferences(bpy.types.AddonPreferences):
 		scriptProp.enabled = self.useGeneratedScripts
 		scriptProp.prop(self, "use20TabScript")
 
+		budget = layout.box()
+		budget.label(text='PERFORMANCE BUDGET')
+		budget.prop(self, "useBudgetCheck")
+		budgetProp = budget.column()
+		budgetProp.enabled = self.useBudgetCheck
+		budgetProp.prop(self, "budgetStaticMeshTriangles")
+		budgetProp.prop(self, "budgetSkeletalMeshTriangles")
+		budgetProp.prop(self, "budgetMaterials")
+		budgetProp.prop(self, "budgetUVChannels")
+		budgetProp.prop(self, "budgetBoneInfluences")
+		budgetProp.prop(self, "budgetBones")
+
 		updateButton = layout.row()
 		updateButton.scale_y = 2.0
 		updateButton.operator("object.new_release_info", icon= "TIME")
@@ -309,6 +402,9 @@ class BFU_PT_BlenderForUnreal(bpy.types.Panel):
 							'obj.Ue4Lod3',
 							'obj.Ue4Lod4',
 							'obj.Ue4Lod5',
+							'obj.AutoGenerateLod',
+							'obj.AutoLodCount',
+							'obj.AutoLodRatios',
 							'obj.CreatePhysicsAsset',
 							'obj.UseStaticMeshLODGroup',
 							'obj.StaticMeshLODGroup',
@@ -320,6 +416,7 @@ class BFU_PT_BlenderForUnreal(bpy.types.Panel):
 							'obj.CollisionTraceFlag',
 							'obj.VertexColorImportOption',
 							'obj.exportActionEnum',
+							'obj.ExportActionsAsTakes',
 							'obj.PrefixNameToExport',
 							'obj.AnimStartEndTimeEnum',
 							'obj.StartFramesOffset',
@@ -328,6 +425,7 @@ class BFU_PT_BlenderForUnreal(bpy.types.Panel):
 							'obj.AnimCustomEndTime',
 							'obj.SampleAnimForExport',
 							'obj.SimplifyAnimForExport',
+							'obj.StripConstantAnimChannels',
 							'obj.ExportNLA',
 							'obj.NLAAnimName',
 							'obj.exportGlobalScale',
@@ -526,6 +624,29 @@ class BFU_PT_ObjectImportProperties(bpy.types.Panel):
 		type = bpy.types.Object
 		)
 
+	bpy.types.Object.AutoGenerateLod = BoolProperty(
+		name = "Auto generate LODs",
+		description = "If checked, the levels of detail are generated at the export with a decimated copy of the mesh (UV seams and vertex weights are kept)",
+		default=False
+		)
+
+	bpy.types.Object.AutoLodCount = IntProperty(
+		name = "LOD count",
+		description = "Number of levels of detail to generate",
+		min = 1,
+		max = 5,
+		default=3
+		)
+
+	bpy.types.Object.AutoLodRatios = FloatVectorProperty(
+		name = "LOD ratios",
+		description = "Ratio of faces kept for each generated level of detail",
+		size = 5,
+		min = 0.01,
+		max = 1.0,
+		default=(0.5, 0.25, 0.125, 0.0625, 0.03125)
+		)
+
 	#ImportUI
 	#https://api.unrealengine.com/INT/API/Editor/UnrealEd/Factories/UFbxImportUI/index.html
 
@@ -637,11 +758,17 @@ class BFU_PT_ObjectImportProperties(bpy.types.Panel):
 					if obj.ExportAsLod == False:
 						if GetAssetType(obj) == "StaticMesh" or GetAssetType(obj) == "SkeletalMesh":
 							LodList = layout.column()
-							LodList.prop(obj, 'Ue4Lod1')
-							LodList.prop(obj, 'Ue4Lod2')
-							LodList.prop(obj, 'Ue4Lod3')
-							LodList.prop(obj, 'Ue4Lod4')
-							LodList.prop(obj, 'Ue4Lod5')
+							LodList.prop(obj, 'AutoGenerateLod')
+							if obj.AutoGenerateLod == True:
+								LodList.prop(obj, 'AutoLodCount')
+								for x in range(obj.AutoLodCount):
+									LodList.prop(obj, 'AutoLodRatios', index=x, text="LOD"+str(x+1)+" ratio")
+							else:
+								LodList.prop(obj, 'Ue4Lod1')
+								LodList.prop(obj, 'Ue4Lod2')
+								LodList.prop(obj, 'Ue4Lod3')
+								LodList.prop(obj, 'Ue4Lod4')
+								LodList.prop(obj, 'Ue4Lod5')
 
 					#MaterialSearchLocation
 					if obj.ExportAsLod == False:
@@ -757,6 +884,12 @@ class BFU_PT_AnimProperties(bpy.types.Panel):
 		default = "Example_",
 		)
 
+	bpy.types.Object.ExportActionsAsTakes = BoolProperty(
+		name="Export actions in one FBX",
+		description="Export the actions of the armature as takes of a single FBX. The import script split the takes in one animation per action. Since Blender 3.1 each take use the start/end time of its action, before it use the keyframe range of the action",
+		default=False,
+		)
+
 	bpy.types.Object.AnimStartEndTimeEnum = EnumProperty(
 		name = "Animation start/end time",
 		description = "Set when animation starts and end",
@@ -808,6 +941,12 @@ class BFU_PT_AnimProperties(bpy.types.Panel):
 		default=0.0,
 		)
 
+	bpy.types.Object.StripConstantAnimChannels = BoolProperty(
+		name="Strip constant curves",
+		description="Do not bake at each frame the bone curves that do not change during the animation. The FBX and the Unreal import are lighter",
+		default=False,
+		)
+
 	bpy.types.Object.ExportNLA = BoolProperty(
 		name="Export NLA (Nonlinear Animation)",
 		description="If checked, exports the all animation of the scene with the NLA",
@@ -831,22 +970,7 @@ class BFU_PT_AnimProperties(bpy.types.Panel):
 			def UpdateExportActionList(obj):
 				#Update the provisional action list known by the object
 
-				def SetUseFromLast(list, ActionName):
-					for item in list:
-						if item[0] == ActionName:
-							if item[1] == True:
-								return True
-					return False
-
-				animSave = [["", False]]
-				for Anim in obj.exportActionList: #CollectionProperty
-					name = Anim.name
-					use = Anim.use
-					animSave.append([name, use])
-				obj.exportActionList.clear()
-				for action in bpy.data.actions:
-					obj.exportActionList.add().name = action.name
-					obj.exportActionList[action.name].use = SetUseFromLast(animSave, action.name)
+				SyncNamedItemList(obj.exportActionList, [action.name for action in bpy.data.actions])
 			UpdateExportActionList(bpy.context.object)
 			return {'FINISHED'}
 
@@ -913,12 +1037,14 @@ class BFU_PT_AnimProperties(bpy.types.Panel):
 							ActionListProperty.operator("object.updateobjactionlist", icon='RECOVER_LAST')
 						if obj.exportActionEnum == "export_specific_prefix":
 							ActionListProperty.prop(obj, 'PrefixNameToExport')
+						ActionListProperty.prop(obj, 'ExportActionsAsTakes')
 
 					#Action fbx properties
 					if GetAssetType(obj) != "Alembic":
 						propsFbx = layout.row()
 						propsFbx.prop(obj, 'SampleAnimForExport')
 						propsFbx.prop(obj, 'SimplifyAnimForExport')
+						layout.prop(obj, 'StripConstantAnimChannels')
 
 					#Armature export action list feedback
 					if GetAssetType(obj) == "SkeletalMesh":
@@ -988,22 +1114,7 @@ class BFU_PT_CollectionProperties(bpy.types.Panel):
 			def UpdateExportCollectionList(scn):
 				#Update the provisional collection list known by the object
 
-				def SetUseFromLast(list, CollectionName):
-					for item in list:
-						if item[0] == CollectionName:
-							if item[1] == True:
-								return True
-					return False
-
-				colSave = [["", False]]
-				for col in scn.CollectionExportList: #CollectionProperty
-					name = col.name
-					use = col.use
-					colSave.append([name, use])
-				scn.CollectionExportList.clear()
-				for col in bpy.data.collections:
-					scn.CollectionExportList.add().name = col.name
-					scn.CollectionExportList[col.name].use = SetUseFromLast(colSave, col.name)
+				SyncNamedItemList(scn.CollectionExportList, [col.name for col in bpy.data.collections])
 			UpdateExportCollectionList(context.scene)
 			return {'FINISHED'}
 	
@@ -1053,7 +1164,11 @@ class BFU_PT_CollectionProperties(bpy.types.Panel):
 		collectionFeedback = str(collectionNum) + " Collection(s) will be exported with this armature."
 		collectionPropertyInfo.label(text=collectionFeedback, icon='INFO')
 		collectionPropertyInfo.operator("object.showscenecollection")
-		layout.label(text='Note: The collection are exported like StaticMesh.')
+		layout.prop(scn, 'static_collection_export_mode')
+		if scn.static_collection_export_mode == "layout":
+			layout.label(text='Note: Each unique mesh is exported like StaticMesh with a layout of the instances.')
+		else:
+			layout.label(text='Note: The collection are exported like StaticMesh.')
 		
 	
 
@@ -1246,6 +1361,70 @@ class BFU_PT_CollisionsAndSockets(bpy.types.Panel):
 			return {'FINISHED'}
 
 
+	class BFU_OT_FitCollisionShapes(Operator):
+		bl_label = "Fit collision shapes"
+		bl_idname = "object.fitcollisionshapes"
+		bl_description = "Generate a fitted Unreal collision for each selected mesh"
+		bl_options = {'REGISTER', 'UNDO'}
+
+		SubType : EnumProperty(
+			name="Shape",
+			items=[
+				("Box", "Box (UBX)", "Fit a oriented box"),
+				("Sphere", "Sphere (USP)", "Fit a bounding sphere"),
+				("Capsule", "Capsule (UCP)", "Fit a capsule along the mesh main axis"),
+				],
+			default="Box",
+			)
+
+		def execute(self, context):
+			CreatedObj = bfu_Collision.FitCollisionShapes(self.SubType)
+			if len(CreatedObj) > 0 :
+				self.report({'INFO'}, str(len(CreatedObj)) + " "+self.SubType+" collision(s) generated." )
+			else :
+				self.report({'WARNING'}, "Please select the mesh(es) that need a collision.")
+			return {'FINISHED'}
+
+
+	class BFU_OT_ConvexDecomposition(Operator):
+		bl_label = "Convex decomposition (UCX)"
+		bl_idname = "object.convexdecomposition"
+		bl_description = "Split each selected mesh in convex parts and generate a Unreal convex collision for each part"
+		bl_options = {'REGISTER', 'UNDO'}
+
+		MaxParts : IntProperty(
+			name="Max parts",
+			description="Maximum number of convex collisions generated for each mesh",
+			min=1,
+			max=64,
+			default=8
+			)
+
+		VertexBudget : IntProperty(
+			name="Vertex budget",
+			description="Maximum number of vertices of each convex collision",
+			min=4,
+			max=255,
+			default=32
+			)
+
+		Resolution : IntProperty(
+			name="Resolution",
+			description="Number of voxels along the largest side of the mesh used to find the convex parts",
+			min=8,
+			max=128,
+			default=32
+			)
+
+		def execute(self, context):
+			CreatedObj = bfu_Collision.CreateConvexDecomposition(self.MaxParts, self.VertexBudget, self.Resolution)
+			if len(CreatedObj) > 0 :
+				self.report({'INFO'}, str(len(CreatedObj)) + " convex collision(s) generated." )
+			else :
+				self.report({'WARNING'}, "Please select the mesh(es) that need a collision.")
+			return {'FINISHED'}
+
+
 	class BFU_OT_ConvertToStaticSocketButton(Operator):
 		bl_label = "Convert to StaticMesh socket"
 		bl_idname = "object.converttostaticsocket"
@@ -1298,6 +1477,12 @@ class BFU_PT_CollisionsAndSockets(bpy.types.Panel):
 						return True
 			return False
 
+		def FoundMeshInSelect(): #Return True if a mesh is selected (with the active)
+			for obj in bpy.context.selected_objects:
+				if obj.type == "MESH":
+					return True
+			return False
+
 		layout = self.layout
 		layout.label(text="Convert selected object to Unreal collision or socket", icon='PHYSICS')
 
@@ -1310,6 +1495,15 @@ class BFU_PT_CollisionsAndSockets(bpy.types.Panel):
 		convertStaticCollisionButtons.operator("object.converttocapsulecollision", icon='MESH_CAPSULE')
 		convertStaticCollisionButtons.operator("object.converttospherecollision", icon='MESH_UVSPHERE')
 
+		layout.label(text="Select the mesh(es) to generate a fitted collision.")
+		fitButtons = layout.row().split(factor = 0.80 )
+		fitCollisionButtons = fitButtons.column()
+		fitCollisionButtons.enabled = ActiveModeIs("OBJECT") and FoundMeshInSelect()
+		fitCollisionButtons.operator("object.fitcollisionshapes", text="Fit box (UBX)", icon='MESH_CUBE').SubType = "Box"
+		fitCollisionButtons.operator("object.fitcollisionshapes", text="Fit capsule (UCP)", icon='MESH_CAPSULE').SubType = "Capsule"
+		fitCollisionButtons.operator("object.fitcollisionshapes", text="Fit sphere (USP)", icon='MESH_UVSPHERE').SubType = "Sphere"
+		fitCollisionButtons.operator("object.convexdecomposition", icon='MESH_ICOSPHERE')
+
 		convertButtons = self.layout.row().split(factor = 0.80 )
 		convertStaticSocketButtons = convertButtons.column()
 		convertStaticSocketButtons.enabled = ActiveModeIs("OBJECT") and ActiveTypeIs("MESH") and FoundTypeInSelect("EMPTY")
@@ -1372,6 +1566,8 @@ class BFU_PT_Nomenclature(bpy.types.Panel):
 							'scene.file_export_log_name',
 							'scene.file_import_asset_script_name',
 							'scene.file_import_sequencer_script_name',
+							'scene.file_additional_data_manifest_name',
+							'scene.file_import_layout_script_name',
 						]
 
 		# Directory to store the presets
@@ -1481,6 +1677,18 @@ class BFU_PT_Nomenclature(bpy.types.Panel):
 		maxlen = 64,
 		default = "ImportSequencerScript.py")
 
+	bpy.types.Scene.file_additional_data_manifest_name = bpy.props.StringProperty(
+		name = "Additional data manifest name",
+		description = "Additional data manifest name",
+		maxlen = 64,
+		default = "AdditionalDataManifest.json")
+
+	bpy.types.Scene.file_import_layout_script_name = bpy.props.StringProperty(
+		name = "Import layout script Name",
+		description = "Import layout script name",
+		maxlen = 64,
+		default = "ImportLayoutScript.py")
+
 
 	def draw(self, context):
 		scn = context.scene
@@ -1525,6 +1733,8 @@ class BFU_PT_Nomenclature(bpy.types.Panel):
 		if addon_prefs.useGeneratedScripts == True:
 			fileName.prop(scn, 'file_import_asset_script_name', icon='FILE')
 			fileName.prop(scn, 'file_import_sequencer_script_name', icon='FILE')
+			fileName.prop(scn, 'file_additional_data_manifest_name', icon='FILE')
+			fileName.prop(scn, 'file_import_layout_script_name', icon='FILE')
 
 
 class BFU_PT_ImportScript(bpy.types.Panel):
@@ -1577,6 +1787,11 @@ class BFU_OT_UnrealExportedAsset(bpy.types.PropertyGroup):
 	exportPath: StringProperty(default="None")
 	exportTime: FloatProperty(default=0)
 	object: PointerProperty(type=bpy.types.Object)
+	lodLevel: IntProperty(default=0) #0 for the asset, >0 for a auto generated lod of the object
+	animKeys: IntProperty(default=0) #Estimated keys written in the FBX of a animation
+	animRawKeys: IntProperty(default=0) #Estimated keys with all the curves baked at each frame
+	aliasOf: StringProperty(default="") #Name of the object exported in place of this identical one
+	animTakes: StringProperty(default="") #Json {takeName: assetName} of the takes of a MultiTakeAnim
 
 
 class BFU_OT_UnrealPotentialError(bpy.types.PropertyGroup):
@@ -1619,23 +1834,19 @@ class BFU_PT_Export(bpy.types.Panel):
 				col = self.layout.column()
 				for asset in assets:
 					row = col.row()
-					if asset.obj is not None:
-						if asset.action is not None:
-							if (type(asset.action) is bpy.types.Action): #Action name
-								action = asset.action.name
-							elif (type(asset.action) is bpy.types.AnimData): #Nonlinear name
-								action = asset.obj.NLAAnimName
-							else:
-								action = "..."
-							row.label(text="- ["+asset.obj.name+"] --> "+action+" ("+asset.type+")")
+					if asset.objectName is not None:
+						if asset.actionName is not None: #Action name
+							row.label(text="- ["+asset.objectName+"] --> "+asset.actionName+" ("+asset.type.value+")")
+						elif asset.type == AssetType.NLANIM and asset.obj is not None: #Nonlinear name
+							row.label(text="- ["+asset.objectName+"] --> "+asset.obj.NLAAnimName+" ("+asset.type.value+")")
+						elif asset.type == AssetType.MULTITAKE: #Number of takes
+							row.label(text="- ["+asset.objectName+"] --> "+str(len(asset.animTakes))+" actions ("+asset.type.value+")")
 						else:
-							if asset.type != "Collection StaticMesh":
-								row.label(text="- "+asset.obj.name+" ("+asset.type+")")
-							else:
-								row.label(text="- "+asset.obj+" ("+asset.type+")")
-								
+							row.label(text="- "+asset.objectName+" ("+asset.type.value+")")
+					elif asset.collectionName is not None:
+						row.label(text="- "+asset.collectionName+" ("+asset.type.value+")")
 					else:
-						row.label(text="- ("+asset.type+")")
+						row.label(text="- ("+asset.type.value+")")
 			bpy.context.window_manager.popup_menu(draw, title=popup_title, icon='PACKAGE')
 			return {'FINISHED'}
 
@@ -1657,6 +1868,16 @@ class BFU_PT_Export(bpy.types.Panel):
 				self.report({'INFO'}, result)
 				return {'FINISHED'}
 
+		class BFU_OT_FixAllTarget(Operator):
+			bl_label = "Fix all"
+			bl_idname = "object.fixall_objet"
+			bl_description = "Correct all errors that can be corrected automatically"
+
+			def execute(self, context):
+				corrected, toCorrect = TryToCorrectAllPotentialErrors()
+				self.report({'INFO'}, str(corrected)+"/"+str(toCorrect)+" error(s) corrected")
+				return {'FINISHED'}
+
 		class BFU_OT_SelectObjetButton(Operator):
 			bl_label = "Select"
 			bl_idname = "object.select_error_objet"
@@ -1709,6 +1930,9 @@ class BFU_PT_Export(bpy.types.Panel):
 
 			layout.label(text=popup_title)
 			layout.label(text="Hierarchy names updated and " + CheckInfo)
+			correctableErrors = len([error for error in bpy.context.scene.potentialErrorList if error.correctRef != "None"])
+			if correctableErrors > 0:
+				layout.operator("object.fixall_objet", text="Fix all ("+str(correctableErrors)+")")
 			layout.separator()
 			row = layout.row()
 			col = row.column()
@@ -1786,15 +2010,17 @@ class BFU_PT_Export(bpy.types.Panel):
 					scene.UnrealExportedAssetsList.clear()
 					start_time = time.process_time()
 					UpdateNameHierarchy()
-					bfu_ExportAsset.ExportForUnrealEngine()
-					bfu_WriteText.WriteAllTextFiles()
+					settings = bfu_ExportAsset.ExportForUnrealEngine()
+					#The budgets are computed once for the log file and the console
+					budgets = bfu_AssetBudget.GetExportedAssetBudgets() if settings.useBudgetCheck else None
+					bfu_WriteText.WriteAllTextFiles(settings, budgets)
 
 					if len(scene.UnrealExportedAssetsList) > 0:
 						self.report({'INFO'}, "Export of "+str(len(scene.UnrealExportedAssetsList))+
 						" asset(s) has been finalized in "+str(time.process_time()-start_time)+" sec. Look in console for more info.")
 						print("========================= Exported asset(s) =========================")
 						print("")
-						for line in bfu_WriteText.WriteExportLog().splitlines():
+						for line in bfu_WriteText.WriteExportLog(None, settings, budgets).splitlines():
 							print(line)
 						print("")
 						print("========================= ... =========================")
@@ -1807,6 +2033,28 @@ class BFU_PT_Export(bpy.types.Panel):
 				return {'FINISHED'}
 			return {'FINISHED'}
 
+	class BFU_OT_ResumeExportForUnrealEngineButton(Operator):
+		bl_label = "Resume export"
+		bl_idname = "object.resumeexportforunreal"
+		bl_description = "Clean the leftovers of an interrupted export and continue it from the first unfinished asset."
+
+		def execute(self, context):
+			scene = bpy.context.scene
+
+			if bfu_ExportJournal.GetJournalExist(scene) == False:
+				self.report({'WARNING'}, "No interrupted export found.")
+				return {'FINISHED'}
+
+			scene.UnrealExportedAssetsList.clear()
+			start_time = time.process_time()
+			UpdateNameHierarchy()
+			settings = bfu_ExportAsset.ExportForUnrealEngine(resume = True)
+			scene = bpy.context.scene
+			bfu_WriteText.WriteAllTextFiles(settings)
+			self.report({'INFO'}, "Export of "+str(len(scene.UnrealExportedAssetsList))+
+			" asset(s) has been resumed and finalized in "+str(time.process_time()-start_time)+" sec. Look in console for more info.")
+			return {'FINISHED'}
+
 
 	#Categories :
 	bpy.types.Scene.static_export = bpy.props.BoolProperty(
@@ -1815,12 +2063,33 @@ class BFU_PT_Export(bpy.types.Panel):
 		default = True
 		)	
 		
+	bpy.types.Scene.static_mesh_deduplication = bpy.props.EnumProperty(
+		name = "Deduplicate",
+		description = "Export only one file for the identical StaticMesh(s), the others use it",
+		items = [
+			("none", "No deduplication", "Export a file for each StaticMesh", 1),
+			("data", "Same mesh data", "StaticMesh(s) that use the same mesh data without modifier share one file", 2),
+			("geometry", "Same geometry", "StaticMesh(s) with the same geometry, UVs and materials share one file", 3),
+			],
+		default = "none"
+		)
+
 	bpy.types.Scene.static_collection_export = bpy.props.BoolProperty(
 		name = "Collection(s) ",
 		description = "Check mark to export Collection(s)",
 		default = False
 		)
 
+	bpy.types.Scene.static_collection_export_mode = bpy.props.EnumProperty(
+		name = "Collection export",
+		description = "How the collections are exported",
+		items = [
+			("merged", "Merged mesh", "Export each collection as one StaticMesh", 1),
+			("layout", "Instance layout", "Export each unique mesh of the collection one time and a layout file with the transform of all the instances. The import layout script spawn them as instanced static meshes", 2),
+			],
+		default = "merged"
+		)
+
 	bpy.types.Scene.skeletal_export = bpy.props.BoolProperty(
 		name = "SkeletalMesh(s)",
 		description = "Check mark to export SkeletalMesh(s)",
@@ -1870,6 +2139,12 @@ class BFU_PT_Export(bpy.types.Panel):
 		default = True
 		)
 
+	bpy.types.Scene.text_AdditionalDataAsManifest = bpy.props.BoolProperty(
+		name = "Additional data as manifest",
+		description = "Check mark to write the additional parameters of all the meshes in one manifest file instead of one file per mesh",
+		default = False
+		)
+
 	#exportProperty
 	bpy.types.Scene.export_ExportOnlySelected = bpy.props.BoolProperty(
 		name = "Export only select",
@@ -1891,7 +2166,11 @@ class BFU_PT_Export(bpy.types.Panel):
 		AssetsCol = row.column()
 		AssetsCol.label(text="Asset types to export", icon='PACKAGE')
 		AssetsCol.prop(scn, 'static_export')
+		if scn.static_export == True:
+			AssetsCol.prop(scn, 'static_mesh_deduplication', text="")
 		AssetsCol.prop(scn, 'static_collection_export')
+		if scn.static_collection_export == True:
+			AssetsCol.prop(scn, 'static_collection_export_mode', text="")
 		AssetsCol.prop(scn, 'skeletal_export')
 		AssetsCol.prop(scn, 'anin_export')
 		AssetsCol.prop(scn, 'alembic_export')
@@ -1905,6 +2184,8 @@ class BFU_PT_Export(bpy.types.Panel):
 		FileCol.prop(scn, 'text_ImportSequenceScript')
 		if addon_prefs.useGeneratedScripts == True:
 			FileCol.prop(scn, 'text_AdditionalData')
+			if scn.text_AdditionalData == True:
+				FileCol.prop(scn, 'text_AdditionalDataAsManifest')
 
 
 		#Feedback info :
@@ -1926,6 +2207,10 @@ class BFU_PT_Export(bpy.types.Panel):
 		exportButton.scale_y = 2.0
 		exportButton.operator("object.exportforunreal", icon='EXPORT')
 
+		if bfu_ExportJournal.GetJournalExist(scn):
+			resumeButton = layout.row()
+			resumeButton.operator("object.resumeexportforunreal", icon='RECOVER_LAST')
+
 
 class BFU_PT_Clipboard(bpy.types.Panel):
 
@@ -1961,6 +2246,17 @@ class BFU_PT_Clipboard(bpy.types.Panel):
 			self.report({'INFO'}, "command for "+scn.file_import_sequencer_script_name+" copied")
 			return {'FINISHED'}
 
+	class BFU_OT_CopyImportLayoutScriptCommand(Operator):
+		bl_label = "ImportLayoutScript"
+		bl_idname = "object.copy_importlayoutscript_command"
+		bl_description = "Copy Import Layout Script command"
+
+		def execute(self, context):
+			scn = context.scene
+			setWindowsClipboard(GetImportLayoutScriptCommand())
+			self.report({'INFO'}, "command for "+scn.file_import_layout_script_name+" copied")
+			return {'FINISHED'}
+
 	def draw(self, context):
 		scn = context.scene
 		layout = self.layout
@@ -1971,6 +2267,8 @@ class BFU_PT_Clipboard(bpy.types.Panel):
 			copyButton = layout.row()
 			copyButton.operator("object.copy_importassetscript_command")
 			copyButton.operator("object.copy_importsequencerscript_command")
+			if scn.static_collection_export == True and scn.static_collection_export_mode == "layout":
+				copyButton.operator("object.copy_importlayoutscript_command")
 			layout.label(text="Then you can paste it into the python console of unreal", icon='INFO')
 		else:
 			layout.label(text='(Generated scripts are deactivated.)')
@@ -2038,6 +2336,8 @@ classes = (
 	BFU_PT_CollisionsAndSockets.BFU_OT_ConvertToCollisionButtonCapsule,
 	BFU_PT_CollisionsAndSockets.BFU_OT_ConvertToCollisionButtonSphere,
 	BFU_PT_CollisionsAndSockets.BFU_OT_ConvertToCollisionButtonConvex,
+	BFU_PT_CollisionsAndSockets.BFU_OT_FitCollisionShapes,
+	BFU_PT_CollisionsAndSockets.BFU_OT_ConvexDecomposition,
 	BFU_PT_CollisionsAndSockets.BFU_OT_ConvertToStaticSocketButton,
 	BFU_PT_CollisionsAndSockets.BFU_OT_ConvertToSkeletalSocketButton,
 
@@ -2053,13 +2353,16 @@ classes = (
 	BFU_PT_Export.BFU_OT_ShowAssetToExport,
 	BFU_PT_Export.BFU_OT_CheckPotentialErrorPopup,
 	BFU_PT_Export.BFU_OT_CheckPotentialErrorPopup.BFU_OT_FixitTarget,
+	BFU_PT_Export.BFU_OT_CheckPotentialErrorPopup.BFU_OT_FixAllTarget,
 	BFU_PT_Export.BFU_OT_CheckPotentialErrorPopup.BFU_OT_SelectObjetButton,
 	BFU_PT_Export.BFU_OT_CheckPotentialErrorPopup.BFU_OT_SelectVertexButton,
 	BFU_PT_Export.BFU_OT_ExportForUnrealEngineButton,
+	BFU_PT_Export.BFU_OT_ResumeExportForUnrealEngineButton,
 
 	BFU_PT_Clipboard,
 	BFU_PT_Clipboard.BFU_OT_CopyImportAssetScriptCommand,
 	BFU_PT_Clipboard.BFU_OT_CopyImportSequencerScriptCommand,
+	BFU_PT_Clipboard.BFU_OT_CopyImportLayoutScriptCommand,
 	
 	BFU_PT_CorrectAndImprov.BFU_OT_CorrectExtremUV
 )
@@ -2084,6 +2387,7 @@ def register():
 	bpy.types.Scene.UnrealExportedAssetsList = CollectionProperty(type=BFU_OT_UnrealExportedAsset)
 	bpy.utils.register_class(BFU_OT_UnrealPotentialError)
 	bpy.types.Scene.potentialErrorList = CollectionProperty(type=BFU_OT_UnrealPotentialError)
+	RegisterPotentialErrorHandlers()
 	
 	bpy.types.VIEW3D_MT_uv_map.append(menu_func)
 
@@ -2096,6 +2400,7 @@ def unregister():
 	bpy.utils.unregister_class(BFU_OT_SceneCollectionExport)
 	bpy.utils.unregister_class(BFU_OT_UnrealExportedAsset)
 	bpy.utils.unregister_class(BFU_OT_UnrealPotentialError)
+	UnregisterPotentialErrorHandlers()
 		
 	bpy.types.VIEW3D_MT_uv_map.remove(menu_func)
 
@@ -0,0 +1,672 @@
+#====================== BEGIN GPL LICENSE BLOCK ============================
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.	 See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.	 If not, see <http://www.gnu.org/licenses/>.
+#  All rights reserved.
+#
+#======================= END GPL LICENSE BLOCK =============================
+
+import bpy
+import re
+import time
+import numpy
+
+import importlib
+from . import bfu_Basics
+importlib.reload(bfu_Basics)
+from .bfu_Basics import *
+
+from . import bfu_Utils
+importlib.reload(bfu_Utils)
+from .bfu_Utils import *
+
+from . import bfu_ExportJournal
+importlib.reload(bfu_ExportJournal)
+
+
+#The FBX exporter write 9 curves per bone: translation, rotation (euler) and scale xyz
+fbxChannelNames = ("T", "R", "S")
+fbxCurvesPerBone = 9
+fbxBytesPerKey = 12 #int64 time + float32 value
+ueBytesPerTrackKey = (12, 16, 12) #Position float3, rotation quat, scale float3 of the raw tracks
+
+constantTolerance = 1e-5
+minSimplifyFactor = 0.0001 #Remove the duplicated keys without changing the animated curves
+
+#Pose bone property: (fbx channel, value at rest for each index)
+boneCurveChannels = {
+	"location": (0, (0.0, 0.0, 0.0)),
+	"rotation_euler": (1, (0.0, 0.0, 0.0)),
+	"rotation_quaternion": (1, (1.0, 0.0, 0.0, 0.0)),
+	"rotation_axis_angle": (1, (0.0, 0.0, 1.0, 0.0)),
+	"scale": (2, (1.0, 1.0, 1.0)),
+	}
+
+boneDataPathPattern = re.compile(r'^pose\.bones\["(.+)"\]\.(\w+)$')
+
+
+class AnimationSizeEstimate():
+	#Estimated size of a animation exported with the FBX exporter
+
+	__slots__ = (
+		"frames",
+		"bones",
+		"varyingCurves", #Curves that change during the animation, baked at each frame
+		"constantCurves", #Curves that do not change but are not at the rest value, one key
+		"restCurves", #Curves always at the rest value, no key needed
+		"rawKeys", #Keys with all the curves baked at each frame
+		"keys", #Keys after the constant curves are stripped
+		"ueRawBytes", #Size of the raw tracks in Unreal after the constant tracks are reduced
+		)
+
+	def __init__(self, frames, bones):
+		self.frames = frames
+		self.bones = bones
+		self.varyingCurves = 0
+		self.constantCurves = 0
+		self.restCurves = 0
+		self.rawKeys = bones * fbxCurvesPerBone * frames
+		self.keys = 0
+		self.ueRawBytes = 0
+
+	@property
+	def rawBytes(self):
+		return self.rawKeys * fbxBytesPerKey
+
+	@property
+	def bytes(self):
+		return self.keys * fbxBytesPerKey
+
+	def GetStrippedCurves(self):
+		return self.constantCurves + self.restCurves
+
+	def GetText(self):
+		return (str(self.bones)+" bones, "+str(self.frames)+" frames, "
+			+str(self.varyingCurves)+"/"+str(self.bones * fbxCurvesPerBone)+" animated curves, "
+			+"keys: "+str(self.keys)+" / "+str(self.rawKeys)+" ("+GetBytesText(self.bytes)+" / "+GetBytesText(self.rawBytes)+"), "
+			+"Unreal raw data: "+GetBytesText(self.ueRawBytes))
+
+
+def GetBytesText(size):
+	for unit in ("B", "KB", "MB"):
+		if size < 1024 or unit == "MB":
+			return str(round(size, 1))+" "+unit
+		size /= 1024
+
+
+def GetSampledFrames(frameStart, frameEnd, step):
+	#Frames evaluated by the FBX exporter with bake_anim_step
+	return numpy.arange(frameStart, frameEnd + step * 0.5, step, dtype=numpy.float64)
+
+
+def GetExportedBones(armature, deformOnly):
+	#Return the bones written in the FBX
+	if deformOnly == True:
+		return [bone for bone in armature.data.bones if bone.use_deform]
+	return list(armature.data.bones)
+
+
+def GetPoseChannelStates(armature):
+	#Return {bone name: (varying, offRest)} with the 3 fbx channels of the current pose.
+	#The bones with active constraints are considered as varying.
+
+	states = {}
+	for poseBone in armature.pose.bones:
+		varying = numpy.zeros(3, dtype=bool)
+		offRest = numpy.zeros(3, dtype=bool)
+		location, rotation, scale = poseBone.matrix_basis.decompose()
+		offRest[0] = max(abs(value) for value in location) > constantTolerance
+		offRest[1] = rotation.angle > constantTolerance
+		offRest[2] = max(abs(value - 1) for value in scale) > constantTolerance
+		if any(constraint.mute == False and constraint.influence > 0 for constraint in poseBone.constraints):
+			varying[:] = True
+		states[poseBone.name] = (varying, offRest)
+	return states
+
+
+def SampleFCurve(fcurve, frames):
+	return numpy.fromiter((fcurve.evaluate(frame) for frame in frames), dtype=numpy.float64, count=len(frames))
+
+
+def AddActionChannelStates(states, action, frames):
+	#Update the states with the bone curves of the action evaluated at the frames
+
+	for fcurve in action.fcurves:
+		match = boneDataPathPattern.match(fcurve.data_path)
+		if match is None or match.group(1) not in states or match.group(2) not in boneCurveChannels:
+			continue
+		channel, restValues = boneCurveChannels[match.group(2)]
+		varying, offRest = states[match.group(1)]
+		values = SampleFCurve(fcurve, frames)
+		if numpy.ptp(values) > constantTolerance:
+			varying[channel] = True
+		elif fcurve.array_index < len(restValues) and abs(values[0] - restValues[fcurve.array_index]) > constantTolerance:
+			offRest[channel] = True
+
+
+def AddDriverChannelStates(states, armature):
+	#The bone properties driven are considered as varying
+	if armature.animation_data is None:
+		return
+	for driver in armature.animation_data.drivers:
+		match = boneDataPathPattern.match(driver.data_path)
+		if match is not None and match.group(1) in states and match.group(2) in boneCurveChannels:
+			states[match.group(1)][0][boneCurveChannels[match.group(2)][0]] = True
+
+
+def EstimateAnimationSize(armature, actions, frameCount, deformOnly = False):
+	#Return the AnimationSizeEstimate of the armature animated by the actions.
+	#actions is a list of (action, sampled frames).
+	#With deformOnly the bones are exported relative to their first deform parent
+	#so the changes of the skipped bones between them are added to the child.
+
+	states = GetPoseChannelStates(armature)
+	for action, frames in actions:
+		AddActionChannelStates(states, action, frames)
+	AddDriverChannelStates(states, armature)
+
+	exportedBones = GetExportedBones(armature, deformOnly)
+	exportedNames = set(bone.name for bone in exportedBones)
+	estimate = AnimationSizeEstimate(frameCount, len(exportedBones))
+	for bone in exportedBones:
+		varying, offRest = states[bone.name]
+		varying = varying.copy()
+		offRest = offRest.copy()
+		parent = bone.parent
+		while parent is not None and parent.name not in exportedNames:
+			if states[parent.name][0].any():
+				varying[:] = True
+			if states[parent.name][1].any():
+				offRest[:] = True
+			parent = parent.parent
+
+		varyingCurves = int(numpy.count_nonzero(varying)) * 3
+		constantCurves = int(numpy.count_nonzero(offRest & ~varying)) * 3
+		estimate.varyingCurves += varyingCurves
+		estimate.constantCurves += constantCurves
+		estimate.restCurves += fbxCurvesPerBone - varyingCurves - constantCurves
+		estimate.keys += varyingCurves * frameCount + constantCurves
+		for channel in range(3):
+			estimate.ueRawBytes += ueBytesPerTrackKey[channel] * (frameCount if varying[channel] else 1)
+	return estimate
+
+
+def GetNLAActions(obj):
+	#Return the actions used by the unmuted strips of the NLA and the active action
+	actions = []
+	if obj.animation_data is None:
+		return actions
+	if obj.animation_data.action is not None:
+		actions.append(obj.animation_data.action)
+	for track in obj.animation_data.nla_tracks:
+		if track.mute == False:
+			for strip in track.strips:
+				if strip.action is not None and strip.mute == False and strip.action not in actions:
+					actions.append(strip.action)
+	return actions
+
+
+def EstimateActionExport(armature, action, frameStart, frameEnd, step, deformOnly = False):
+	#Return the AnimationSizeEstimate of a action exported between frameStart and frameEnd
+	frames = GetSampledFrames(frameStart, frameEnd, step)
+	return EstimateAnimationSize(armature, [(action, frames)], len(frames), deformOnly)
+
+
+def EstimateNLAExport(armature, frameStart, frameEnd, step, deformOnly = False):
+	#Return the AnimationSizeEstimate of the NLA exported between frameStart and frameEnd.
+	#Each action is sampled in its own frame range, the strip remapping is not evaluated.
+	frames = GetSampledFrames(frameStart, frameEnd, step)
+	actions = [(action, GetSampledFrames(action.frame_range[0], action.frame_range[1], step)) for action in GetNLAActions(armature)]
+	return EstimateAnimationSize(armature, actions, len(frames), deformOnly)
+
+
+def EstimateMultiTakeExport(armature, actions, step, deformOnly = False):
+	#Return the AnimationSizeEstimate of the actions exported as takes of one FBX.
+	#Each take is sampled in the frame range of its action like the FBX exporter, the animated curves are the ones of all the takes.
+	takes = [(action, GetSampledFrames(action.frame_range[0], action.frame_range[1], step)) for action in actions]
+	return EstimateAnimationSize(armature, takes, sum(len(frames) for action, frames in takes), deformOnly)
+
+
+def GetFbxAnimBakeOptions(objSettings, estimate):
+	#Return (bake_anim_force_startend_keying, bake_anim_simplify_factor) for the FBX exporter.
+	#Without the start/end keying the exporter drop the curves that stay at the rest value
+	#and the simplification reduce the other constant curves to one key.
+
+	if objSettings.StripConstantAnimChannels == False or estimate.GetStrippedCurves() == 0:
+		return (True, objSettings.SimplifyAnimForExport)
+	return (False, max(objSettings.SimplifyAnimForExport, minSimplifyFactor))
+
+
+
+'''
+#########################################################################################
+			Fast armature bake
+#########################################################################################
+'''
+
+
+def DecomposeMatrices(matrices):
+	#Vectorized Matrix.decompose() of (N,4,4) matrices
+	#Return locations (N,3), normalized rotation matrices (N,3,3) and scales (N,3).
+	#Like Blender a negative matrix is decomposed with a negative scale on each axis.
+
+	locations = matrices[:, :3, 3]
+	rotations = matrices[:, :3, :3].copy()
+	scales = numpy.linalg.norm(rotations, axis=1)
+	scales[numpy.linalg.det(rotations) < 0] *= -1
+	safeScales = numpy.where(scales == 0, 1, scales)
+	rotations /= safeScales[:, numpy.newaxis, :]
+	return locations, rotations, scales
+
+
+def GetMatricesQuaternions(rotations):
+	#Vectorized Matrix.to_quaternion() of (N,3,3) normalized rotation matrices
+	#Return (N,4) quaternions (w, x, y, z) with w >= 0
+
+	m = rotations
+	quaternions = numpy.empty((len(m), 4), dtype=numpy.float64)
+	trace = m[:, 0, 0] + m[:, 1, 1] + m[:, 2, 2]
+	cases = numpy.select(
+		[trace > 0, (m[:, 0, 0] > m[:, 1, 1]) & (m[:, 0, 0] > m[:, 2, 2]), m[:, 1, 1] > m[:, 2, 2]],
+		[0, 1, 2], 3)
+
+	c = cases == 0
+	s = numpy.sqrt(1.0 + trace[c]) * 2
+	quaternions[c] = numpy.stack((0.25 * s, (m[c, 2, 1] - m[c, 1, 2]) / s, (m[c, 0, 2] - m[c, 2, 0]) / s, (m[c, 1, 0] - m[c, 0, 1]) / s), axis=1)
+	c = cases == 1
+	s = numpy.sqrt(1.0 + m[c, 0, 0] - m[c, 1, 1] - m[c, 2, 2]) * 2
+	quaternions[c] = numpy.stack(((m[c, 2, 1] - m[c, 1, 2]) / s, 0.25 * s, (m[c, 0, 1] + m[c, 1, 0]) / s, (m[c, 0, 2] + m[c, 2, 0]) / s), axis=1)
+	c = cases == 2
+	s = numpy.sqrt(1.0 + m[c, 1, 1] - m[c, 0, 0] - m[c, 2, 2]) * 2
+	quaternions[c] = numpy.stack(((m[c, 0, 2] - m[c, 2, 0]) / s, (m[c, 0, 1] + m[c, 1, 0]) / s, 0.25 * s, (m[c, 1, 2] + m[c, 2, 1]) / s), axis=1)
+	c = cases == 3
+	s = numpy.sqrt(1.0 + m[c, 2, 2] - m[c, 0, 0] - m[c, 1, 1]) * 2
+	quaternions[c] = numpy.stack(((m[c, 1, 0] - m[c, 0, 1]) / s, (m[c, 0, 2] + m[c, 2, 0]) / s, (m[c, 1, 2] + m[c, 2, 1]) / s, 0.25 * s), axis=1)
+
+	quaternions /= numpy.linalg.norm(quaternions, axis=1)[:, numpy.newaxis]
+	quaternions[quaternions[:, 0] < 0] *= -1
+	return quaternions
+
+
+def MakeQuaternionsCompatible(quaternions):
+	#Flip the sign of the quaternions of (F,N,4) frames like Quaternion.make_compatible()
+	#with the previous frame, the baked curves do not jump between q and -q
+
+	if len(quaternions) < 2:
+		return quaternions
+	dots = numpy.sum(quaternions[1:] * quaternions[:-1], axis=2)
+	signs = numpy.cumprod(numpy.where(dots < 0, -1, 1), axis=0)
+	quaternions[1:] *= signs[:, :, numpy.newaxis]
+	return quaternions
+
+
+def GetQuaternionsAxisAngles(quaternions):
+	#Return the (angle, x, y, z) of (...,4) quaternions like Quaternion.to_axis_angle()
+	angles = 2 * numpy.arccos(numpy.clip(quaternions[..., 0], -1, 1))
+	sines = numpy.sqrt(numpy.maximum(1 - quaternions[..., 0] ** 2, 0))
+	axis = quaternions[..., 1:] / numpy.where(sines > 1e-6, sines, 1)[..., numpy.newaxis]
+	axis[sines <= 1e-6] = (0, 1, 0)
+	return numpy.concatenate((angles[..., numpy.newaxis], axis), axis=-1)
+
+
+#Euler order: (axis i, j, k), parity. Like the RotOrderInfo of Blender
+eulerOrders = {
+	"XYZ": ((0, 1, 2), False),
+	"XZY": ((0, 2, 1), True),
+	"YXZ": ((1, 0, 2), True),
+	"YZX": ((1, 2, 0), False),
+	"ZXY": ((2, 0, 1), False),
+	"ZYX": ((2, 1, 0), True),
+	}
+
+
+def GetQuaternionsMatrices(quaternions):
+	#Vectorized Quaternion.to_matrix() of (...,4) normalized quaternions
+	#Return (...,3,3) rotation matrices
+
+	w, x, y, z = numpy.moveaxis(quaternions, -1, 0)
+	matrices = numpy.empty(quaternions.shape[:-1] + (3, 3), dtype=numpy.float64)
+	matrices[..., 0, 0] = 1 - 2 * (y * y + z * z)
+	matrices[..., 0, 1] = 2 * (x * y - w * z)
+	matrices[..., 0, 2] = 2 * (x * z + w * y)
+	matrices[..., 1, 0] = 2 * (x * y + w * z)
+	matrices[..., 1, 1] = 1 - 2 * (x * x + z * z)
+	matrices[..., 1, 2] = 2 * (y * z - w * x)
+	matrices[..., 2, 0] = 2 * (x * z - w * y)
+	matrices[..., 2, 1] = 2 * (y * z + w * x)
+	matrices[..., 2, 2] = 1 - 2 * (x * x + y * y)
+	return matrices
+
+
+def GetMatricesEulers(matrices, order):
+	#Vectorized mat3_normalized_to_eulO2() of Blender on (...,3,3) rotation matrices
+	#Return the two euler solutions (...,3) of each matrix
+
+	(i, j, k), parity = eulerOrders[order]
+	m = matrices
+	cy = numpy.hypot(m[..., i, i], m[..., j, i])
+	gimbal = cy <= 16 * numpy.finfo(numpy.float32).eps
+	eulers1 = numpy.empty(m.shape[:-2] + (3,), dtype=numpy.float64)
+	eulers2 = numpy.empty_like(eulers1)
+	eulers1[..., i] = numpy.where(gimbal, numpy.arctan2(-m[..., j, k], m[..., j, j]), numpy.arctan2(m[..., k, j], m[..., k, k]))
+	eulers1[..., j] = numpy.arctan2(-m[..., k, i], cy)
+	eulers1[..., k] = numpy.where(gimbal, 0, numpy.arctan2(m[..., j, i], m[..., i, i]))
+	eulers2[..., i] = numpy.arctan2(-m[..., k, j], -m[..., k, k])
+	eulers2[..., j] = numpy.arctan2(-m[..., k, i], -cy)
+	eulers2[..., k] = numpy.arctan2(-m[..., j, i], -m[..., i, i])
+	eulers2[gimbal] = eulers1[gimbal]
+	if parity:
+		eulers1 *= -1
+		eulers2 *= -1
+	return eulers1, eulers2
+
+
+def MakeEulersCompatible(eulers, previous):
+	#Vectorized compatible_eul() of Blender, move the (N,3) eulers near the (N,3) previous eulers
+
+	eulers = eulers.copy()
+	deltas = eulers - previous
+	far = numpy.abs(deltas) > 5.1
+	eulers[far] -= numpy.sign(deltas[far]) * numpy.floor(numpy.abs(deltas[far]) / (2 * numpy.pi) + 0.5) * (2 * numpy.pi)
+	deltas = eulers - previous
+	absDeltas = numpy.abs(deltas)
+	for axis in range(3):
+		flip = (absDeltas[:, axis] > 3.2) & (absDeltas[:, (axis + 1) % 3] < 1.6) & (absDeltas[:, (axis + 2) % 3] < 1.6)
+		eulers[flip, axis] -= numpy.sign(deltas[flip, axis]) * (2 * numpy.pi)
+	return eulers
+
+
+def GetQuaternionsEulers(quaternions, order):
+	#Return the eulers of (F,N,4) quaternions like Quaternion.to_euler(order) on the first frame
+	#and Quaternion.to_euler(order, previous) on the next frames.
+	#The two solutions of all the frames are converted at once. The compatible solution depends
+	#on the euler chosen at the previous frame, so only this pass steps on the frames, for all the bones at once.
+
+	eulers1, eulers2 = GetMatricesEulers(GetQuaternionsMatrices(quaternions), order)
+	eulers = numpy.empty_like(eulers1)
+	if len(eulers) == 0:
+		return eulers
+	useSecond = numpy.sum(numpy.abs(eulers1[0]), axis=-1) > numpy.sum(numpy.abs(eulers2[0]), axis=-1)
+	eulers[0] = numpy.where(useSecond[:, numpy.newaxis], eulers2[0], eulers1[0])
+	for frame in range(1, len(eulers)):
+		previous = eulers[frame - 1]
+		compatible1 = MakeEulersCompatible(eulers1[frame], previous)
+		compatible2 = MakeEulersCompatible(eulers2[frame], previous)
+		useSecond = numpy.sum(numpy.abs(compatible1 - previous), axis=-1) > numpy.sum(numpy.abs(compatible2 - previous), axis=-1)
+		eulers[frame] = numpy.where(useSecond[:, numpy.newaxis], compatible2, compatible1)
+	return eulers
+
+
+def GetBoneInheritScale(bone):
+	#Blender 2.80 only have use_inherit_scale
+	if hasattr(bone, "inherit_scale"):
+		return bone.inherit_scale
+	return "FULL" if bone.use_inherit_scale else "NONE"
+
+
+class ArmatureBakeData():
+	#Rest data of the pose bones needed to convert the pose matrices to local matrices
+
+	__slots__ = (
+		"poseBones",
+		"parentIndexes", #-1 for the root bones
+		"restOffsets", #Rest matrix of the bone relative to his parent
+		"fallbackIndexes", #Bones with a inherit option that can not use restOffsets
+		)
+
+	def __init__(self, armature):
+		poseBones = list(armature.pose.bones)
+		indexes = {poseBone.name: index for index, poseBone in enumerate(poseBones)}
+		self.poseBones = poseBones
+		self.parentIndexes = numpy.full(len(poseBones), -1, dtype=numpy.int64)
+		self.restOffsets = numpy.empty((len(poseBones), 4, 4), dtype=numpy.float64)
+		self.fallbackIndexes = []
+		for index, poseBone in enumerate(poseBones):
+			bone = poseBone.bone
+			rest = numpy.array(bone.matrix_local, dtype=numpy.float64)
+			if bone.parent is not None:
+				self.parentIndexes[index] = indexes[bone.parent.name]
+				rest = numpy.linalg.solve(numpy.array(bone.parent.matrix_local, dtype=numpy.float64), rest)
+				if bone.use_inherit_rotation == False or GetBoneInheritScale(bone) != "FULL":
+					self.fallbackIndexes.append(index)
+			if bone.use_local_location == False and index not in self.fallbackIndexes:
+				self.fallbackIndexes.append(index)
+			self.restOffsets[index] = rest
+
+	def GetLocalMatrices(self, armature, poseMatrices):
+		#Return the matrix_basis of the bones from their (N,4,4) pose matrices
+		#like armature.convert_space(from_space='POSE', to_space='LOCAL')
+
+		parents = numpy.where((self.parentIndexes >= 0)[:, numpy.newaxis, numpy.newaxis], poseMatrices[self.parentIndexes], numpy.identity(4))
+		localMatrices = numpy.linalg.solve(parents @ self.restOffsets, poseMatrices)
+		for index in self.fallbackIndexes:
+			poseBone = armature.pose.bones[self.poseBones[index].name]
+			localMatrices[index] = armature.convert_space(pose_bone=poseBone, matrix=poseBone.matrix, from_space='POSE', to_space='LOCAL')
+		return localMatrices
+
+
+def SamplePoseMatrices(armature, frames, bakeData = None, scene = None, depsgraph = None):
+	#Step the scene on the frames and read the pose matrices of all the bones at each frame
+	#With a depsgraph the pose is read from the evaluated armature of this depsgraph
+	#Return the local matrices (F,N,4,4)
+
+	if scene is None:
+		scene = bpy.context.scene
+	if bakeData is None:
+		bakeData = ArmatureBakeData(armature)
+	boneCount = len(bakeData.poseBones)
+	buffer = numpy.empty(boneCount * 16, dtype=numpy.float32)
+	localMatrices = numpy.empty((len(frames), boneCount, 4, 4), dtype=numpy.float64)
+	for frameIndex, frame in enumerate(frames):
+		scene.frame_set(int(frame), subframe=float(frame) - int(frame))
+		source = armature if depsgraph is None else armature.evaluated_get(depsgraph)
+		source.pose.bones.foreach_get("matrix", buffer)
+		poseMatrices = buffer.reshape(boneCount, 4, 4).transpose(0, 2, 1).astype(numpy.float64) #Column major
+		localMatrices[frameIndex] = bakeData.GetLocalMatrices(source, poseMatrices)
+	return localMatrices
+
+
+def AddBakedFCurve(action, dataPath, index, group, frames, values):
+	#Add a fcurve with a key at each frame in one call
+	fcurve = action.fcurves.new(dataPath, index=index, action_group=group)
+	fcurve.keyframe_points.add(len(frames))
+	co = numpy.empty(len(frames) * 2, dtype=numpy.float32)
+	co[0::2] = frames
+	co[1::2] = values
+	fcurve.keyframe_points.foreach_set("co", co)
+	fcurve.update()
+	return fcurve
+
+
+def WriteBakedAction(action, bakeData, frames, localMatrices):
+	#Write the local matrices (F,N,4,4) in the action with the rotation mode of each bone
+
+	frameCount, boneCount = localMatrices.shape[:2]
+	locations, rotations, scales = DecomposeMatrices(localMatrices.reshape(-1, 4, 4))
+	locations = locations.reshape(frameCount, boneCount, 3)
+	scales = scales.reshape(frameCount, boneCount, 3)
+	quaternions = MakeQuaternionsCompatible(GetMatricesQuaternions(rotations).reshape(frameCount, boneCount, 4))
+	eulers = numpy.zeros((frameCount, boneCount, 3), dtype=numpy.float64)
+	for order in eulerOrders:
+		indexes = [index for index, poseBone in enumerate(bakeData.poseBones) if poseBone.rotation_mode == order]
+		if len(indexes) > 0:
+			eulers[:, indexes] = GetQuaternionsEulers(quaternions[:, indexes], order)
+
+	for index, poseBone in enumerate(bakeData.poseBones):
+		name = poseBone.name
+		dataPath = 'pose.bones["'+name+'"].'
+		if poseBone.rotation_mode == "QUATERNION":
+			rotationPath, rotationValues = "rotation_quaternion", quaternions[:, index]
+		elif poseBone.rotation_mode == "AXIS_ANGLE":
+			rotationPath, rotationValues = "rotation_axis_angle", GetQuaternionsAxisAngles(quaternions[:, index])
+		else:
+			rotationPath, rotationValues = "rotation_euler", eulers[:, index]
+		for axis in range(3):
+			AddBakedFCurve(action, dataPath+"location", axis, name, frames, locations[:, index, axis])
+		for axis in range(rotationValues.shape[1]):
+			AddBakedFCurve(action, dataPath+rotationPath, axis, name, frames, rotationValues[:, axis])
+		for axis in range(3):
+			AddBakedFCurve(action, dataPath+"scale", axis, name, frames, scales[:, index, axis])
+
+
+def FastBakeArmatureAnimation(armature, frameStart, frameEnd):
+	#Bake the visual pose of all the bones in a new action like
+	#bpy.ops.nla.bake(visual_keying=True, clear_constraints=True, bake_types={'POSE'})
+	#The frames are stepped one time and the keys are written with foreach_set
+	#Return the baked action
+
+	scene = bpy.context.scene
+	savedFrame = (scene.frame_current, scene.frame_subframe)
+	frames = numpy.arange(frameStart, frameEnd + 1, dtype=numpy.float64)
+	bakeData = ArmatureBakeData(armature)
+	localMatrices = SamplePoseMatrices(armature, frames, bakeData)
+	scene.frame_set(savedFrame[0], subframe=savedFrame[1])
+
+	action = bpy.data.actions.new("Action")
+	WriteBakedAction(action, bakeData, frames, localMatrices)
+	if armature.animation_data is None:
+		armature.animation_data_create()
+	armature.animation_data.action = action
+	RemovePoseConstraints(armature)
+	return action
+
+
+def RemovePoseConstraints(armature):
+	for poseBone in armature.pose.bones:
+		while len(poseBone.constraints) > 0:
+			poseBone.constraints.remove(poseBone.constraints[0])
+
+
+def ApplyBakedAction(armature, action):
+	#Play a baked action alone on the armature, the baked constraints are removed
+	if armature.animation_data is None:
+		armature.animation_data_create()
+	armature.animation_data.action = action
+	armature.animation_data.action_extrapolation = 'HOLD'
+	armature.animation_data.action_blend_type = 'REPLACE'
+	armature.animation_data.action_influence = 1
+	RemovePoseConstraints(armature)
+
+
+def GetRigDependencies(rig):
+	#Return the rig and the objects needed to evaluate it:
+	#parents, constraint targets and driver targets
+
+	found = []
+
+	def Add(obj):
+		if obj is None or obj in found:
+			return
+		found.append(obj)
+		Add(obj.parent)
+		constraints = list(obj.constraints)
+		if obj.pose is not None:
+			for poseBone in obj.pose.bones:
+				constraints.extend(poseBone.constraints)
+		for constraint in constraints:
+			Add(getattr(constraint, "target", None))
+			Add(getattr(constraint, "pole_target", None))
+			for target in getattr(constraint, "targets", []): #Armature constraint
+				Add(target.target)
+		if obj.animation_data is not None:
+			for driver in obj.animation_data.drivers:
+				for variable in driver.driver.variables:
+					for target in variable.targets:
+						if isinstance(target.id, bpy.types.Object):
+							Add(target.id)
+
+	Add(rig)
+	return found
+
+
+class SharedRigBaker():
+	#Bake all the exported actions of a rig one time and keep the baked actions for the exports.
+	#The rig and his dependencies are linked in a temporary scene so each frame
+	#only evaluate the rig and not the full scene. The context is reused for all the actions.
+	#With ignoreNLA the actions are swapped on the rig, else the current animation
+	#is baked one time on the range of all the actions.
+
+	def __init__(self, ignoreNLA):
+		self.ignoreNLA = ignoreNLA
+		self.rigActions = {} #Rig name: [actions]
+		self.bakedActions = {} #(rig name, action name): baked action
+		self.costs = {} #Rig name: (seconds, frames, actions)
+
+	def AddAction(self, rig, action):
+		actions = self.rigActions.setdefault(rig.name, [])
+		if action not in actions:
+			actions.append(action)
+
+	def GetBakedAction(self, rig, action):
+		#Return the baked action or None if the rig can not be baked by the shared baker
+		if rig.name not in self.costs and rig.name in self.rigActions:
+			self.BakeRig(rig, self.rigActions[rig.name])
+		return self.bakedActions.get((rig.name, action.name))
+
+	def BakeRig(self, rig, actions):
+		startTime = time.perf_counter()
+		self.costs[rig.name] = (0.0, 0, 0)
+		if rig.animation_data is not None and rig.animation_data.use_tweak_mode == True:
+			return
+
+		bakeScene = bpy.data.scenes.new("BFU_RigBake_Temp")
+		sceneMutation = bfu_ExportJournal.JournalMutationBegin("temp_scene", {"name": bakeScene.name, "scene": bpy.context.scene.name})
+		if rig.animation_data is None:
+			rig.animation_data_create()
+		animationData = rig.animation_data
+		savedAnimation = (animationData.action, animationData.action_extrapolation, animationData.action_blend_type, animationData.action_influence)
+		frameCount = 0
+		try:
+			for obj in GetRigDependencies(rig):
+				bakeScene.collection.objects.link(obj)
+			viewLayer = bakeScene.view_layers[0]
+			viewLayer.update()
+			if hasattr(viewLayer, "depsgraph"):
+				scene, depsgraph = bakeScene, viewLayer.depsgraph
+			else: #Blender 2.80, the full scene is evaluated
+				scene, depsgraph = bpy.context.scene, None
+			bakeData = ArmatureBakeData(rig)
+
+			def Bake(frameStart, frameEnd):
+				frames = numpy.arange(frameStart, frameEnd + 1, dtype=numpy.float64)
+				localMatrices = SamplePoseMatrices(rig, frames, bakeData, scene, depsgraph)
+				action = bpy.data.actions.new("Action")
+				WriteBakedAction(action, bakeData, frames, localMatrices)
+				return action, len(frames)
+
+			ranges = [GetDesiredActionStartEndTime(rig, action) for action in actions]
+			if self.ignoreNLA == True:
+				for action, (frameStart, frameEnd) in zip(actions, ranges):
+					animationData.action = action
+					animationData.action_extrapolation = 'HOLD'
+					animationData.action_blend_type = 'REPLACE'
+					animationData.action_influence = 1
+					viewLayer.update()
+					bakedAction, frames = Bake(frameStart, frameEnd)
+					self.bakedActions[(rig.name, action.name)] = bakedAction
+					frameCount += frames
+			elif len(ranges) > 0:
+				bakedAction, frameCount = Bake(min(r[0] for r in ranges), max(r[1] for r in ranges))
+				for action in actions:
+					self.bakedActions[(rig.name, action.name)] = bakedAction
+		finally:
+			animationData.action, animationData.action_extrapolation, animationData.action_blend_type, animationData.action_influence = savedAnimation
+			bpy.data.scenes.remove(bakeScene)
+			bfu_ExportJournal.JournalMutationEnd(sceneMutation)
+			bpy.context.scene.frame_set(bpy.context.scene.frame_current)
+
+		self.costs[rig.name] = (time.perf_counter() - startTime, frameCount, len(actions))
+
+	def PrintCosts(self):
+		for rigName, (seconds, frames, actions) in self.costs.items():
+			print("Shared bake of "+rigName+": "+str(actions)+" action(s), "+str(frames)+" frames in "+str(round(seconds, 3))+" sec.")
@@ -0,0 +1,166 @@
+#====================== BEGIN GPL LICENSE BLOCK ============================
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.	 See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.	 If not, see <http://www.gnu.org/licenses/>.
+#  All rights reserved.
+#
+#======================= END GPL LICENSE BLOCK =============================
+
+import bpy
+import numpy
+
+import importlib
+from . import bfu_Basics
+importlib.reload(bfu_Basics)
+from .bfu_Basics import *
+
+from . import bfu_Utils
+importlib.reload(bfu_Utils)
+from .bfu_Utils import *
+
+
+#(stat name, label, preference name of the budget of the StaticMesh, of the SkeletalMesh)
+#The budget 0 is no limit
+budgetStats = (
+	("triangles", "Triangles", "budgetStaticMeshTriangles", "budgetSkeletalMeshTriangles"),
+	("materials", "Materials", "budgetMaterials", "budgetMaterials"),
+	("uvChannels", "UVs", "budgetUVChannels", "budgetUVChannels"),
+	("vertexColors", "Colors", None, None),
+	("maxInfluences", "Influences", None, "budgetBoneInfluences"),
+	("bones", "Bones", None, "budgetBones"),
+	)
+
+
+class AssetBudget():
+	#Runtime cost of a exported StaticMesh or SkeletalMesh in Unreal
+
+	__slots__ = (
+		"name",
+		"assetType",
+		"triangles", #After the modifiers
+		"materials", #Materials used by the faces, one draw call each
+		"uvChannels",
+		"vertexColors",
+		"maxInfluences", #Max number of bones that deform a vertex
+		"bones",
+		)
+
+	def __init__(self, name, assetType):
+		self.name = name
+		self.assetType = assetType
+		self.triangles = 0
+		self.materials = 0
+		self.uvChannels = 0
+		self.vertexColors = False
+		self.maxInfluences = 0
+		self.bones = 0
+
+	def GetOverruns(self, limits):
+		#Return (stat name, label, value, budget) for each stat over his budget
+		overruns = []
+		for name, label, staticLimit, skeletalLimit in budgetStats:
+			limitName = skeletalLimit if self.assetType == "SkeletalMesh" else staticLimit
+			if limitName is not None and limits[limitName] > 0 and getattr(self, name) > limits[limitName]:
+				overruns.append((name, label, getattr(self, name), limits[limitName]))
+		return overruns
+
+
+def GetBudgetLimits(settings = None):
+	#Return the budgets of the export settings or of the addon preferences {preference name: value}
+	if settings is None:
+		settings = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
+	limits = {}
+	for name, label, staticLimit, skeletalLimit in budgetStats:
+		for limitName in (staticLimit, skeletalLimit):
+			if limitName is not None:
+				limits[limitName] = getattr(settings, limitName)
+	return limits
+
+
+def GetMaxBoneInfluences(meshObj, boneNames):
+	#Return the max number of bones with a weight on one vertex of the mesh.
+	#The weights are not exposed to foreach_get, they are read once in flat arrays
+	#(vertex index, group index, weight) and the influences are counted with numpy.
+
+	isBoneGroup = numpy.array([group.name in boneNames for group in meshObj.vertex_groups], dtype=bool)
+	vertices = meshObj.data.vertices
+	if len(vertices) == 0 or not numpy.any(isBoneGroup):
+		return 0
+	elements = numpy.array([(vertex.index, element.group, element.weight) for vertex in vertices for element in vertex.groups], dtype=numpy.float64).reshape(-1, 3)
+	vertexIndexes = elements[:, 0].astype(numpy.int64)
+	groupIndexes = elements[:, 1].astype(numpy.int64)
+	isInfluence = (groupIndexes < len(isBoneGroup)) & (elements[:, 2] > 0)
+	isInfluence[isInfluence] = isBoneGroup[groupIndexes[isInfluence]]
+	counts = numpy.bincount(vertexIndexes[isInfluence], minlength=len(vertices))
+	return int(counts.max())
+
+
+def GetAssetBudget(obj, assetType, childs, depsgraph = None):
+	#Return the AssetBudget of a StaticMesh (obj and his mesh childs)
+	#or a SkeletalMesh (the armature obj and his mesh childs).
+	#The collisions and the sockets are not rendered and not counted.
+
+	if depsgraph is None:
+		depsgraph = bpy.context.evaluated_depsgraph_get()
+	budget = AssetBudget(obj.name, assetType)
+	notRendered = set(GetAllCollisionAndSocketsObj(childs))
+	meshObjs = [child for child in childs if child.type == "MESH" and child not in notRendered]
+	if obj.type == "MESH":
+		meshObjs.insert(0, obj)
+
+	boneNames = set()
+	if assetType == "SkeletalMesh" and obj.type == "ARMATURE":
+		bones = obj.data.bones
+		if obj.exportDeformOnly == True:
+			bones = [bone for bone in bones if bone.use_deform]
+		boneNames = set(bone.name for bone in bones)
+		budget.bones = len(boneNames)
+
+	materials = set()
+	for meshObj in meshObjs:
+		objEval = meshObj.evaluated_get(depsgraph)
+		mesh = objEval.to_mesh()
+		try:
+			loopTotals = GetCollectionArray(mesh.polygons, "loop_total", 1, numpy.int32)
+			budget.triangles += int(numpy.sum(loopTotals - 2))
+			materialIndexes = numpy.unique(GetCollectionArray(mesh.polygons, "material_index", 1, numpy.int32))
+			slots = objEval.material_slots
+			for index in materialIndexes:
+				material = slots[int(index)].material if int(index) < len(slots) else None
+				materials.add(material.name if material is not None else (meshObj.name, int(index)))
+			budget.uvChannels = max(budget.uvChannels, len(mesh.uv_layers))
+			budget.vertexColors = budget.vertexColors or len(mesh.vertex_colors) > 0
+		finally:
+			objEval.to_mesh_clear()
+		if len(boneNames) > 0:
+			budget.maxInfluences = max(budget.maxInfluences, GetMaxBoneInfluences(meshObj, boneNames))
+	budget.materials = len(materials)
+	return budget
+
+
+def GetExportedAssetBudgets():
+	#Return the AssetBudget of the StaticMesh and SkeletalMesh in scene.UnrealExportedAssetsList
+	#The generated lods and the alias are not counted again
+
+	depsgraph = bpy.context.evaluated_depsgraph_get()
+	budgets = []
+	doneObjects = set()
+	for asset in bpy.context.scene.UnrealExportedAssetsList:
+		obj = asset.object
+		if asset.assetType not in ("StaticMesh", "SkeletalMesh") or asset.lodLevel > 0 or asset.aliasOf != "":
+			continue
+		if obj is None or obj.name in doneObjects:
+			continue
+		doneObjects.add(obj.name)
+		budgets.append(GetAssetBudget(obj, asset.assetType, GetExportDesiredChilds(obj), depsgraph))
+	return budgets
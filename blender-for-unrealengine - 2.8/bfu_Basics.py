@@ -21,6 +21,9 @@ import bpy
 import os
 import string
 import shutil
+import hashlib
+import locale
+import contextlib
 import bmesh
 import requests 
 import json
@@ -63,15 +66,46 @@ def SetCurrentSelect(SelectArray):
 	bpy.ops.object.select_all(action='DESELECT')
 	for obj in SelectArray[1]:
 		if not is_deleted(obj):
-			if obj.name in bpy.context.window.view_layer.objects:
+			if obj.name in bpy.context.view_layer.objects:
 				obj.select_set(True)
 	SelectArray[0].select_set(True)
 	bpy.context.view_layer.objects.active = SelectArray[0]
 	
+def SetActiveScene(scene):
+	#Set the scene of the current window.
+	#Without window (background mode) the context scene can not be changed, use UseActiveScene()
+
+	if bpy.context.window is not None:
+		bpy.context.window.scene = scene
+	elif bpy.context.scene != scene:
+		print("/!\\ No window to set the active scene, the context scene stay "+bpy.context.scene.name)
+
+@contextlib.contextmanager
+def UseActiveScene(scene):
+	#Make scene the context scene in the with block, the previous scene is set back at the end.
+	#Without window (background mode) a context override is used (Blender 3.2+).
+	#Else a error is raised, the export must not continue in the user scene.
+
+	window = bpy.context.window
+	if window is not None:
+		userScene = window.scene
+		window.scene = scene
+		try:
+			yield scene
+		finally:
+			if userScene.name in bpy.data.scenes:
+				window.scene = userScene
+	elif hasattr(bpy.context, "temp_override"):
+		viewLayer = scene.view_layers.get(bpy.context.view_layer.name, scene.view_layers[0])
+		with bpy.context.temp_override(scene=scene, view_layer=viewLayer):
+			yield scene
+	else:
+		raise RuntimeError("The scene "+scene.name+" can not be made active without window, the export in background mode need Blender 3.2+")
+
 def SelectSpecificObject(obj):
 	
 	bpy.ops.object.select_all(action='DESELECT')
-	if obj.name in bpy.context.window.view_layer.objects:
+	if obj.name in bpy.context.view_layer.objects:
 		obj.select_set(True)
 	bpy.context.view_layer.objects.active = obj	
 	
@@ -160,6 +194,127 @@ def VerifiDirs(directory):
 	if not os.path.exists(directory):
 		os.makedirs(directory)
 
+def GetFileHash(filepath):
+	#Return the content hash of a file or None if the file does not exist
+
+	if not os.path.isfile(filepath):
+		return None
+	hasher = hashlib.sha1()
+	with open(filepath, "rb") as file:
+		for chunk in iter(lambda: file.read(1048576), b""):
+			hasher.update(chunk)
+	return hasher.hexdigest()
+
+def GetStagedFilePath(filepath):
+	#Return the temporary path used to write a file before it replaces the final one.
+	#It stays in the same folder so the final rename is atomic and keeps the extension for the exporters.
+
+	dirpath, filename = os.path.split(filepath)
+	name, extension = os.path.splitext(filename)
+	return os.path.join(dirpath, "~"+name+".bfutmp"+extension)
+
+def RemoveStagedFiles(folder):
+	#Remove the staged files left in a folder tree by an interrupted export
+
+	if not os.path.isdir(folder):
+		return
+	for dirpath, dirnames, filenames in os.walk(folder):
+		for filename in filenames:
+			if filename.startswith("~") and ".bfutmp." in filename:
+				os.remove(os.path.join(dirpath, filename))
+
+def CommitStagedFile(stagedpath, filepath, stagedHash = None):
+	#Replace the final file by the staged file only if the content is different
+	#Return True if the final file was replaced
+
+	if not os.path.isfile(stagedpath):
+		print("/!\ Staged file not found: "+stagedpath)
+		return False
+	if stagedHash is None:
+		stagedHash = GetFileHash(stagedpath)
+	if stagedHash == GetFileHash(filepath):
+		os.remove(stagedpath)
+		return False
+	os.replace(stagedpath, filepath)
+	return True
+
+def WriteTextFileIfChanged(text, filepath):
+	#Write a text file like open(filepath, "w") but through a staged file.
+	#The text is encoded in memory first so an identical output is never rewritten.
+	#Return True if the file was written
+
+	data = text.replace("\n", os.linesep).encode(locale.getpreferredencoding(False))
+	if hashlib.sha1(data).hexdigest() == GetFileHash(filepath):
+		return False
+	stagedpath = GetStagedFilePath(filepath)
+	with open(stagedpath, "wb") as file:
+		file.write(data)
+	os.replace(stagedpath, filepath)
+	return True
+
+class ScriptEmitter():
+	#Write a text line after line in a file (or in memory if file is None)
+	#with the indentation of the current Indented() blocks.
+	#Each line is written when it is emitted, the full text is never built.
+
+	def __init__(self, file = None, indentText = "\t"):
+		self.file = file
+		self.parts = []
+		self.indentText = indentText
+		self.indentLevel = 0
+		self.indent = ""
+		self.atLineStart = True
+
+	def Write(self, text):
+		#Write a text, it can contain several lines
+		if text == "":
+			return
+		if self.indent != "":
+			if self.atLineStart:
+				text = self.indent + text
+			if text.endswith("\n"):
+				text = text[:-1].replace("\n", "\n"+self.indent) + "\n"
+			else:
+				text = text.replace("\n", "\n"+self.indent)
+		self.atLineStart = text.endswith("\n")
+		if self.file is not None:
+			self.file.write(text)
+		else:
+			self.parts.append(text)
+
+	def Line(self, text = ""):
+		self.Write(text + "\n")
+
+	@contextlib.contextmanager
+	def Indented(self, count = 1):
+		#Indent all the lines written in the with block
+		self.indentLevel += count
+		self.indent = self.indentText * self.indentLevel
+		try:
+			yield self
+		finally:
+			self.indentLevel -= count
+			self.indent = self.indentText * self.indentLevel
+
+	def GetText(self):
+		#Return the text written in memory
+		return "".join(self.parts)
+
+def WriteScriptFileIfChanged(writeFunction, filepath):
+	#Call writeFunction(ScriptEmitter) to stream a text file through a staged file.
+	#The final file is only replaced if the content is different.
+	#Return True if the file was written
+
+	stagedpath = GetStagedFilePath(filepath)
+	try:
+		with open(stagedpath, "w", encoding=locale.getpreferredencoding(False), buffering=1048576) as file:
+			writeFunction(ScriptEmitter(file))
+	except:
+		if os.path.isfile(stagedpath):
+			os.remove(stagedpath)
+		raise
+	return CommitStagedFile(stagedpath, filepath)
+
 
 def ValidFilename(filename):
 	# remove not allowed characters
@@ -0,0 +1,683 @@
+#====================== BEGIN GPL LICENSE BLOCK ============================
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.	 See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.	 If not, see <http://www.gnu.org/licenses/>.
+#  All rights reserved.
+#
+#======================= END GPL LICENSE BLOCK =============================
+
+
+import bpy
+import time
+import numpy
+from bpy.app.handlers import persistent
+
+import importlib
+from . import bfu_Basics
+importlib.reload(bfu_Basics)
+from .bfu_Basics import *
+
+from . import bfu_Utils
+importlib.reload(bfu_Utils)
+from .bfu_Utils import *
+
+from . import bfu_AssetBudget
+importlib.reload(bfu_AssetBudget)
+
+from . import bfu_ExportSettings
+importlib.reload(bfu_ExportSettings)
+
+
+#Kind of data visited by the checker. The rules of a scope are called with:
+#"object":    (checker, data)
+#"modifier":  (checker, data, modif)        modifiers of the mesh objects
+#"mesh":      (checker, data)               after the modifiers of the mesh
+#"shape_key": (checker, data, key)
+#"bone":      (checker, data, bone)         bones of the SkeletalMesh
+#"skeleton":  (checker, data)               after the bones of the SkeletalMesh
+#"skin":      (checker, data, childData)    mesh childs of the SkeletalMesh
+#"action":    (checker, action)             exported actions
+#"fcurve":    (checker, action, fcurve)     fcurves of the exported actions
+#"scene":     (checker, scene)
+#The per item scopes (shape_key, fcurve) are only walked if a rule use them,
+#rules that read a whole array with foreach_get should use the parent scope.
+checkScopes = ("object", "modifier", "mesh", "shape_key", "bone", "skeleton", "skin", "action", "fcurve", "scene")
+
+potentialErrorRules = [] #(scope, callback)
+
+#Errors of the previous checks and the data changed since, see PotentialErrorDepsgraphUpdate()
+checkCache = {} #OwnerKey: CheckCacheEntry
+dirtyIds = set() #IdKey
+checkedOwnersCache = {} #Object name: CheckedOwner, the export_recursive objects of the previous checks
+lastCheckTiming = {} #Rule name: seconds, of the last UpdateUnrealPotentialError
+
+
+def PotentialErrorRule(scope):
+	#Decorator to register a rule in the checker
+
+	def Register(callback):
+		potentialErrorRules.append((scope, callback))
+		return callback
+	return Register
+
+
+class ObjectCheckData():
+	#Values of a object resolved once and shared by the rules
+
+	__slots__ = (
+		"obj",
+		"assetType",
+		"isCollision",
+		"childs",
+		"actions",
+		"armatureModifiers",
+		)
+
+	def __init__(self, obj, assetType, isCollision, childs, actions = None):
+		self.obj = obj
+		self.assetType = assetType
+		self.isCollision = isCollision
+		self.childs = childs
+		self.actions = actions if actions is not None else []
+		self.armatureModifiers = []
+
+
+class CheckedOwner():
+	#A export_recursive object resolved by a previous check.
+	#The objects are the owner and his exported childs, kept by name:
+	#[object name, child names, isCollision, exported action names or None]
+
+	__slots__ = (
+		"name",
+		"exported",
+		"objects",
+		)
+
+	def __init__(self, obj, scene):
+		self.name = obj.name
+		entry = GetCheckedObjectEntry(obj, False)
+		self.objects = [entry]
+		self.exported = GetIsInExportPlan(obj, scene, entry[3])
+		if self.exported:
+			childs = GetExportDesiredChilds(obj)
+			entry[1] = tuple(child.name for child in childs)
+			for child in childs:
+				self.objects.append(GetCheckedObjectEntry(child))
+
+	def UpdateActions(self):
+		#Resolve again the exported actions of the armatures
+		for entry in self.objects:
+			obj = bpy.data.objects.get(entry[0])
+			if entry[3] is not None and obj is not None:
+				entry[3] = GetCheckedObjectEntry(obj, False)[3]
+
+
+def GetCheckedObjectEntry(obj, withChilds = True):
+	childNames = tuple(child.name for child in GetExportDesiredChilds(obj)) if withChilds else ()
+	actionNames = None
+	if GetAssetType(obj) == "SkeletalMesh":
+		actionNames = tuple(action.name for action in GetActionToExport(obj))
+	return [obj.name, childNames, GetIsCollisionObj(obj), actionNames]
+
+
+def GetIsInExportPlan(obj, scene, actionNames):
+	#Return True if GetFinalAssetToExport() give a asset for this export_recursive object
+	assetType = GetAssetType(obj)
+	if assetType == "Alembic":
+		return scene.alembic_export
+	if assetType == "SkeletalMesh":
+		return scene.skeletal_export or (scene.anin_export and (obj.ExportNLA or len(actionNames) > 0))
+	if assetType == "Camera":
+		return scene.camera_export
+	if assetType == "StaticMesh":
+		return scene.static_export
+	return False
+
+
+def GetIdKey(id):
+	#Return the key used to track the changes of a data-block
+	return (type(id).__name__, id.name)
+
+
+class CheckCacheEntry():
+	#Errors found for a object or a action and the data-blocks they was found from
+
+	__slots__ = (
+		"dependencies",
+		"errors",
+		)
+
+	def __init__(self, dependencies):
+		self.dependencies = dependencies
+		self.errors = []
+
+
+class PotentialErrorChecker():
+	#Walk the exported objects, modifiers, shape keys, bones and fcurves one time
+	#and call the rules registered for each of them.
+	#The errors are grouped by owner (a object, a action or the scene). With a cache
+	#the owners whose dependencies are not in dirtyIds reuse their previous errors.
+	#The found errors are kept as dict and written to potentialErrorList at the end.
+
+	def __init__(self, scene, rules = None, cache = None, dirtyIds = None, settings = None):
+		self.scene = scene
+		self.settings = bfu_ExportSettings.GetExportSettings(settings)
+		self.cache = cache
+		self.dirtyIds = dirtyIds if dirtyIds is not None else set()
+		self.entries = []
+		self.currentEntry = None
+		self.checkedOwners = 0
+		self.reusedOwners = 0
+		self.rules = {scope: [] for scope in checkScopes}
+		self.timing = {} #Rule name: seconds
+		for scope, callback in (potentialErrorRules if rules is None else rules):
+			self.rules[scope].append(callback)
+			self.timing[callback.__name__] = 0.0
+
+	@property
+	def errors(self):
+		return [error for entry in self.entries for error in entry.errors]
+
+	def StartOwner(self, ownerKey, dependencies = None):
+		#Return False if the cached errors of the owner are still valid, they are reused.
+		#Without dependencies the owner is always checked.
+
+		if self.cache is not None and dependencies is not None and ownerKey in self.cache:
+			entry = self.cache[ownerKey]
+			if entry.dependencies == dependencies and entry.dependencies.isdisjoint(self.dirtyIds):
+				self.entries.append(entry)
+				self.reusedOwners += 1
+				return False
+		self.currentEntry = CheckCacheEntry(dependencies)
+		self.entries.append(self.currentEntry)
+		if self.cache is not None and dependencies is not None:
+			self.cache[ownerKey] = self.currentEntry
+		self.checkedOwners += 1
+		return True
+
+	def GetObjectDependencies(self, data):
+		#Data-blocks used by the rules of a object
+		dependencies = set()
+		for obj in [data.obj] + data.childs:
+			dependencies.add(GetIdKey(obj))
+			if obj.data is not None:
+				dependencies.add(GetIdKey(obj.data))
+				if obj.type == "MESH" and obj.data.shape_keys is not None:
+					dependencies.add(GetIdKey(obj.data.shape_keys))
+		return frozenset(dependencies)
+
+	def AddError(self, type, text, obj = None, name = None, itemName = None, correctRef = None, correctlabel = None, vertexErrorType = None):
+		#type 0:Info, 1:Warning, 2:Error
+		#The object is kept by name, the cached errors can live longer than the object
+		error = {"type": type, "text": text}
+		if obj is not None:
+			error["object"] = obj.name
+			error["name"] = obj.name
+		if name is not None:
+			error["name"] = name
+		if itemName is not None:
+			error["itemName"] = itemName
+		if correctRef is not None:
+			error["correctRef"] = correctRef
+			error["correctlabel"] = correctlabel
+		if vertexErrorType is not None:
+			error["vertexErrorType"] = vertexErrorType
+		self.currentEntry.errors.append(error)
+
+	def Call(self, scope, *args):
+		for callback in self.rules[scope]:
+			startTime = time.perf_counter()
+			callback(self, *args)
+			self.timing[callback.__name__] += time.perf_counter() - startTime
+
+	def GetObjectsToCheck(self):
+		#Return the ObjectCheckData of the exported objects and their childs, each object one time.
+		#With a cache the export_recursive objects are kept between the checks
+		#and only the ones related to the objects in dirtyIds are resolved again.
+
+		scene = self.scene
+		if self.cache is None or scene.export_ExportOnlySelected == True:
+			checkedOwnersCache.clear()
+			owners = {}
+			for asset in GetFinalAssetToExport():
+				obj = asset.obj
+				if obj is not None and obj.ExportEnum == "export_recursive" and obj.name not in owners:
+					owners[obj.name] = CheckedOwner(obj, scene)
+			return self.GetOwnersObjectsData(owners)
+
+		if len(checkedOwnersCache) == 0 or self.UpdateCheckedOwners() == False:
+			self.RebuildCheckedOwners()
+		objectsData = self.GetOwnersObjectsData(checkedOwnersCache)
+		if objectsData is None:
+			self.RebuildCheckedOwners()
+			objectsData = self.GetOwnersObjectsData(checkedOwnersCache)
+		return objectsData
+
+	def RebuildCheckedOwners(self):
+		checkedOwnersCache.clear()
+		for obj in GetAllobjectsByExportType("export_recursive"):
+			checkedOwnersCache[obj.name] = CheckedOwner(obj, self.scene)
+
+	def UpdateCheckedOwners(self):
+		#Resolve again the owners of the changed objects.
+		#Return False if the change need to resolve all the owners.
+
+		scene = self.scene
+		dirtyObjectNames = []
+		actionsChanged = False
+		for idType, name in self.dirtyIds:
+			if idType == "Scene" or idType == "Collection":
+				return False
+			if idType == "Object":
+				dirtyObjectNames.append(name)
+			elif idType == "Action":
+				actionsChanged = True
+
+		ownersToUpdate = set()
+		if len(dirtyObjectNames) > 0:
+			objectOwners = {} #Object name: owner names
+			for owner in checkedOwnersCache.values():
+				for entry in owner.objects:
+					objectOwners.setdefault(entry[0], set()).add(owner.name)
+			for name in dirtyObjectNames:
+				ownersToUpdate.update(objectOwners.get(name, ()))
+				parent = scene.objects.get(name)
+				while parent is not None:
+					if parent.ExportEnum == "export_recursive" or parent.name in checkedOwnersCache:
+						ownersToUpdate.add(parent.name)
+					parent = parent.parent
+
+		for name in ownersToUpdate:
+			obj = scene.objects.get(name)
+			if obj is not None and obj.ExportEnum == "export_recursive":
+				checkedOwnersCache[name] = CheckedOwner(obj, scene)
+			else:
+				checkedOwnersCache.pop(name, None)
+
+		if actionsChanged:
+			for owner in list(checkedOwnersCache.values()):
+				if owner.name not in ownersToUpdate and owner.objects[0][3] is not None:
+					obj = scene.objects.get(owner.name)
+					if obj is None:
+						return False
+					owner.UpdateActions()
+					if owner.exported != GetIsInExportPlan(obj, scene, owner.objects[0][3]):
+						checkedOwnersCache[owner.name] = CheckedOwner(obj, scene)
+		return True
+
+	def GetOwnersObjectsData(self, owners):
+		#Return the ObjectCheckData of the objects of the exported owners.
+		#Return None if a object was renamed or removed since the owner was resolved.
+
+		scene = self.scene
+		objectsData = {}
+		for owner in owners.values():
+			if owner.exported == False:
+				continue
+			for objectName, childNames, isCollision, actionNames in owner.objects:
+				if objectName in objectsData:
+					continue
+				obj = scene.objects.get(objectName)
+				childs = [scene.objects.get(name) for name in childNames]
+				actions = [bpy.data.actions.get(name) for name in actionNames] if actionNames is not None else []
+				if obj is None or None in childs or None in actions:
+					return None
+				objectsData[objectName] = ObjectCheckData(obj, GetAssetType(obj), isCollision, childs, actions)
+		return list(objectsData.values())
+
+	def Run(self):
+		objectsData = self.GetObjectsToCheck()
+		checkedActions = set()
+
+		for data in objectsData:
+			obj = data.obj
+			if not self.StartOwner(("Object", obj.name), self.GetObjectDependencies(data)):
+				continue
+			self.Call("object", data)
+
+			if obj.type == "MESH":
+				for modif in obj.modifiers:
+					if modif.type == "ARMATURE":
+						data.armatureModifiers.append(modif)
+					self.Call("modifier", data, modif)
+				self.Call("mesh", data)
+				if obj.data.shape_keys is not None and len(self.rules["shape_key"]) > 0:
+					for key in obj.data.shape_keys.key_blocks:
+						self.Call("shape_key", data, key)
+
+			if data.assetType == "SkeletalMesh":
+				for bone in obj.data.bones:
+					self.Call("bone", data, bone)
+				self.Call("skeleton", data)
+				for child in data.childs:
+					if child.type == "MESH":
+						self.Call("skin", data, child)
+
+		for data in objectsData:
+			if data.assetType == "SkeletalMesh":
+				for action in data.actions:
+					if action not in checkedActions:
+						checkedActions.add(action)
+						if self.StartOwner(("Action", action.name), frozenset([GetIdKey(action)])):
+							self.Call("action", action)
+							if len(self.rules["fcurve"]) > 0:
+								for fcurve in action.fcurves:
+									self.Call("fcurve", action, fcurve)
+
+		self.StartOwner(("Scene", self.scene.name))
+		self.Call("scene", self.scene)
+
+		if self.cache is not None:
+			#Forget the owners no longer checked
+			usedEntries = set(id(entry) for entry in self.entries)
+			for ownerKey in [key for key, entry in self.cache.items() if id(entry) not in usedEntries]:
+				del self.cache[ownerKey]
+
+	def WriteErrors(self, PotentialErrors):
+		#Write the found errors in the scene list
+		PotentialErrors.clear()
+		for error in self.errors:
+			MyError = PotentialErrors.add()
+			for name, value in error.items():
+				if name == "object":
+					value = bpy.data.objects.get(value)
+				setattr(MyError, name, value)
+
+	def PrintTiming(self):
+		total = sum(self.timing.values())
+		print("Potential errors: "+str(len(self.errors))+" found in "+str(round(total*1000, 2))+" ms ("+str(self.checkedOwners)+" checked, "+str(self.reusedOwners)+" from cache)")
+		for name, value in sorted(self.timing.items(), key=lambda item: item[1], reverse=True):
+			print("	"+name+": "+str(round(value*1000, 2))+" ms")
+
+
+'''
+#########################################################################################
+			Rules
+#########################################################################################
+'''
+
+
+@PotentialErrorRule("object")
+def CheckObjType(checker, data):
+	#Check if objects use a non-recommended type
+	obj = data.obj
+	if obj.type == "SURFACE" or obj.type == "META" or obj.type == "FONT":
+		checker.AddError(1, 'Object "'+obj.name+'" is a '+obj.type+'. The object of the type SURFACE, META and FONT is not recommended.',
+			obj, correctRef="ConvertToMesh", correctlabel='Convert to mesh')
+
+
+@PotentialErrorRule("modifier")
+def CheckShapeKeysModifier(checker, data, modif):
+	#Check that no modifiers is destructive for the key shapes
+	obj = data.obj
+	if obj.data.shape_keys is not None and len(obj.data.shape_keys.key_blocks) > 0:
+		if modif.type != "ARMATURE":
+			checker.AddError(2, 'In object "'+obj.name+'" the modifier '+modif.type+' named "'+modif.name+'" can destroy shape keys. Please use only Armature modifier with shape keys.',
+				obj, itemName=modif.name, correctRef="RemoveModfier", correctlabel='Remove modifier')
+
+
+@PotentialErrorRule("mesh")
+def CheckShapeKeysRange(checker, data):
+	#Check that the key shapes are not out of bounds for Unreal
+	obj = data.obj
+	if obj.data.shape_keys is None:
+		return
+	keyBlocks = obj.data.shape_keys.key_blocks
+	#Min
+	for index in numpy.flatnonzero(GetCollectionFloatArray(keyBlocks, "slider_min") < -5):
+		key = keyBlocks[int(index)]
+		checker.AddError(1, 'In object "'+obj.name+'" the shape key "'+key.name+'" is out of bounds for Unreal. The min range of must not be inferior to -5.',
+			obj, itemName=key.name, correctRef="SetKeyRangeMin", correctlabel='Set min range to -5')
+	#Max
+	for index in numpy.flatnonzero(GetCollectionFloatArray(keyBlocks, "slider_max") > 5):
+		key = keyBlocks[int(index)]
+		checker.AddError(1, 'In object "'+obj.name+'" the shape key "'+key.name+'" is out of bounds for Unreal. The max range of must not be superior to 5.',
+			obj, itemName=key.name, correctRef="SetKeyRangeMax", correctlabel='Set max range to -5')
+
+
+@PotentialErrorRule("mesh")
+def CheckUVMaps(checker, data):
+	#Check that the objects have at least one UV map valid
+	obj = data.obj
+	if not data.isCollision and len(obj.data.uv_layers) < 1:
+		checker.AddError(1, 'Object "'+obj.name+'" does not have any UV Layer.',
+			obj, correctRef="CreateUV", correctlabel='Create Smart UV Project')
+
+
+@PotentialErrorRule("modifier")
+def CheckBadStaicMeshExportedLikeSkeletalMesh(checker, data, modif):
+	#Check if the correct object is defined as exportable
+	obj = data.obj
+	if modif.type == "ARMATURE" and obj.ExportEnum == "export_recursive":
+		checker.AddError(1, 'In object "'+obj.name+'" the modifier '+modif.type+' named "'+modif.name+'" will not be applied when exported with StaticMesh assets.\nNote: with armature if you want export objets as skeletal mesh you need set only the armature as export_recursive not the childs',
+			obj)
+
+
+@PotentialErrorRule("mesh")
+def CheckArmatureModNumber(checker, data):
+	#check that there is no more than one Modifier ARMATURE at the same time
+	obj = data.obj
+	if len(data.armatureModifiers) > 1:
+		checker.AddError(2, 'In object "'+obj.name+'" there are several Armature modifiers at the same time. Please use only one Armature modifier.',
+			obj)
+
+
+@PotentialErrorRule("modifier")
+def CheckArmatureModData(checker, data, modif):
+	#check the parameter of Modifier ARMATURE
+	obj = data.obj
+	if modif.type == "ARMATURE" and modif.use_deform_preserve_volume == True:
+		checker.AddError(2, 'In object "'+obj.name+'" the modifier '+modif.type+' named "'+modif.name+'". The parameter Preserve Volume must be set to False.',
+			obj, itemName=modif.name, correctRef="PreserveVolume", correctlabel='Set Preserve Volume to False')
+
+
+@PotentialErrorRule("bone")
+def CheckArmatureBoneData(checker, data, bone):
+	#check the parameter of the ARMATURE bones
+	obj = data.obj
+	if bone.bbone_segments > 1:
+		checker.AddError(2, 'In object3 "'+obj.name+'" the bone named "'+bone.name+'". The parameter Bendy Bones / Segments must be set to 1.',
+			obj, itemName=bone.name, correctRef="BoneSegments", correctlabel='Set Bone Segments to 1')
+
+	if bone.use_inherit_scale == False:
+		checker.AddError(2, 'In object2 "'+obj.name+'" the bone named "'+bone.name+'". The parameter Inherit Scale must be set to True.',
+			obj, itemName=bone.name, correctRef="InheritScale", correctlabel='Set Inherit Scale to True')
+
+
+@PotentialErrorRule("skeleton")
+def CheckArmatureValidChild(checker, data):
+	#Check that skeleton also has a mesh to export
+	obj = data.obj
+	validChild = 0
+	for child in data.childs:
+		if child.type == "MESH":
+			validChild += 1
+	if obj.ExportAsProxy == True:
+		if obj.ExportProxyChild is not None:
+			validChild += 1
+	if validChild < 1:
+		checker.AddError(2, 'Object "'+obj.name+'" is an Armature and does not have any valid children.',
+			obj)
+
+
+@PotentialErrorRule("skeleton")
+def CheckArmatureMultipleRoots(checker, data):
+	#Check that skeleton have multiples roots
+	obj = data.obj
+	topology = GetBoneTopology(obj.data)
+	if obj.exportDeformOnly == True:
+		rootBones = topology.GetDeformRoots()
+	else:
+		rootBones = topology.roots
+
+	if len(rootBones) > 1:
+		text = 'Object "'+obj.name+'" have Multiple roots bones. Unreal only support single root bone.'
+		text += '\nRoot bones: '
+		for rootBone in rootBones:
+			text += rootBone+' '
+		checker.AddError(2, text, obj)
+
+
+@PotentialErrorRule("object")
+def CheckPerformanceBudget(checker, data):
+	#Check that the exported StaticMesh and SkeletalMesh stay in the budgets of the addon preferences
+	obj = data.obj
+	if checker.settings.useBudgetCheck == False or data.isCollision:
+		return
+	if checker.settings.GetObject(obj).ExportEnum != "export_recursive" or data.assetType not in ("StaticMesh", "SkeletalMesh"):
+		return
+	budget = bfu_AssetBudget.GetAssetBudget(obj, data.assetType, data.childs)
+	for name, label, value, limit in budget.GetOverruns(bfu_AssetBudget.GetBudgetLimits(checker.settings)):
+		checker.AddError(1, 'The '+data.assetType+' "'+obj.name+'" is over the performance budget: '+label+' '+str(value)+' / '+str(limit)+'.',
+			obj, itemName=name)
+
+
+@PotentialErrorRule("scene")
+def CheckMarkerOverlay(checker, scene):
+	#Check that there is no overlap with the Marker
+	for marker in GetSortedTimelineMarkers(scene)[1]:
+		checker.AddError(2, 'In the scene timeline the frame "'+str(marker.frame)+'" contains overlaped Markers\n To avoid camera conflict in the generation of sequencer you must use max one marker per frame ')
+
+
+@PotentialErrorRule("skin")
+def CheckVertexGroupWeight(checker, data, child):
+	#Check that all vertex have a weight
+	VertexWithZeroWeight = GetVertexWithZeroWeight(data.obj, child)
+	if len(VertexWithZeroWeight) > 0:
+		text = 'Object named "'+child.name+'" contains '+str(len(VertexWithZeroWeight))+' vertex with zero cumulative valid weight.'
+		text += '\nNote: Vertex groups must have a bone with the same name to be valid.'
+		checker.AddError(1, text, child, vertexErrorType="VertexWithZeroWeight")
+
+
+@PotentialErrorRule("action")
+def CheckZeroScaleKeyframe(checker, action):
+	#Check that animations do not use a invalid value
+	for fcurve in action.fcurves:
+		dataPath = fcurve.data_path
+		if dataPath == "scale" or dataPath.endswith(".scale"):
+			co = GetCollectionFloatArray(fcurve.keyframe_points, "co", 2)
+			zeroKeys = numpy.flatnonzero(co[1::2] == 0)
+			if len(zeroKeys) > 0:
+				boneName = dataPath.split('"')[1]
+				for index in zeroKeys:
+					checker.AddError(2, 'In action "'+action.name+'" at frame '+str(float(co[index*2]))+', the bone named "'+boneName+'" has a zero value in scale transform. This is invalid in Unreal.')
+
+
+'''
+#########################################################################################
+			Check
+#########################################################################################
+'''
+
+
+def UpdateUnrealPotentialError(useCache = True, printTiming = False):
+	#Find and reset list of all potential error in scene
+	#With useCache only the objects and actions changed since the last check are checked again
+	#The time of each rule is kept in lastCheckTiming and printed with printTiming
+
+	scene = bpy.context.scene
+	PotentialErrors = scene.potentialErrorList
+	if useCache == False:
+		checkCache.clear()
+		checkedOwnersCache.clear()
+	else:
+		bpy.context.view_layer.update() #Flush the pending changes to PotentialErrorDepsgraphUpdate
+	checker = PotentialErrorChecker(scene, cache=checkCache, dirtyIds=dirtyIds)
+	checker.Run()
+	dirtyIds.clear()
+	checker.WriteErrors(PotentialErrors)
+	lastCheckTiming.clear()
+	lastCheckTiming.update(checker.timing)
+	if printTiming == True:
+		checker.PrintTiming()
+	return PotentialErrors
+
+
+def TryToCorrectAllPotentialErrors():
+	#Correct all the potential errors that have a correction with one save/restore of the context
+	#The errors are grouped by correction and the list is checked again one time at the end
+	#Return the number of errors corrected and the number of errors with a correction
+
+	scene = bpy.context.scene
+	groups = {} #correctRef: [(object, itemName)]
+	for error in scene.potentialErrorList:
+		if error.correctRef != "None":
+			groups.setdefault(error.correctRef, []).append((error.object, error.itemName))
+	toCorrect = sum(len(targets) for targets in groups.values())
+	if toCorrect == 0:
+		return (0, 0)
+
+	saved = SaveCorrectContext()
+	corrected = 0
+	for correctRef, targets in groups.items():
+		corrected += ApplyErrorCorrection(correctRef, targets)
+		print("Correct "+str(len(targets))+" "+correctRef)
+	RestoreCorrectContext(saved)
+
+	UpdateUnrealPotentialError()
+	return (corrected, toCorrect)
+
+
+def ClearPotentialErrorCache():
+	checkCache.clear()
+	checkedOwnersCache.clear()
+	dirtyIds.clear()
+	ClearBoneTopologyCache()
+	ClearActionGroupIndex()
+
+
+@persistent
+def PotentialErrorDepsgraphUpdate(scene, depsgraph = None):
+	#Mark the data-blocks changed since the last check and drop the
+	#bone topologies and the action group index of the changed data.
+	#Blender 2.80 does not give the depsgraph, in this case the whole cache is dropped
+
+	if len(checkCache) == 0 and len(checkedOwnersCache) == 0 and len(boneTopologyCache) == 0 and len(actionGroupIndexCache) == 0:
+		return
+	if depsgraph is None:
+		checkCache.clear()
+		checkedOwnersCache.clear()
+		ClearBoneTopologyCache()
+		ClearActionGroupIndex()
+		return
+	for update in depsgraph.updates:
+		id = update.id.original
+		if len(checkCache) > 0 or len(checkedOwnersCache) > 0:
+			dirtyIds.add(GetIdKey(id))
+		if isinstance(id, bpy.types.Armature):
+			ClearBoneTopologyCache(id.name)
+		elif isinstance(id, bpy.types.Action):
+			ClearActionGroupIndex()
+
+
+@persistent
+def PotentialErrorCacheReset(dummy):
+	#After loading a file or a undo the cached names no longer describe the same data
+	ClearPotentialErrorCache()
+
+
+def RegisterPotentialErrorHandlers():
+	if PotentialErrorDepsgraphUpdate not in bpy.app.handlers.depsgraph_update_post:
+		bpy.app.handlers.depsgraph_update_post.append(PotentialErrorDepsgraphUpdate)
+	for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+		if PotentialErrorCacheReset not in handlers:
+			handlers.append(PotentialErrorCacheReset)
+
+
+def UnregisterPotentialErrorHandlers():
+	if PotentialErrorDepsgraphUpdate in bpy.app.handlers.depsgraph_update_post:
+		bpy.app.handlers.depsgraph_update_post.remove(PotentialErrorDepsgraphUpdate)
+	for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+		if PotentialErrorCacheReset in handlers:
+			handlers.remove(PotentialErrorCacheReset)
+	ClearPotentialErrorCache()
@@ -0,0 +1,485 @@
+#====================== BEGIN GPL LICENSE BLOCK ============================
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.	 See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.	 If not, see <http://www.gnu.org/licenses/>.
+#  All rights reserved.
+#
+#======================= END GPL LICENSE BLOCK =============================
+
+
+import bpy
+import os
+import math
+import numpy
+import hashlib
+import bmesh
+import concurrent.futures
+from mathutils import Matrix
+
+import importlib
+from . import bfu_Basics
+importlib.reload(bfu_Basics)
+from .bfu_Basics import *
+
+from . import bfu_Utils
+importlib.reload(bfu_Utils)
+from .bfu_Utils import *
+
+
+'''
+#####################################################
+			Fitting
+#####################################################
+'''
+
+collisionPrefixes = {
+	"Box": "UBX_",
+	"Sphere": "USP_",
+	"Capsule": "UCP_",
+	"Convex": "UCX_",
+	}
+
+
+def GetMeshLocalVertices(obj, depsgraph):
+	#Return the vertices of the evaluated mesh (with modifiers) in object space as a (N,3) array
+
+	objEval = obj.evaluated_get(depsgraph)
+	mesh = objEval.to_mesh()
+	try:
+		return GetCollectionFloatArray(mesh.vertices, "co", 3).reshape(-1, 3).astype(numpy.float64)
+	finally:
+		objEval.to_mesh_clear()
+
+def GetPrincipalAxes(points):
+	#Return the centroid and the principal axes (columns, largest variance first) of the points
+
+	centroid = points.mean(axis=0)
+	if len(points) < 3:
+		return centroid, numpy.identity(3)
+	eigenValues, eigenVectors = numpy.linalg.eigh(numpy.cov((points - centroid).T))
+	axes = eigenVectors[:, ::-1]
+	if numpy.linalg.det(axes) < 0: #Keep a right-handed rotation
+		axes[:, 2] *= -1
+	return centroid, axes
+
+def FitBox(points):
+	#Return (matrix, size) of a oriented box around the points.
+	#The PCA box is compared with the axis aligned box and the smaller is kept.
+
+	candidates = []
+	centroid, axes = GetPrincipalAxes(points)
+	for rotation in (axes, numpy.identity(3)):
+		projected = points @ rotation
+		low = projected.min(axis=0)
+		high = projected.max(axis=0)
+		size = high - low
+		center = rotation @ ((low + high) * 0.5)
+		candidates.append((numpy.prod(numpy.maximum(size, 1e-6)), rotation, center, size))
+	rotation, center, size = min(candidates, key=lambda candidate: candidate[0])[1:]
+	return GetFitMatrix(rotation, center), size
+
+def FitSphere(points):
+	#Return (center, radius) of a bounding sphere.
+	#Both the centroid and the box center are tested and the smaller sphere is kept.
+
+	best = None
+	for center in (points.mean(axis=0), (points.min(axis=0) + points.max(axis=0)) * 0.5):
+		radius = numpy.sqrt(((points - center)**2).sum(axis=1).max())
+		if best is None or radius < best[1]:
+			best = (center, radius)
+	return best
+
+def FitCapsule(points):
+	#Return (matrix, radius, halfLength) of a capsule along the principal axis (local Z).
+	#halfLength is the half length of the cylinder part, without the caps.
+
+	centroid, axes = GetPrincipalAxes(points)
+	rotation = numpy.column_stack((axes[:, 1], axes[:, 2], axes[:, 0])) #Principal axis on Z
+	projected = (points - centroid) @ rotation
+	axial = projected[:, 2]
+
+	#The axis pass by the center of the radial bounds
+	offset = (projected[:, :2].min(axis=0) + projected[:, :2].max(axis=0)) * 0.5
+	radial = numpy.sqrt((projected[:, 0]-offset[0])**2 + (projected[:, 1]-offset[1])**2)
+	radius = max(radial.max(), 1e-6)
+	middle = (axial.min() + axial.max()) * 0.5
+
+	#Smallest cylinder length that keep all the points in the caps
+	capHeight = numpy.sqrt(numpy.maximum(radius**2 - radial**2, 0.0))
+	halfLength = max(float((numpy.abs(axial - middle) - capHeight).max()), 0.0)
+
+	center = centroid + rotation @ numpy.array((offset[0], offset[1], middle))
+	return GetFitMatrix(rotation, center), radius, halfLength
+
+def GetFitMatrix(rotation, center):
+	#Return a 4x4 matrix (as nested lists for mathutils) from a 3x3 rotation and a center
+
+	matrix = numpy.identity(4)
+	matrix[:3, :3] = rotation
+	matrix[:3, 3] = center
+	return matrix.tolist()
+
+
+'''
+#####################################################
+			Shapes
+#####################################################
+'''
+
+def GetBoxShape(size):
+	#Return (vertices, faces) of a box centered on the origin
+
+	x, y, z = numpy.asarray(size) * 0.5
+	vertices = numpy.array([
+		(-x, -y, -z), (x, -y, -z), (x, y, -z), (-x, y, -z),
+		(-x, -y, z), (x, -y, z), (x, y, z), (-x, y, z),
+		])
+	faces = numpy.array([
+		(0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4),
+		(1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7),
+		])
+	return vertices, faces
+
+def GetCapsuleShape(radius, halfLength, segments = 16, rings = 4):
+	#Return (vertices, faces) of a capsule on the Z axis centered on the origin.
+	#With halfLength = 0 it is a sphere. The faces are triangles.
+
+	angles = numpy.linspace(0.0, 2.0*math.pi, segments, endpoint=False)
+	circle = numpy.column_stack((numpy.cos(angles), numpy.sin(angles)))
+
+	#Latitudes of the rings from the bottom pole to the top pole (poles excluded)
+	step = math.pi * 0.5 / rings
+	latitudes = [(-math.pi*0.5 + step*x, -halfLength) for x in range(1, rings+1)]
+	latitudes += [(step*x, halfLength) for x in range(0 if halfLength > 0 else 1, rings)]
+	ringVertices = []
+	for latitude, shift in latitudes:
+		height = shift + math.sin(latitude) * radius
+		ringVertices.append(numpy.column_stack((circle * math.cos(latitude) * radius, numpy.full(segments, height))))
+	bottom = numpy.array([(0.0, 0.0, -halfLength-radius)])
+	top = numpy.array([(0.0, 0.0, halfLength+radius)])
+	vertices = numpy.vstack([bottom] + ringVertices + [top])
+
+	ringCount = len(ringVertices)
+	faces = []
+	nextSegment = (numpy.arange(segments) + 1) % segments
+	firstRing = 1 + numpy.arange(segments)
+	faces.append(numpy.column_stack((numpy.zeros(segments, dtype=int), 1 + nextSegment, firstRing)))
+	for ring in range(ringCount-1):
+		a = 1 + ring*segments + numpy.arange(segments)
+		b = 1 + ring*segments + nextSegment
+		c = b + segments
+		d = a + segments
+		faces.append(numpy.column_stack((a, b, c)))
+		faces.append(numpy.column_stack((a, c, d)))
+	lastRing = 1 + (ringCount-1)*segments
+	topIndex = len(vertices)-1
+	faces.append(numpy.column_stack((lastRing + numpy.arange(segments), lastRing + nextSegment, numpy.full(segments, topIndex))))
+	return vertices, numpy.vstack(faces)
+
+def NewMeshFromArrays(name, vertices, faces):
+	#Create a mesh from a (N,3) vertex array and a (F,K) face array with foreach_set
+
+	mesh = bpy.data.meshes.new(name)
+	faceSize = faces.shape[1]
+	mesh.vertices.add(len(vertices))
+	mesh.vertices.foreach_set("co", numpy.asarray(vertices, dtype=numpy.float32).ravel())
+	mesh.loops.add(faces.size)
+	mesh.loops.foreach_set("vertex_index", numpy.asarray(faces, dtype=numpy.int32).ravel())
+	mesh.polygons.add(len(faces))
+	mesh.polygons.foreach_set("loop_start", numpy.arange(0, faces.size, faceSize, dtype=numpy.int32))
+	mesh.polygons.foreach_set("loop_total", numpy.full(len(faces), faceSize, dtype=numpy.int32))
+	mesh.update(calc_edges=True)
+	mesh.validate()
+	return mesh
+
+
+'''
+#####################################################
+			Collisions creation
+#####################################################
+'''
+
+def GetCollisionOwners(objList):
+	#Return the meshes of the list that can have generated collisions
+
+	collisionsAndSockets = set(GetAllCollisionAndSocketsObj(objList))
+	return [obj for obj in objList if obj.type == "MESH" and obj not in collisionsAndSockets]
+
+def CreateCollisionObject(ownerObj, SubType, mesh, matrix, material):
+	#Create a collision object child of ownerObj with the Unreal name of the SubType
+
+	obj = bpy.data.objects.new(GenerateUe4Name(collisionPrefixes[SubType]+ownerObj.name), mesh)
+	mesh.name = obj.name
+	mesh.materials.append(material)
+	for collection in ownerObj.users_collection:
+		collection.objects.link(obj)
+	obj.parent = ownerObj
+	obj.matrix_parent_inverse.identity()
+	obj.matrix_basis = Matrix(matrix)
+	obj.show_wire = True
+	obj.show_transparent = True
+	obj.ExportEnum = "auto"
+	return obj
+
+def FitCollisionShapes(SubType, objList = None):
+	#Fit a simple collision (Box, Sphere or Capsule) on each mesh of the list
+	#and create the UBX_, USP_ or UCP_ children. Return the created objects.
+
+	if objList is None:
+		objList = bpy.context.selected_objects
+	depsgraph = bpy.context.evaluated_depsgraph_get()
+	material = CreateCollisionMaterial()
+
+	createdObjs = []
+	for ownerObj in GetCollisionOwners(objList):
+		points = GetMeshLocalVertices(ownerObj, depsgraph)
+		if len(points) == 0:
+			continue
+
+		if SubType == "Box":
+			matrix, size = FitBox(points)
+			vertices, faces = GetBoxShape(size)
+		elif SubType == "Sphere":
+			center, radius = FitSphere(points)
+			matrix = GetFitMatrix(numpy.identity(3), center)
+			vertices, faces = GetCapsuleShape(radius, 0.0)
+		elif SubType == "Capsule":
+			matrix, radius, halfLength = FitCapsule(points)
+			vertices, faces = GetCapsuleShape(radius, halfLength)
+		else:
+			continue
+
+		mesh = NewMeshFromArrays(collisionPrefixes[SubType]+ownerObj.name, vertices, faces)
+		createdObjs.append(CreateCollisionObject(ownerObj, SubType, mesh, matrix, material))
+	return createdObjs
+
+
+'''
+#####################################################
+			Convex decomposition
+#####################################################
+'''
+
+#Decomposed parts by mesh content hash, the content is in the key so it never need to be invalidated
+convexDecompositionCache = {}
+convexDecompositionCacheSize = 256
+
+
+def GetMeshLocalTriangles(obj, depsgraph):
+	#Return the vertices (N,3) and the triangles (T,3) of the evaluated mesh in object space
+
+	objEval = obj.evaluated_get(depsgraph)
+	mesh = objEval.to_mesh()
+	try:
+		mesh.calc_loop_triangles()
+		vertices = GetCollectionFloatArray(mesh.vertices, "co", 3).reshape(-1, 3).astype(numpy.float64)
+		triangles = numpy.empty(len(mesh.loop_triangles)*3, dtype=numpy.int32)
+		mesh.loop_triangles.foreach_get("vertices", triangles)
+		return vertices, triangles.reshape(-1, 3)
+	finally:
+		objEval.to_mesh_clear()
+
+def SampleTriangles(vertices, triangles, spacing):
+	#Return the vertices and points sampled on the triangles with about one point each spacing
+
+	a = vertices[triangles[:, 0]]
+	b = vertices[triangles[:, 1]]
+	c = vertices[triangles[:, 2]]
+	maxEdge = numpy.maximum(numpy.maximum(numpy.linalg.norm(b-a, axis=1), numpy.linalg.norm(c-b, axis=1)), numpy.linalg.norm(a-c, axis=1))
+	divisions = numpy.maximum(numpy.ceil(maxEdge / spacing), 1).astype(int)
+
+	samples = [vertices]
+	for count in numpy.unique(divisions):
+		selected = divisions == count
+		i, j = numpy.meshgrid(numpy.arange(count+1), numpy.arange(count+1))
+		inside = (i + j) <= count
+		u = (i[inside] / count)[None, :, None]
+		v = (j[inside] / count)[None, :, None]
+		points = a[selected, None, :] + u*(b-a)[selected, None, :] + v*(c-a)[selected, None, :]
+		samples.append(points.reshape(-1, 3))
+	return numpy.vstack(samples)
+
+def VoxelizeSamples(samples, resolution):
+	#Return (solid grid, cell of each sample). The voxels touched by the samples are the surface
+	#and the empty voxels that can not be reached from the grid border are the interior.
+
+	low = samples.min(axis=0)
+	voxelSize = max(float((samples.max(axis=0) - low).max()) / resolution, 1e-6)
+	cells = numpy.minimum(numpy.floor((samples - low) / voxelSize).astype(int), resolution-1)
+	dims = cells.max(axis=0) + 1
+
+	surface = numpy.zeros(dims + 2, dtype=bool) #One empty voxel of padding around
+	surface[cells[:, 0]+1, cells[:, 1]+1, cells[:, 2]+1] = True
+
+	outside = numpy.zeros_like(surface)
+	outside[0, :, :] = outside[-1, :, :] = True
+	outside[:, 0, :] = outside[:, -1, :] = True
+	outside[:, :, 0] = outside[:, :, -1] = True
+	outside &= ~surface
+	while True:
+		grown = outside.copy()
+		grown[1:, :, :] |= outside[:-1, :, :]
+		grown[:-1, :, :] |= outside[1:, :, :]
+		grown[:, 1:, :] |= outside[:, :-1, :]
+		grown[:, :-1, :] |= outside[:, 1:, :]
+		grown[:, :, 1:] |= outside[:, :, :-1]
+		grown[:, :, :-1] |= outside[:, :, 1:]
+		grown &= ~surface
+		if numpy.array_equal(grown, outside):
+			break
+		outside = grown
+	return ~outside[1:-1, 1:-1, 1:-1], cells
+
+def GetVoxelsFill(voxels):
+	#Ratio of the bounding box filled by the voxels, 1 for a box
+	return len(voxels) / numpy.prod(voxels.max(axis=0) - voxels.min(axis=0) + 1)
+
+def SplitVoxels(voxels):
+	#Split the voxels with the axis aligned plane that leave the less empty space in the halves bounding boxes,
+	#the most balanced cut wins between equal ones. Return (left, right) or None if the voxels can not be split
+
+	best = None
+	for axis in range(3):
+		others = [x for x in range(3) if x != axis]
+		slices = voxels[:, axis] - voxels[:, axis].min()
+		sliceCount = slices.max() + 1
+		if sliceCount < 2:
+			continue
+
+		#Bounds of the other axes for each slice, then for each side of each cut
+		counts = numpy.bincount(slices, minlength=sliceCount)
+		low = numpy.full((sliceCount, 2), numpy.iinfo(int).max)
+		high = numpy.full((sliceCount, 2), numpy.iinfo(int).min)
+		for x, other in enumerate(others):
+			numpy.minimum.at(low[:, x], slices, voxels[:, other])
+			numpy.maximum.at(high[:, x], slices, voxels[:, other])
+		leftArea = numpy.prod(numpy.maximum.accumulate(high)[:-1] - numpy.minimum.accumulate(low)[:-1] + 1, axis=1)
+		rightArea = numpy.prod(numpy.maximum.accumulate(high[::-1])[::-1][1:] - numpy.minimum.accumulate(low[::-1])[::-1][1:] + 1, axis=1)
+		#Length of each side from its nonempty slices so a cut in a gap cost nothing
+		filled = numpy.arange(sliceCount)
+		leftLength = numpy.maximum.accumulate(numpy.where(counts > 0, filled, -1))[:-1] + 1
+		rightLength = sliceCount - numpy.minimum.accumulate(numpy.where(counts > 0, filled, sliceCount)[::-1])[::-1][1:]
+		waste = leftLength*leftArea + rightLength*rightArea - len(voxels)
+		imbalance = numpy.abs(2*numpy.cumsum(counts)[:-1] - len(voxels))
+		scores = waste*(2*len(voxels)+1) + imbalance
+		cut = int(numpy.argmin(scores))
+		if best is None or scores[cut] < best[0]:
+			best = (scores[cut], axis, cut+1, slices)
+
+	if best is None:
+		return None
+	score, axis, cut, slices = best
+	return voxels[slices < cut], voxels[slices >= cut]
+
+def DecomposeVoxels(solid, maxParts, fillTarget = 0.85, minVoxels = 8):
+	#Split the solid voxels until maxParts parts or until all the parts are filled enough
+
+	parts = [numpy.argwhere(solid)]
+	finalParts = []
+	while len(parts) > 0 and len(parts) + len(finalParts) < maxParts:
+		fills = [GetVoxelsFill(part) for part in parts]
+		worst = int(numpy.argmin(fills))
+		part = parts.pop(worst)
+		split = SplitVoxels(part) if fills[worst] < fillTarget and len(part) >= minVoxels else None
+		if split is None:
+			finalParts.append(part)
+		else:
+			parts.extend(split)
+	return finalParts + parts
+
+def GetSupportPoints(points, budget):
+	#Return at most budget points of the convex hull, the farthest point in budget directions
+
+	if len(points) <= budget:
+		return points
+	index = numpy.arange(budget) + 0.5
+	polar = numpy.arccos(1.0 - 2.0*index/budget)
+	azimuth = math.pi * (1.0 + 5.0**0.5) * index
+	directions = numpy.column_stack((numpy.cos(azimuth)*numpy.sin(polar), numpy.sin(azimuth)*numpy.sin(polar), numpy.cos(polar)))
+	centered = points - points.mean(axis=0)
+	return points[numpy.unique(numpy.argmax(centered @ directions.T, axis=0))]
+
+def DecomposeMesh(vertices, triangles, maxParts, vertexBudget, resolution):
+	#Approximate convex decomposition of a mesh, numpy only so it can run in a worker thread.
+	#Return a list of point arrays, each one is the vertices of a convex part.
+
+	if len(triangles) == 0:
+		return []
+	extent = float((vertices.max(axis=0) - vertices.min(axis=0)).max())
+	samples = SampleTriangles(vertices, triangles, max(extent / resolution * 0.5, 1e-6))
+	solid, cells = VoxelizeSamples(samples, resolution)
+
+	labels = numpy.full(solid.shape, -1, dtype=int)
+	for x, part in enumerate(DecomposeVoxels(solid, maxParts)):
+		labels[part[:, 0], part[:, 1], part[:, 2]] = x
+	sampleLabels = labels[cells[:, 0], cells[:, 1], cells[:, 2]]
+
+	partsPoints = []
+	for x in range(sampleLabels.max()+1):
+		points = GetSupportPoints(samples[sampleLabels == x], vertexBudget)
+		if len(points) >= 4 and numpy.linalg.matrix_rank(points - points.mean(axis=0), tol=extent*1e-4) == 3:
+			partsPoints.append(points)
+	return partsPoints
+
+def GetConvexDecompositionKey(vertices, triangles, maxParts, vertexBudget, resolution):
+	hasher = hashlib.sha1(vertices.tobytes())
+	hasher.update(triangles.tobytes())
+	hasher.update(str((maxParts, vertexBudget, resolution)).encode())
+	return hasher.hexdigest()
+
+def NewConvexHullMesh(name, points):
+	#Create the convex hull mesh of the points
+
+	bm = bmesh.new()
+	for point in points:
+		bm.verts.new(point)
+	hull = bmesh.ops.convex_hull(bm, input=bm.verts)
+	unused = [v for v in hull["geom_interior"] + hull["geom_unused"] if isinstance(v, bmesh.types.BMVert)]
+	bmesh.ops.delete(bm, geom=unused, context='VERTS')
+	mesh = bpy.data.meshes.new(name)
+	bm.to_mesh(mesh)
+	bm.free()
+	return mesh
+
+def CreateConvexDecomposition(maxParts = 8, vertexBudget = 32, resolution = 32, objList = None):
+	#Decompose each mesh of the list in up to maxParts convex parts of at most vertexBudget vertices
+	#and create the UCX_ children. The meshes are decomposed in parallel, the results are cached.
+	#Return the created objects.
+
+	if objList is None:
+		objList = bpy.context.selected_objects
+	depsgraph = bpy.context.evaluated_depsgraph_get()
+	material = CreateCollisionMaterial()
+
+	#Read the meshes in the main thread, bpy is not thread safe
+	jobs = []
+	for ownerObj in GetCollisionOwners(objList):
+		vertices, triangles = GetMeshLocalTriangles(ownerObj, depsgraph)
+		key = GetConvexDecompositionKey(vertices, triangles, maxParts, vertexBudget, resolution)
+		jobs.append((ownerObj, key, vertices, triangles))
+
+	missing = {key: (vertices, triangles) for ownerObj, key, vertices, triangles in jobs if key not in convexDecompositionCache}
+	if len(missing) > 0:
+		with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(missing), os.cpu_count() or 1)) as executor:
+			futures = {key: executor.submit(DecomposeMesh, vertices, triangles, maxParts, vertexBudget, resolution) for key, (vertices, triangles) in missing.items()}
+			for key, future in futures.items():
+				convexDecompositionCache[key] = future.result()
+		while len(convexDecompositionCache) > convexDecompositionCacheSize:
+			del convexDecompositionCache[next(iter(convexDecompositionCache))]
+
+	createdObjs = []
+	for ownerObj, key, vertices, triangles in jobs:
+		for points in convexDecompositionCache.get(key, []):
+			mesh = NewConvexHullMesh(collisionPrefixes["Convex"]+ownerObj.name, points)
+			createdObjs.append(CreateCollisionObject(ownerObj, "Convex", mesh, numpy.identity(4).tolist(), material))
+	return createdObjs
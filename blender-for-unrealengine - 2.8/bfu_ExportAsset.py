@@ -25,6 +25,15 @@ import importlib
 from . import bfu_WriteText
 importlib.reload(bfu_WriteText)
 
+from . import bfu_ExportJournal
+importlib.reload(bfu_ExportJournal)
+
+from . import bfu_ExportSettings
+importlib.reload(bfu_ExportSettings)
+
+from . import bfu_Animation
+importlib.reload(bfu_Animation)
+
 from . import bfu_Basics
 importlib.reload(bfu_Basics)
 from .bfu_Basics import *
@@ -38,125 +47,198 @@ importlib.reload(bfu_ExportAssetsByType)
 from .bfu_ExportAssetsByType import *
 
 
-def ExportAllAssetByList(originalScene, targetobjects, targetActionName, targetcollection):
+def ExportAllAssetByList(originalScene, targetobjects, targetActionName, targetcollection, journal = None, settings = None, plan = None):
 	#Export all objects that need to be exported from a list
+	#If a journal is given each finished asset is recorded and the assets already done are skipped
+	#settings is the ExportSettings snapshot of the export, a new one is made if None
+	#plan is the list of AssetToExport from GetFinalAssetToExport(), a new one is made if None
 	
 	
 	if len(targetobjects) < 1 and len(targetcollection) < 1 :
 		return
 
 	scene = bpy.context.scene
-	addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
+	settings = bfu_ExportSettings.GetExportSettings(settings)
+	if plan is None:
+		plan = GetFinalAssetToExport()
+	targetobjects = set(targetobjects)
+	targetActionName = set(targetActionName)
+	targetcollection = set(targetcollection)
+
 	wm = bpy.context.window_manager
-	wm.progress_begin(0, len(GetFinalAssetToExport()))
+	wm.progress_begin(0, len(plan))
 	
 
 	def UpdateProgress():
 		wm.progress_update(len(scene.UnrealExportedAssetsList))
 	UpdateProgress()
+
+	if journal is None:
+		journal = bfu_ExportJournal.ExportJournal(None, originalScene) #Not recorded on disk
+
+	#The actions of a rig are baked together the first time one of them is exported
+	rigBaker = None
+	if settings.bakeArmatureAction == True and settings.useFastArmatureBake == True and settings.anin_export == True:
+		rigBaker = bfu_Animation.SharedRigBaker(settings.ignoreNLAForAction)
+		for asset in plan:
+			if asset.type in (AssetType.ACTION, AssetType.POSE) and asset.obj in targetobjects:
+				if asset.actionName in targetActionName and asset.id not in journal.doneAssets:
+					rigBaker.AddAction(asset.obj, asset.action)
 	
-	if scene.static_collection_export:
-		for col in GetCollectionToExport(originalScene):
-			if col in targetcollection:
+	for asset in plan:
+
+		if asset.type == AssetType.COLLECTION_STATICMESH:
+			if asset.collectionName in targetcollection:
 				#StaticMesh collection
-				ExportSingleStaticMeshCollection(originalScene, GetCollectionExportDir(), GetCollectionExportFileName(col), col)
-					#if scene.text_AdditionalData == True and addon_prefs.useGeneratedScripts == True:
-						#ExportSingleAdditionalParameterMesh(GetCollectionExportDir(), GetCollectionExportFileName(col,"_AdditionalParameter.ini"), col)
+				if journal.StartAsset(asset.id):
+					if settings.static_collection_export_mode == "layout":
+						ExportSingleCollectionLayout(originalScene, asset.exportDir, asset.fileName, asset.collectionName, settings)
+					else:
+						ExportSingleStaticMeshCollection(originalScene, asset.exportDir, asset.fileName, asset.collectionName, settings)
+						#if settings.text_AdditionalData == True and settings.useGeneratedScripts == True:
+							#ExportSingleAdditionalParameterMesh(GetCollectionExportDir(), GetCollectionExportFileName(col,"_AdditionalParameter.ini"), col)
+					journal.EndAsset()
 				UpdateProgress()
-	
-	for obj in targetobjects:
+			continue
 
-		if obj.ExportEnum == "export_recursive":
+		obj = asset.obj
+		if obj is None or obj not in targetobjects:
+			continue
+		objSettings = settings.GetObject(obj)
+		if objSettings.ExportEnum != "export_recursive":
+			continue
 
-			#Camera
-			if GetAssetType(obj) == "Camera" and scene.camera_export:
+		#Camera
+		if asset.type == AssetType.CAMERA and settings.camera_export:
+			if journal.StartAsset(asset.id):
 				UserStartFrame = scene.frame_start #Save current start frame
 				UserEndFrame = scene.frame_end #Save current end frame
-				ExportSingleFbxCamera(originalScene, GetObjExportDir(obj), GetObjExportFileName(obj), obj)
-				if obj.ExportAsLod == False:
-					if scene.text_AdditionalData == True and addon_prefs.useGeneratedScripts == True:
-						ExportSingleAdditionalTrackCamera(GetObjExportDir(obj), GetObjExportFileName(obj,"_AdditionalTrack.ini"), obj)
+				ExportSingleFbxCamera(originalScene, asset.exportDir, asset.fileName, obj, settings)
+				if objSettings.ExportAsLod == False:
+					if settings.text_AdditionalData == True and settings.useGeneratedScripts == True:
+						ExportSingleAdditionalTrackCamera(asset.exportDir, GetObjExportFileName(obj,"_AdditionalTrack.ini"), obj)
 				scene.frame_start = UserStartFrame #Resets previous start frame
 				scene.frame_end = UserEndFrame #Resets previous end frame
-				UpdateProgress()
+				journal.EndAsset()
+			UpdateProgress()
 
-			#StaticMesh
-			if GetAssetType(obj) == "StaticMesh" and scene.static_export:
-				ExportSingleStaticMesh(originalScene, GetObjExportDir(obj), GetObjExportFileName(obj), obj)
-				if obj.ExportAsLod == False:
-					if scene.text_AdditionalData == True and addon_prefs.useGeneratedScripts == True:
-						ExportSingleAdditionalParameterMesh(GetObjExportDir(obj), GetObjExportFileName(obj,"_AdditionalParameter.ini"), obj)
-				UpdateProgress()
+		#StaticMesh
+		if asset.type == AssetType.STATICMESH and settings.static_export:
+			if asset.aliasOf is not None:
+				ExportSingleStaticMeshAlias(originalScene, asset.exportDir, asset.fileName, obj, asset.aliasOf)
+			elif journal.StartAsset(asset.id):
+				ExportSingleStaticMesh(originalScene, asset.exportDir, asset.fileName, obj, settings)
+				if objSettings.ExportAsLod == False:
+					ExportAutoLods(originalScene, asset.exportDir, obj, settings)
+					if settings.text_AdditionalData == True and settings.useGeneratedScripts == True and settings.useAdditionalDataManifest == False:
+						ExportSingleAdditionalParameterMesh(asset.exportDir, GetObjExportFileName(obj,"_AdditionalParameter.ini"), obj, settings)
+				journal.EndAsset()
+			UpdateProgress()
+		
+		#SkeletalMesh
+		if asset.type == AssetType.SKELETALMESH and settings.skeletal_export:
+			if journal.StartAsset(asset.id):
+				ExportSingleSkeletalMesh(originalScene, asset.exportDir, asset.fileName, obj, settings)
+				ExportAutoLods(originalScene, asset.exportDir, obj, settings)
+				if settings.text_AdditionalData == True and settings.useGeneratedScripts == True and settings.useAdditionalDataManifest == False:
+					ExportSingleAdditionalParameterMesh(asset.exportDir, GetObjExportFileName(obj,"_AdditionalParameter.ini"), obj, settings)
+				journal.EndAsset()
+			UpdateProgress()
 			
-			#SkeletalMesh
-			if GetAssetType(obj) == "SkeletalMesh" and scene.skeletal_export:
-				ExportSingleSkeletalMesh(originalScene, GetObjExportDir(obj), GetObjExportFileName(obj), obj)
-				if scene.text_AdditionalData == True and addon_prefs.useGeneratedScripts == True:
-					ExportSingleAdditionalParameterMesh(GetObjExportDir(obj), GetObjExportFileName(obj,"_AdditionalParameter.ini"), obj)
+
+		#Alembic
+		if asset.type == AssetType.ALEMBIC and settings.alembic_export:
+			if journal.StartAsset(asset.id):
+				ExportSingleAlembicAnimation(originalScene, asset.exportDir, asset.fileName, obj, settings)
+				journal.EndAsset()
+			UpdateProgress()
+		
+		#Action animation and pose
+		if asset.type in (AssetType.ACTION, AssetType.POSE) and settings.anin_export == True:
+			if obj.visible_get() == True and asset.actionName in targetActionName:
+				if journal.StartAsset(asset.id):
+					UserStartFrame = scene.frame_start #Save current start frame
+					UserEndFrame = scene.frame_end #Save current end frame
+					ExportSingleFbxAction(originalScene, asset.exportDir, asset.fileName, obj, asset.action, asset.type.value, settings, rigBaker)
+					scene.frame_start = UserStartFrame #Resets previous start frame
+					scene.frame_end = UserEndFrame #Resets previous end frame
+					journal.EndAsset()
 				UpdateProgress()
-				
 
-			#Alembic
-			if GetAssetType(obj) == "Alembic" and scene.alembic_export:
-				ExportSingleAlembicAnimation(originalScene, GetObjExportDir(obj), GetObjExportFileName(obj, ".abc"), obj)
+		#Actions exported as takes of one FBX
+		if asset.type == AssetType.MULTITAKE and settings.anin_export == True:
+			actions = [bpy.data.actions[name] for name in asset.animTakes if name in targetActionName and name in bpy.data.actions]
+			if obj.visible_get() == True and len(actions) > 0:
+				if journal.StartAsset(asset.id):
+					UserStartFrame = scene.frame_start #Save current start frame
+					UserEndFrame = scene.frame_end #Save current end frame
+					ExportSingleFbxMultiTakeAnim(originalScene, asset.exportDir, asset.fileName, obj, actions, settings)
+					scene.frame_start = UserStartFrame #Resets previous start frame
+					scene.frame_end = UserEndFrame #Resets previous end frame
+					journal.EndAsset()
 				UpdateProgress()
-			
-			#Action animation
-			if GetAssetType(obj) == "SkeletalMesh" and obj.visible_get() == True:
-				animExportDir = os.path.join( GetObjExportDir(obj), scene.anim_subfolder_name )
-				for action in GetActionToExport(obj):
-					if action.name in targetActionName:
-						animType = GetActionType(action)
-						
-						#Action
-						if animType == "Action" and bpy.context.scene.anin_export == True:
-							UserStartFrame = scene.frame_start #Save current start frame
-							UserEndFrame = scene.frame_end #Save current end frame
-							ExportSingleFbxAction(originalScene, animExportDir, GetActionExportFileName(obj, action), obj, action, "Action")
-							scene.frame_start = UserStartFrame #Resets previous start frame
-							scene.frame_end = UserEndFrame #Resets previous end frame
-							UpdateProgress()
-
-						#pose
-						if animType == "Pose" and bpy.context.scene.anin_export == True:
-							UserStartFrame = scene.frame_start #Save current start frame
-							UserEndFrame = scene.frame_end #Save current end frame
-							ExportSingleFbxAction(originalScene, animExportDir, GetActionExportFileName(obj, action), obj, action, "Pose")
-							scene.frame_start = UserStartFrame #Resets previous start frame
-							scene.frame_end = UserEndFrame #Resets previous end frame
-							UpdateProgress()
-
-				#NLA animation
-				if bpy.context.scene.anin_export == True:
-					if obj.ExportNLA == True:
-						scene.frame_end +=1
-						ExportSingleFbxNLAAnim(originalScene, animExportDir, GetNLAExportFileName(obj), obj)
-						scene.frame_end -=1
 
+		#NLA animation
+		if asset.type == AssetType.NLANIM and settings.anin_export == True:
+			if obj.visible_get() == True and objSettings.ExportNLA == True:
+				if journal.StartAsset(asset.id):
+					scene.frame_end +=1
+					ExportSingleFbxNLAAnim(originalScene, asset.exportDir, asset.fileName, obj, settings)
+					scene.frame_end -=1
+					journal.EndAsset()
 
+	if rigBaker is not None:
+		rigBaker.PrintCosts()
 	wm.progress_end()
 
 
-def PrepareAndSaveDataForExport():
+def PrepareAndSaveDataForExport(resume = False):
+	#If resume is True the leftovers of the interrupted export are cleaned
+	#and the assets already exported are skipped
+	#Return the ExportSettings used for the export
 
 	scene = bpy.context.scene
-	addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
+
+	journal = bfu_ExportJournal.ExportJournal(bfu_ExportJournal.GetJournalPath(scene), scene)
+	if resume == True:
+		journal.Load()
+		bfu_ExportJournal.CleanExportLeftovers(journal)
+		scene = bpy.context.scene
+		journal.originalScene = scene
+		scene.UnrealExportedAssetsList.clear()
+
+	#The actions not used by a object do not send depsgraph updates, the index of export_auto
+	#is built again for each export and only reused by the UI and the potential error check
+	ClearActionGroupIndex()
+	settings = bfu_ExportSettings.ExportSettings.FromScene(scene)
 
 	#Move to global view
-	for area in bpy.context.screen.areas:
-		if area.type == 'VIEW_3D':
-			space = area.spaces[0]
-			if space.local_view: #check if using local view
-				for region in area.regions:
-					if region.type == 'WINDOW':
-						override = {'area': area, 'region': region} #override context
-						bpy.ops.view3d.localview(override) #switch to global view
+	if bpy.context.screen is not None: #None in background mode
+		for area in bpy.context.screen.areas:
+			if area.type == 'VIEW_3D':
+				space = area.spaces[0]
+				if space.local_view: #check if using local view
+					for region in area.regions:
+						if region.type == 'WINDOW':
+							override = {'area': area, 'region': region} #override context
+							bpy.ops.view3d.localview(override) #switch to global view
+
+	if settings.revertExportPath == True and resume == False:
+		RemoveFolderTree(bpy.path.abspath(scene.export_static_file_path))
+		RemoveFolderTree(bpy.path.abspath(scene.export_skeletal_file_path))
+		RemoveFolderTree(bpy.path.abspath(scene.export_alembic_file_path))
+		RemoveFolderTree(bpy.path.abspath(scene.export_camera_file_path))
+		RemoveFolderTree(bpy.path.abspath(scene.export_other_file_path))
+
+	journal.Begin(resume)
+	bfu_ExportJournal.SetCurrentJournal(journal)
 
 	#----------------------------------------Save data
 	
 	baseActionName = []
 	for action in bpy.data.actions:
 		baseActionName.append(action.name)
+	actionsMutation = journal.MutationBegin("actions", {"base": baseActionName})
 		
 	baseCollectionName = []
 	for collection in bpy.data.collections:
@@ -165,47 +247,56 @@ def PrepareAndSaveDataForExport():
 	UserObjHideSelect = []
 	for object in bpy.data.objects:
 		UserObjHideSelect.append((object.name, object.hide_select))
-		object.hide_select = False
 		
 	UserObjHideViewport = []
 	for object in bpy.data.objects:
 		UserObjHideViewport.append((object.name, object.hide_viewport))
+
+	hideMutation = journal.MutationBegin("hide_state", {"objects": [(object.name, object.hide_select, object.hide_viewport) for object in bpy.data.objects]})
+	for object in bpy.data.objects:
+		object.hide_select = False
 		object.hide_viewport = False
 	
 	copyScene = bpy.context.scene.copy()
 	copyScene.name = "ue4-export_Temp"
-	bpy.context.window.scene = copyScene
-	UserActive = bpy.context.active_object #Save current active object
-	if UserActive and UserActive.mode != 'OBJECT' and bpy.ops.object.mode_set.poll():
-		UserMode = UserActive.mode #Save current mode
-		bpy.ops.object.mode_set(mode='OBJECT')
-	
-	if addon_prefs.revertExportPath == True:
-		RemoveFolderTree(bpy.path.abspath(scene.export_static_file_path))
-		RemoveFolderTree(bpy.path.abspath(scene.export_skeletal_file_path))
-		RemoveFolderTree(bpy.path.abspath(scene.export_alembic_file_path))
-		RemoveFolderTree(bpy.path.abspath(scene.export_camera_file_path))
-		RemoveFolderTree(bpy.path.abspath(scene.export_other_file_path))
+	sceneMutation = journal.MutationBegin("temp_scene", {"name": copyScene.name, "scene": scene.name})
+	#The temp scene is active in the with block, in background mode with a context override
+	with UseActiveScene(copyScene):
+		UserActive = bpy.context.active_object #Save current active object
+		if UserActive and UserActive.mode != 'OBJECT' and bpy.ops.object.mode_set.poll():
+			UserMode = UserActive.mode #Save current mode
+			bpy.ops.object.mode_set(mode='OBJECT')
 
-	list = []
-	for Asset in GetFinalAssetToExport():
-		if Asset.obj in GetAllobjectsByExportType("export_recursive"):
-			if Asset.obj not in list:
-				list.append(Asset.obj)
-	ExportAllAssetByList(
-	originalScene = scene,
-	targetobjects = list,
-	targetActionName = baseActionName,
-	targetcollection = baseCollectionName,
-	)
+		plan = GetFinalAssetToExport()
+		if settings.static_export:
+			DeduplicateStaticMeshes(plan, settings.static_mesh_deduplication, settings)
+		journal.WritePlan(plan)
+		recursiveObjects = set(GetAllobjectsByExportType("export_recursive"))
+		exportObjects = []
+		for Asset in plan:
+			obj = Asset.obj
+			if obj in recursiveObjects:
+				exportObjects.append(obj)
+				recursiveObjects.discard(obj) #Each object one time
+		ExportAllAssetByList(
+		originalScene = scene,
+		targetobjects = exportObjects,
+		targetActionName = baseActionName,
+		targetcollection = baseCollectionName,
+		journal = journal,
+		settings = settings,
+		plan = plan,
+		)
 	
-	bpy.context.window.scene = scene
 	bpy.data.scenes.remove(copyScene)
+	journal.MutationEnd(sceneMutation)
 	
 	#Clean actions
-	for action in bpy.data.actions:
-		if action.name not in baseActionName:
+	baseActionNameSet = set(baseActionName)
+	for action in list(bpy.data.actions):
+		if action.name not in baseActionNameSet:
 			bpy.data.actions.remove(action)
+	journal.MutationEnd(actionsMutation)
 			
 	#Reset hide select
 	for object in UserObjHideSelect:
@@ -220,7 +311,12 @@ def PrepareAndSaveDataForExport():
 			bpy.data.objects[object[0]].hide_viewport = object[1]
 		else:
 			print("/!\ "+object[0]+" not found in bpy.data.objects")
+	journal.MutationEnd(hideMutation)
+
+	bfu_ExportJournal.SetCurrentJournal(None)
+	journal.End()
+	return settings
 		
 
-def ExportForUnrealEngine():
-	PrepareAndSaveDataForExport()
\ No newline at end of file
+def ExportForUnrealEngine(resume = False):
+	return PrepareAndSaveDataForExport(resume)
\ No newline at end of file
@@ -20,11 +20,21 @@
 import bpy
 import time
 import math
+import json
 
 import importlib
 from . import bfu_WriteText
 importlib.reload(bfu_WriteText)
 
+from . import bfu_ExportJournal
+importlib.reload(bfu_ExportJournal)
+
+from . import bfu_ExportSettings
+importlib.reload(bfu_ExportSettings)
+
+from . import bfu_Animation
+importlib.reload(bfu_Animation)
+
 from . import bfu_Basics
 importlib.reload(bfu_Basics)
 from .bfu_Basics import *
@@ -102,7 +112,12 @@ def ApplyProxyData(obj):
 			SetCurrentSelect(SavedSelect)				
 
 
-def BakeArmatureAnimation(armature, frame_start, frame_end):
+def BakeArmatureAnimation(armature, frame_start, frame_end, settings = None):
+	settings = bfu_ExportSettings.GetExportSettings(settings)
+	if settings.useFastArmatureBake == True:
+		bfu_Animation.FastBakeArmatureAnimation(armature, frame_start, frame_end)
+		return
+
 	#Change to pose mode
 	SavedSelect = GetCurrentSelect()
 	bpy.ops.object.select_all(action='DESELECT')
@@ -113,6 +128,7 @@ def BakeArmatureAnimation(armature, frame_start, frame_end):
 
 	
 def DuplicateSelect():
+	#Duplicate the selected objects, return the journal mutation of the duplicates
 	
 	scene = bpy.context.scene
 	bpy.ops.object.duplicate()
@@ -131,15 +147,30 @@ def DuplicateSelect():
 		if objScene.data is not None:
 			objScene.data = objScene.data.copy()
 
-def SetSocketsExportTransform(obj):
+	#The duplicates are also in the collections of the user scene, they are removed by name on resume
+	return bfu_ExportJournal.JournalMutationBegin("duplicates", {"objects": [obj.name for obj in bpy.context.selected_objects]})
+
+def AddLodDecimateToSelect(ratio):
+	#Add a collapse Decimate modifier to the selected meshes (not the collisions)
+	#The collapse keep the UV seams and interpolate the vertex weights.
+	#It is applied with the other modifiers by ApplyNeededModifierToSelect()
+
+	collisions = GetAllCollisionAndSocketsObj(bpy.context.selected_objects)
+	for obj in bpy.context.selected_objects:
+		if obj.type == "MESH" and obj not in collisions:
+			mod = obj.modifiers.new("LodDecimate", "DECIMATE")
+			mod.decimate_type = "COLLAPSE"
+			mod.ratio = ratio
+
+def SetSocketsExportTransform(obj, settings = None):
 	#Set socket scale for Unreal
 	
-	addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
+	settings = bfu_ExportSettings.GetExportSettings(settings)
 	for socket in GetSocketDesiredChild(obj):
-		if GetShoulRescaleSocket() == True:
-			socket.delta_scale *= GetRescaleSocketFactor()
+		if GetShoulRescaleSocket(settings) == True:
+			socket.delta_scale *= GetRescaleSocketFactor(settings)
 	
-		if addon_prefs.staticSocketsAdd90X == True:
+		if settings.staticSocketsAdd90X == True:
 			savedScale = socket.scale.copy()
 			savedLocation = socket.location.copy()
 			AddMat = mathutils.Matrix.Rotation(math.radians(90.0), 4, 'X')
@@ -149,9 +180,13 @@ def SetSocketsExportTransform(obj):
 	
 def AddSocketsTempName(obj):
 	#Add _UE4Socket_TempName at end
+	#Return the journal mutation id for RemoveSocketsTempName()
 	
-	for socket in GetSocketDesiredChild(obj):
+	sockets = GetSocketDesiredChild(obj)
+	mutationId = bfu_ExportJournal.JournalMutationBegin("socket_temp_name", {"sockets": [socket.name for socket in sockets]})
+	for socket in sockets:
 		socket.name += "_UE4Socket_TempName"
+	return mutationId
 		
 def RemoveDuplicatedSocketsTempName(obj):
 	#Remove _UE4Socket_TempName at end
@@ -160,16 +195,19 @@ def RemoveDuplicatedSocketsTempName(obj):
 		ToRemove = "_UE4Socket_TempName.xxx"
 		socket.name = socket.name[:-len(ToRemove)]
 	
-def RemoveSocketsTempName(obj):
+def RemoveSocketsTempName(obj, mutationId = None):
 	#Remove _UE4Socket_TempName at end
 	for socket in GetSocketDesiredChild(obj):
 		ToRemove = "_UE4Socket_TempName"
 		socket.name = socket.name[:-len(ToRemove)]
+	bfu_ExportJournal.JournalMutationEnd(mutationId)
 		
 
-def GetShoulRescaleRig():
+def GetShoulRescaleRig(settings = None):
 	#This will return if the rig should be rescale.
 	
+	if settings is not None:
+		return settings.shouldRescaleRig
 	addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
 	if addon_prefs.rescaleFullRigAtExport == "auto":
 		if bpy.context.scene.unit_settings.scale_length == 0.01:
@@ -182,9 +220,11 @@ def GetShoulRescaleRig():
 		return False
 	return False
 	
-def GetRescaleRigFactor():
+def GetRescaleRigFactor(settings = None):
 	#This will return the rescale factor.
 	
+	if settings is not None:
+		return settings.rescaleRigFactor
 	addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
 	if addon_prefs.rescaleFullRigAtExport == "auto":
 		return 100 * bpy.context.scene.unit_settings.scale_length
@@ -192,9 +232,11 @@ def GetRescaleRigFactor():
 		return addon_prefs.newRigScale #rigRescaleFactor
 		
 		
-def GetShoulRescaleSocket():
+def GetShoulRescaleSocket(settings = None):
 	#This will return if the socket should be rescale.
 	
+	if settings is not None:
+		return settings.shouldRescaleSocket
 	addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
 	if addon_prefs.rescaleSocketsAtExport == "auto":
 		if bpy.context.scene.unit_settings.scale_length == 0.01:
@@ -207,25 +249,29 @@ def GetShoulRescaleSocket():
 		return False
 	return False
 		
-def GetRescaleSocketFactor():
+def GetRescaleSocketFactor(settings = None):
 	#This will return the rescale factor.
 	
+	if settings is not None:
+		return settings.rescaleSocketFactor
 	addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
 	if addon_prefs.rescaleSocketsAtExport == "auto":
 		return 1/(100*bpy.context.scene.unit_settings.scale_length)
 	else:
 		return addon_prefs.staticSocketsImportedSize #socketRescaleFactor
 
-def ExportSingleFbxAction(originalScene, dirpath, filename, obj, targetAction, actionType):
+def ExportSingleFbxAction(originalScene, dirpath, filename, obj, targetAction, actionType, settings = None, rigBaker = None):
 	'''
 	#####################################################
 			#SKELETAL ACTION
 	#####################################################
 	'''
 	#Export a single action like a animation or pose
+	#rigBaker is a bfu_Animation.SharedRigBaker that can give the action already baked
 	
 	scene = bpy.context.scene
-	addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
+	settings = bfu_ExportSettings.GetExportSettings(settings)
+	objSettings = settings.GetObject(obj)
 	
 	filename = ValidFilenameForUnreal(filename)
 	curr_time = time.process_time()
@@ -243,24 +289,34 @@ def ExportSingleFbxAction(originalScene, dirpath, filename, obj, targetAction, a
 		
 
 	SelectParentAndDesiredChilds(obj)
-	DuplicateSelect()
+	duplicateMutation = DuplicateSelect()
 	BaseTransform = obj.matrix_world.copy()
 	active = bpy.context.view_layer.objects.active
-	if active.ExportAsProxy == True:
+	if objSettings.ExportAsProxy == True:
 		ApplyProxyData(active)	
 
-	if addon_prefs.bakeArmatureAction == True:
-		BakeArmatureAnimation(active, scene.frame_start, scene.frame_end)		
+	exportAction = targetAction
+	if settings.bakeArmatureAction == True:
+		bakedAction = None
+		if rigBaker is not None and objSettings.ExportAsProxy == False:
+			bakedAction = rigBaker.GetBakedAction(obj, targetAction)
+		if bakedAction is not None:
+			bfu_Animation.ApplyBakedAction(active, bakedAction)
+			exportAction = bakedAction
+		else:
+			BakeArmatureAnimation(active, scene.frame_start, scene.frame_end, settings)		
 	
 	ApplyExportTransform(active)
 	
 	#This is temp and should me apply only if Unit scale = 1
-	if GetShoulRescaleRig() == True:
+	if GetShoulRescaleRig(settings) == True:
 	
-		rrf = GetRescaleRigFactor() #rigRescaleFactor
+		rrf = GetRescaleRigFactor(settings) #rigRescaleFactor
 		savedUnitLength = bpy.context.scene.unit_settings.scale_length
+		unitMutation = bfu_ExportJournal.JournalMutationBegin("unit_scale", {"scene": bpy.context.scene.name, "value": savedUnitLength})
 		bpy.context.scene.unit_settings.scale_length *= 1/rrf
 		ApplySkeletalExportScale(active, rrf)
+		actionScaleMutation = bfu_ExportJournal.JournalMutationBegin("action_rescale", {"factor": rrf})
 		RescaleAllActionCurve(rrf)
 		RescaleSelectCurveHook(1/rrf)
 		ResetArmaturePose(active)
@@ -269,50 +325,58 @@ def ExportSingleFbxAction(originalScene, dirpath, filename, obj, targetAction, a
 	if (scene.is_nla_tweakmode == True):
 		active.animation_data.use_tweak_mode = False #animation_data.action is ReadOnly with tweakmode in 2.8
 	
-	if addon_prefs.ignoreNLAForAction == True:
-		active.animation_data.action = targetAction #Apply desired action and reset NLA
+	if settings.ignoreNLAForAction == True:
+		active.animation_data.action = exportAction #Apply desired action and reset NLA
 		active.animation_data.action_extrapolation = 'HOLD'
 		active.animation_data.action_blend_type = 'REPLACE'
 		active.animation_data.action_influence = 1
 	scene.frame_start = GetDesiredActionStartEndTime(active, targetAction)[0]
 	scene.frame_end = GetDesiredActionStartEndTime(active, targetAction)[1]
 	
+	animEstimate = bfu_Animation.EstimateActionExport(active, exportAction, scene.frame_start, scene.frame_end, objSettings.SampleAnimForExport, objSettings.exportDeformOnly)
+	forceStartEndKeying, simplifyFactor = bfu_Animation.GetFbxAnimBakeOptions(objSettings, animEstimate)
+	print("Animation "+filename+": "+animEstimate.GetText())
+	
 	
 	absdirpath = bpy.path.abspath(dirpath)
 	VerifiDirs(absdirpath)
 	fullpath = os.path.join( absdirpath , filename )
+	stagedpath = GetStagedFilePath(fullpath)
 	
 	#Set rename temporarily the Armature as "Armature"
-	oldArmatureName = RenameArmatureAsExportName(active)
+	armatureMutation = bfu_ExportJournal.JournalMutationBegin("armature_name", {"exportName": settings.exportArmatureName, "duplicate": active.name})
+	oldArmatureName = RenameArmatureAsExportName(active, settings)
 	
 	bpy.ops.export_scene.fbx(
-		filepath=fullpath,
+		filepath=stagedpath,
 		check_existing=False,
 		use_selection=True,
-		global_scale=GetObjExportScale(active),
+		global_scale=objSettings.exportGlobalScale,
 		object_types={'ARMATURE', 'EMPTY', 'MESH'},
-		use_custom_props=addon_prefs.exportWithCustomProps,
+		use_custom_props=settings.exportWithCustomProps,
 		mesh_smooth_type="FACE",
 		add_leaf_bones=False,
-		use_armature_deform_only=active.exportDeformOnly,
+		use_armature_deform_only=objSettings.exportDeformOnly,
 		bake_anim=True,
 		bake_anim_use_nla_strips=False,
 		bake_anim_use_all_actions=False,
-		bake_anim_force_startend_keying=True,
-		bake_anim_step=GetAnimSample(active),
-		bake_anim_simplify_factor=active.SimplifyAnimForExport,
-		use_metadata=addon_prefs.exportWithMetaData,
-		primary_bone_axis = active.exportPrimaryBaneAxis,
-		secondary_bone_axis = active.exporSecondaryBoneAxis,	
-		axis_forward = active.exportAxisForward,
-		axis_up = active.exportAxisUp,
+		bake_anim_force_startend_keying=forceStartEndKeying,
+		bake_anim_step=objSettings.SampleAnimForExport,
+		bake_anim_simplify_factor=simplifyFactor,
+		use_metadata=settings.exportWithMetaData,
+		primary_bone_axis = objSettings.exportPrimaryBaneAxis,
+		secondary_bone_axis = objSettings.exporSecondaryBoneAxis,	
+		axis_forward = objSettings.exportAxisForward,
+		axis_up = objSettings.exportAxisUp,
 		bake_space_transform = False
 		)
+	CommitStagedFile(stagedpath, fullpath)
 
 	
 
 	#Reset armature name
-	ResetArmatureName(active, oldArmatureName, )
+	ResetArmatureName(active, oldArmatureName, settings)
+	bfu_ExportJournal.JournalMutationEnd(armatureMutation)
 	
 	ResetArmaturePose(obj)
 		
@@ -326,12 +390,15 @@ def ExportSingleFbxAction(originalScene, dirpath, filename, obj, targetAction, a
 	obj.matrix_world = BaseTransform
 	
 	#This is temp and should me apply only if Unit scale = 1
-	if GetShoulRescaleRig() == True:
+	if GetShoulRescaleRig(settings) == True:
 		#Reset Curve an unit
 		bpy.context.scene.unit_settings.scale_length = savedUnitLength
+		bfu_ExportJournal.JournalMutationEnd(unitMutation)
 		RescaleAllActionCurve(1/rrf)
+		bfu_ExportJournal.JournalMutationEnd(actionScaleMutation)
 
 	bpy.ops.object.delete()
+	bfu_ExportJournal.JournalMutationEnd(duplicateMutation)
 	
 	exportTime = time.process_time()-curr_time
 	MyAsset = originalScene.UnrealExportedAssetsList.add()
@@ -340,9 +407,168 @@ def ExportSingleFbxAction(originalScene, dirpath, filename, obj, targetAction, a
 	MyAsset.exportPath = absdirpath
 	MyAsset.exportTime = exportTime
 	MyAsset.object = obj
+	MyAsset.animKeys = animEstimate.keys if forceStartEndKeying == False else animEstimate.rawKeys
+	MyAsset.animRawKeys = animEstimate.rawKeys
+	return MyAsset
+
+def ExportSingleFbxMultiTakeAnim(originalScene, dirpath, filename, obj, actions, settings = None):
+	'''
+	#####################################################
+			#MULTI TAKE ANIMATION
+	#####################################################
+	'''
+	#Export the actions of a armature as the takes of a single FBX
+	#The FBX exporter write one take per action valid for the armature with the frame range of the action.
+	#The other actions are excluded during the export and the takes use the desired start/end time (Blender 3.1+).
+	#The takes that are not in actions are removed by the import script.
+	
+	scene = bpy.context.scene
+	settings = bfu_ExportSettings.GetExportSettings(settings)
+	objSettings = settings.GetObject(obj)
+	
+	filename = ValidFilenameForUnreal(filename)
+	curr_time = time.process_time()
+	
+	if obj.animation_data is None:
+		obj.animation_data_create()
+	userAction = obj.animation_data.action #Save current action
+	userAction_extrapolation = obj.animation_data.action_extrapolation
+	userAction_blend_type = obj.animation_data.action_blend_type
+	userAction_influence = obj.animation_data.action_influence
+
+
+	if	bpy.ops.object.mode_set.poll():
+		bpy.ops.object.mode_set(mode='OBJECT')
+		
+
+	SelectParentAndDesiredChilds(obj)
+	duplicateMutation = DuplicateSelect()
+	BaseTransform = obj.matrix_world.copy()
+	active = bpy.context.view_layer.objects.active
+	if objSettings.ExportAsProxy == True:
+		ApplyProxyData(active)	
+	
+	ApplyExportTransform(active)
+	
+	#This is temp and should me apply only if Unit scale = 1
+	if GetShoulRescaleRig(settings) == True:
+	
+		rrf = GetRescaleRigFactor(settings) #rigRescaleFactor
+		savedUnitLength = bpy.context.scene.unit_settings.scale_length
+		unitMutation = bfu_ExportJournal.JournalMutationBegin("unit_scale", {"scene": bpy.context.scene.name, "value": savedUnitLength})
+		bpy.context.scene.unit_settings.scale_length *= 1/rrf
+		ApplySkeletalExportScale(active, rrf)
+		actionScaleMutation = bfu_ExportJournal.JournalMutationBegin("action_rescale", {"factor": rrf})
+		RescaleAllActionCurve(rrf)
+		RescaleSelectCurveHook(1/rrf)
+		ResetArmaturePose(active)
+		RescaleStretchLengthConsraints(active, rrf)
+	
+	if (scene.is_nla_tweakmode == True):
+		active.animation_data.use_tweak_mode = False #animation_data.action is ReadOnly with tweakmode in 2.8
+	
+	if settings.ignoreNLAForAction == True:
+		#The exporter only switch the action, the NLA of the duplicate is muted
+		for track in active.animation_data.nla_tracks:
+			track.mute = True
+		active.animation_data.action_extrapolation = 'HOLD'
+		active.animation_data.action_blend_type = 'REPLACE'
+		active.animation_data.action_influence = 1
+	
+	#Only the actions to export are written as takes, the action of the duplicate is always written
+	if active.animation_data.action not in actions:
+		active.animation_data.action = actions[0]
+	takeState = GetMultiTakeActionsState(obj, actions)
+	takeMutation = bfu_ExportJournal.JournalMutationBegin("multi_take_actions", takeState)
+	SetMultiTakeActions(takeState)
+	
+	animEstimate = bfu_Animation.EstimateMultiTakeExport(active, actions, objSettings.SampleAnimForExport, objSettings.exportDeformOnly)
+	forceStartEndKeying, simplifyFactor = bfu_Animation.GetFbxAnimBakeOptions(objSettings, animEstimate)
+	print("Animation "+filename+" ("+str(len(actions))+" takes): "+animEstimate.GetText())
+	
+	
+	absdirpath = bpy.path.abspath(dirpath)
+	VerifiDirs(absdirpath)
+	fullpath = os.path.join( absdirpath , filename )
+	stagedpath = GetStagedFilePath(fullpath)
+	
+	#Set rename temporarily the Armature as "Armature"
+	armatureMutation = bfu_ExportJournal.JournalMutationBegin("armature_name", {"exportName": settings.exportArmatureName, "duplicate": active.name})
+	oldArmatureName = RenameArmatureAsExportName(active, settings)
+	
+	bpy.ops.export_scene.fbx(
+		filepath=stagedpath,
+		check_existing=False,
+		use_selection=True,
+		global_scale=objSettings.exportGlobalScale,
+		object_types={'ARMATURE', 'EMPTY', 'MESH'},
+		use_custom_props=settings.exportWithCustomProps,
+		mesh_smooth_type="FACE",
+		add_leaf_bones=False,
+		use_armature_deform_only=objSettings.exportDeformOnly,
+		bake_anim=True,
+		bake_anim_use_nla_strips=False,
+		bake_anim_use_all_actions=True,
+		bake_anim_force_startend_keying=forceStartEndKeying,
+		bake_anim_step=objSettings.SampleAnimForExport,
+		bake_anim_simplify_factor=simplifyFactor,
+		use_metadata=settings.exportWithMetaData,
+		primary_bone_axis = objSettings.exportPrimaryBaneAxis,
+		secondary_bone_axis = objSettings.exporSecondaryBoneAxis,	
+		axis_forward = objSettings.exportAxisForward,
+		axis_up = objSettings.exportAxisUp,
+		bake_space_transform = False
+		)
+	CommitStagedFile(stagedpath, fullpath)
+	ResetMultiTakeActions(takeState)
+	bfu_ExportJournal.JournalMutationEnd(takeMutation)
+
+	
+
+	#Reset armature name
+	ResetArmatureName(active, oldArmatureName, settings)
+	bfu_ExportJournal.JournalMutationEnd(armatureMutation)
+	
+	ResetArmaturePose(obj)
+		
+	obj.animation_data.action = userAction #Resets previous action and NLA
+	obj.animation_data.action_extrapolation = userAction_extrapolation
+	obj.animation_data.action_blend_type = userAction_blend_type
+	obj.animation_data.action_influence = userAction_influence
+	
+	
+	#Reset Transform
+	obj.matrix_world = BaseTransform
+	
+	#This is temp and should me apply only if Unit scale = 1
+	if GetShoulRescaleRig(settings) == True:
+		#Reset Curve an unit
+		bpy.context.scene.unit_settings.scale_length = savedUnitLength
+		bfu_ExportJournal.JournalMutationEnd(unitMutation)
+		RescaleAllActionCurve(1/rrf)
+		bfu_ExportJournal.JournalMutationEnd(actionScaleMutation)
+
+	bpy.ops.object.delete()
+	bfu_ExportJournal.JournalMutationEnd(duplicateMutation)
+	
+	#Asset name of each take, the same as the action exported alone
+	animTakes = {}
+	for action in actions:
+		animTakes[GetMultiTakeName(action, settings)] = ValidFilenameForUnreal(GetActionExportFileName(obj, action))[:-4]
+	
+	exportTime = time.process_time()-curr_time
+	MyAsset = originalScene.UnrealExportedAssetsList.add()
+	MyAsset.assetName = filename
+	MyAsset.assetType = "MultiTakeAnim"
+	MyAsset.exportPath = absdirpath
+	MyAsset.exportTime = exportTime
+	MyAsset.object = obj
+	MyAsset.animKeys = animEstimate.keys if forceStartEndKeying == False else animEstimate.rawKeys
+	MyAsset.animRawKeys = animEstimate.rawKeys
+	MyAsset.animTakes = json.dumps(animTakes)
 	return MyAsset
 
-def ExportSingleFbxNLAAnim(originalScene, dirpath, filename, obj):
+def ExportSingleFbxNLAAnim(originalScene, dirpath, filename, obj, settings = None):
 	'''
 	#####################################################
 			#NLA ANIMATION
@@ -351,74 +577,84 @@ def ExportSingleFbxNLAAnim(originalScene, dirpath, filename, obj):
 	#Export a single NLA Animation
 
 	scene = bpy.context.scene
-	addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
+	settings = bfu_ExportSettings.GetExportSettings(settings)
+	objSettings = settings.GetObject(obj)
 	
 	filename = ValidFilenameForUnreal(filename)
 	curr_time = time.process_time()
 
 	SelectParentAndDesiredChilds(obj)
-	DuplicateSelect()
+	duplicateMutation = DuplicateSelect()
 	BaseTransform = obj.matrix_world.copy()
 	active = bpy.context.view_layer.objects.active
-	if active.ExportAsProxy == True:
+	if objSettings.ExportAsProxy == True:
 		ApplyProxyData(active)
 	
-	if addon_prefs.bakeArmatureAction == True:
-		BakeArmatureAnimation(active, scene.frame_start, scene.frame_end)
+	if settings.bakeArmatureAction == True:
+		BakeArmatureAnimation(active, scene.frame_start, scene.frame_end, settings)
 		
 	ApplyExportTransform(active)
 
 	#This is temp and should me apply only if Unit scale = 1
-	if GetShoulRescaleRig() == True:
+	if GetShoulRescaleRig(settings) == True:
 	
-		rrf = GetRescaleRigFactor() #rigRescaleFactor
+		rrf = GetRescaleRigFactor(settings) #rigRescaleFactor
 		savedUnitLength = bpy.context.scene.unit_settings.scale_length
+		unitMutation = bfu_ExportJournal.JournalMutationBegin("unit_scale", {"scene": bpy.context.scene.name, "value": savedUnitLength})
 		bpy.context.scene.unit_settings.scale_length *= 1/rrf
 		ApplySkeletalExportScale(active, rrf)
+		actionScaleMutation = bfu_ExportJournal.JournalMutationBegin("action_rescale", {"factor": rrf})
 		RescaleAllActionCurve(rrf)
 		RescaleSelectCurveHook(1/rrf)
 		ResetArmaturePose(active)
 		RescaleStretchLengthConsraints(active, rrf)
 	
-	scene.frame_start += active.StartFramesOffset
-	scene.frame_end += active.EndFramesOffset
+	scene.frame_start += objSettings.StartFramesOffset
+	scene.frame_end += objSettings.EndFramesOffset
+	animEstimate = bfu_Animation.EstimateNLAExport(active, scene.frame_start, scene.frame_end, objSettings.SampleAnimForExport, objSettings.exportDeformOnly)
+	forceStartEndKeying, simplifyFactor = bfu_Animation.GetFbxAnimBakeOptions(objSettings, animEstimate)
+	print("Animation "+filename+": "+animEstimate.GetText())
 	absdirpath = bpy.path.abspath(dirpath)
 	VerifiDirs(absdirpath)
 	fullpath = os.path.join( absdirpath , filename )
+	stagedpath = GetStagedFilePath(fullpath)
 
 	#Set rename temporarily the Armature as "Armature"
-	oldArmatureName = RenameArmatureAsExportName(active)
+	armatureMutation = bfu_ExportJournal.JournalMutationBegin("armature_name", {"exportName": settings.exportArmatureName, "duplicate": active.name})
+	oldArmatureName = RenameArmatureAsExportName(active, settings)
 
 	bpy.ops.export_scene.fbx(
-		filepath=fullpath,
+		filepath=stagedpath,
 		check_existing=False,
 		use_selection=True,
-		global_scale=GetObjExportScale(active),
+		global_scale=objSettings.exportGlobalScale,
 		object_types={'ARMATURE', 'EMPTY', 'MESH'},
-		use_custom_props=addon_prefs.exportWithCustomProps,
+		use_custom_props=settings.exportWithCustomProps,
 		add_leaf_bones=False,
-		use_armature_deform_only=active.exportDeformOnly,
+		use_armature_deform_only=objSettings.exportDeformOnly,
 		bake_anim=True,
 		bake_anim_use_nla_strips=False,
 		bake_anim_use_all_actions=False,
-		bake_anim_force_startend_keying=True,
-		bake_anim_step=GetAnimSample(active),
-		bake_anim_simplify_factor=active.SimplifyAnimForExport,
-		use_metadata=addon_prefs.exportWithMetaData,
-		primary_bone_axis = active.exportPrimaryBaneAxis,
-		secondary_bone_axis = active.exporSecondaryBoneAxis,	
-		axis_forward = active.exportAxisForward,
-		axis_up = active.exportAxisUp,
+		bake_anim_force_startend_keying=forceStartEndKeying,
+		bake_anim_step=objSettings.SampleAnimForExport,
+		bake_anim_simplify_factor=simplifyFactor,
+		use_metadata=settings.exportWithMetaData,
+		primary_bone_axis = objSettings.exportPrimaryBaneAxis,
+		secondary_bone_axis = objSettings.exporSecondaryBoneAxis,	
+		axis_forward = objSettings.exportAxisForward,
+		axis_up = objSettings.exportAxisUp,
 		bake_space_transform = False
 		)		
+	CommitStagedFile(stagedpath, fullpath)
 		
 	ResetArmaturePose(active)
-	scene.frame_start -= active.StartFramesOffset
-	scene.frame_end -= active.EndFramesOffset
+	scene.frame_start -= objSettings.StartFramesOffset
+	scene.frame_end -= objSettings.EndFramesOffset
 	exportTime = time.process_time()-curr_time
 
 	#Reset armature name
-	ResetArmatureName(active, oldArmatureName)
+	ResetArmatureName(active, oldArmatureName, settings)
+	bfu_ExportJournal.JournalMutationEnd(armatureMutation)
 	
 	ResetArmaturePose(obj)
 	
@@ -426,12 +662,15 @@ def ExportSingleFbxNLAAnim(originalScene, dirpath, filename, obj):
 	obj.matrix_world = BaseTransform
 	
 	#This is temp and should me apply only if Unit scale = 1
-	if GetShoulRescaleRig() == True:
+	if GetShoulRescaleRig(settings) == True:
 		#Reset Curve an unit
 		bpy.context.scene.unit_settings.scale_length = savedUnitLength
+		bfu_ExportJournal.JournalMutationEnd(unitMutation)
 		RescaleAllActionCurve(1/rrf)
+		bfu_ExportJournal.JournalMutationEnd(actionScaleMutation)
 
 	bpy.ops.object.delete()
+	bfu_ExportJournal.JournalMutationEnd(duplicateMutation)
 
 	MyAsset = originalScene.UnrealExportedAssetsList.add()
 	MyAsset.assetName = filename
@@ -439,11 +678,13 @@ def ExportSingleFbxNLAAnim(originalScene, dirpath, filename, obj):
 	MyAsset.exportPath = absdirpath
 	MyAsset.exportTime = exportTime
 	MyAsset.object = obj
+	MyAsset.animKeys = animEstimate.keys if forceStartEndKeying == False else animEstimate.rawKeys
+	MyAsset.animRawKeys = animEstimate.rawKeys
 	return MyAsset
 
 
 
-def ExportSingleAlembicAnimation(originalScene, dirpath, filename, obj):
+def ExportSingleAlembicAnimation(originalScene, dirpath, filename, obj, settings = None):
 	'''
 	#####################################################
 			#ALEMBIC ANIMATION
@@ -452,6 +693,8 @@ def ExportSingleAlembicAnimation(originalScene, dirpath, filename, obj):
 	#Export a single alembic animation
 
 	scene = bpy.context.scene
+	settings = bfu_ExportSettings.GetExportSettings(settings)
+	objSettings = settings.GetObject(obj)
 	filename = ValidFilenameForUnreal(filename)
 	curr_time = time.process_time()
 	if	bpy.ops.object.mode_set.poll():
@@ -459,22 +702,24 @@ def ExportSingleAlembicAnimation(originalScene, dirpath, filename, obj):
 
 	SelectParentAndDesiredChilds(obj)
 
-	scene.frame_start += obj.StartFramesOffset
-	scene.frame_end += obj.EndFramesOffset
+	scene.frame_start += objSettings.StartFramesOffset
+	scene.frame_end += objSettings.EndFramesOffset
 	absdirpath = bpy.path.abspath(dirpath)
 	VerifiDirs(absdirpath)
 	fullpath = os.path.join( absdirpath , filename )
+	stagedpath = GetStagedFilePath(fullpath)
 
 	##Export
 	bpy.ops.wm.alembic_export(
-		filepath=fullpath,
+		filepath=stagedpath,
 		check_existing=False,
 		selected=True,
 		triangulate=False,
 		)
+	CommitStagedFile(stagedpath, fullpath)
 
-	scene.frame_start -= obj.StartFramesOffset
-	scene.frame_end -= obj.EndFramesOffset
+	scene.frame_start -= objSettings.StartFramesOffset
+	scene.frame_end -= objSettings.EndFramesOffset
 	exportTime = time.process_time()-curr_time
 
 	MyAsset = originalScene.UnrealExportedAssetsList.add()
@@ -486,7 +731,7 @@ def ExportSingleAlembicAnimation(originalScene, dirpath, filename, obj):
 	return MyAsset
 
 
-def ExportSingleStaticMeshCollection(originalScene, dirpath, filename, collectionName):
+def ExportSingleStaticMeshCollection(originalScene, dirpath, filename, collectionName, settings = None):
 	'''
 	#####################################################
 			#COLLECTION
@@ -497,14 +742,59 @@ def ExportSingleStaticMeshCollection(originalScene, dirpath, filename, collectio
 	bpy.context.scene.collection.objects.link( obj )
 	obj.instance_type = 'COLLECTION'
 	obj.instance_collection = bpy.data.collections[collectionName]
-	ExportSingleStaticMesh(originalScene, dirpath, filename, obj)
+	ExportSingleStaticMesh(originalScene, dirpath, filename, obj, settings)
 	
 	#Remove the created collection
 	SelectSpecificObject(obj)
 	bpy.ops.object.delete()	 
 	
+def ExportSingleCollectionLayout(originalScene, dirpath, filename, collectionName, settings = None):
+	'''
+	#####################################################
+			#COLLECTION LAYOUT
+	#####################################################
+	'''
+	#Export each unique mesh of the collection one time and
+	#write the layout file with the mesh and the matrix of each instance
+
+	settings = bfu_ExportSettings.GetExportSettings(settings)
+	filename = ValidFilenameForUnreal(filename)
+	curr_time = time.process_time()
+
+	meshIndexes = {}
+	meshPaths = []
+	meshIds = []
+	matrices = []
+	for obj, matrix in GetCollectionInstances(bpy.data.collections[collectionName]):
+		key = GetLayoutMeshKey(obj)
+		if key not in meshIndexes:
+			#The mesh is exported in his local space, the instance matrix place it
+			meshFileName = ValidFilenameForUnreal(GetCollectionLayoutMeshFileName(collectionName, obj))
+			ExportSingleStaticMesh(originalScene, dirpath, meshFileName, obj, settings, exportMatrix = mathutils.Matrix.Identity(4))
+			meshIndexes[key] = len(meshPaths)
+			meshPaths.append(os.path.join(obj.exportFolderName, os.path.splitext(meshFileName)[0]).replace("\\", "/"))
+		meshIds.append(meshIndexes[key])
+		matrices.append(matrix)
+
+	absdirpath = bpy.path.abspath(dirpath)
+	VerifiDirs(absdirpath)
+	fullpath = os.path.join( absdirpath , filename )
+	stagedpath = GetStagedFilePath(fullpath)
+	with open(stagedpath, "wb") as file:
+		file.write(GetLayoutData(meshPaths, meshIds, GetUnrealLayoutMatrices(matrices, 100 * settings.unitScaleLength)))
+	CommitStagedFile(stagedpath, fullpath)
+
+	exportTime = time.process_time()-curr_time
+
+	MyAsset = originalScene.UnrealExportedAssetsList.add()
+	MyAsset.assetName = filename
+	MyAsset.assetType = "Layout"
+	MyAsset.exportPath = absdirpath
+	MyAsset.exportTime = exportTime
+	return MyAsset
+
 	
-def ExportSingleStaticMesh(originalScene, dirpath, filename, obj):
+def ExportSingleStaticMesh(originalScene, dirpath, filename, obj, settings = None, lodRatio = None, exportMatrix = None):
 	'''
 	#####################################################
 			#STATIC MESH
@@ -513,7 +803,8 @@ def ExportSingleStaticMesh(originalScene, dirpath, filename, obj):
 	#Export a single Mesh
 
 	scene = bpy.context.scene
-	addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
+	settings = bfu_ExportSettings.GetExportSettings(settings)
+	objSettings = settings.GetObject(obj)
 	
 	filename = ValidFilenameForUnreal(filename)
 	curr_time = time.process_time()
@@ -522,54 +813,62 @@ def ExportSingleStaticMesh(originalScene, dirpath, filename, obj):
 		bpy.ops.object.mode_set(mode = 'OBJECT')
 	
 	SelectParentAndDesiredChilds(obj)
-	AddSocketsTempName(obj)
-	DuplicateSelect()
+	socketMutation = AddSocketsTempName(obj)
+	duplicateMutation = DuplicateSelect()
+	if lodRatio is not None:
+		AddLodDecimateToSelect(lodRatio)
 	ApplyNeededModifierToSelect()
 
 	active = bpy.context.view_layer.objects.active
 	
 
-	if addon_prefs.correctExtremUVScale == True:
+	if settings.correctExtremUVScale == True:
 		bpy.ops.object.mode_set(mode = 'EDIT')
 		CorrectExtremeUV(2)
 		bpy.ops.object.mode_set(mode = 'OBJECT')
 		
 	UpdateNameHierarchy(GetAllCollisionAndSocketsObj(bpy.context.selected_objects))
 	
-	ApplyExportTransform(active)
+	if exportMatrix is not None:
+		active.matrix_world = exportMatrix
+	else:
+		ApplyExportTransform(active)
 	
 
 	absdirpath = bpy.path.abspath(dirpath)
 	VerifiDirs(absdirpath)
 	fullpath = os.path.join( absdirpath , filename )
+	stagedpath = GetStagedFilePath(fullpath)
 	meshType = GetAssetType(active)
 	
-	SetSocketsExportTransform(active)
+	SetSocketsExportTransform(active, settings)
 	
 	RemoveDuplicatedSocketsTempName(active)
 			
 
 	bpy.ops.export_scene.fbx(
-		filepath=fullpath,
+		filepath=stagedpath,
 		check_existing=False,
 		use_selection=True,
-		global_scale=GetObjExportScale(active),
+		global_scale=objSettings.exportGlobalScale,
 		object_types={'EMPTY', 'CAMERA', 'LIGHT', 'MESH', 'OTHER'},
-		use_custom_props=addon_prefs.exportWithCustomProps,
+		use_custom_props=settings.exportWithCustomProps,
 		mesh_smooth_type="FACE",
 		add_leaf_bones=False,
-		use_armature_deform_only=active.exportDeformOnly,
+		use_armature_deform_only=objSettings.exportDeformOnly,
 		bake_anim=False,
-		use_metadata=addon_prefs.exportWithMetaData,
-		primary_bone_axis = active.exportPrimaryBaneAxis,
-		secondary_bone_axis = active.exporSecondaryBoneAxis,	
-		axis_forward = active.exportAxisForward,
-		axis_up = active.exportAxisUp,
+		use_metadata=settings.exportWithMetaData,
+		primary_bone_axis = objSettings.exportPrimaryBaneAxis,
+		secondary_bone_axis = objSettings.exporSecondaryBoneAxis,	
+		axis_forward = objSettings.exportAxisForward,
+		axis_up = objSettings.exportAxisUp,
 		bake_space_transform = False
 		)
+	CommitStagedFile(stagedpath, fullpath)
 		
 	bpy.ops.object.delete()
-	RemoveSocketsTempName(obj)
+	bfu_ExportJournal.JournalMutationEnd(duplicateMutation)
+	RemoveSocketsTempName(obj, socketMutation)
 		
 
 	
@@ -584,7 +883,7 @@ def ExportSingleStaticMesh(originalScene, dirpath, filename, obj):
 	MyAsset.object = obj
 	return MyAsset
 	
-def ExportSingleSkeletalMesh(originalScene, dirpath, filename, obj):
+def ExportSingleSkeletalMesh(originalScene, dirpath, filename, obj, settings = None, lodRatio = None):
 	'''
 	#####################################################
 			#SKELETAL MESH
@@ -593,7 +892,8 @@ def ExportSingleSkeletalMesh(originalScene, dirpath, filename, obj):
 	#Export a single Mesh
 
 	scene = bpy.context.scene
-	addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
+	settings = bfu_ExportSettings.GetExportSettings(settings)
+	objSettings = settings.GetObject(obj)
 	
 	filename = ValidFilenameForUnreal(filename)
 	curr_time = time.process_time()
@@ -603,12 +903,14 @@ def ExportSingleSkeletalMesh(originalScene, dirpath, filename, obj):
 
 	
 	SelectParentAndDesiredChilds(obj)
-	AddSocketsTempName(obj)
-	DuplicateSelect()	
+	socketMutation = AddSocketsTempName(obj)
+	duplicateMutation = DuplicateSelect()	
+	if lodRatio is not None:
+		AddLodDecimateToSelect(lodRatio)
 		
 	ApplyNeededModifierToSelect()
 	
-	if addon_prefs.correctExtremUVScale == True:
+	if settings.correctExtremUVScale == True:
 		SavedSelect = GetCurrentSelect()
 		if GoToMeshEditMode() == True:
 			CorrectExtremeUV(2)
@@ -620,16 +922,17 @@ def ExportSingleSkeletalMesh(originalScene, dirpath, filename, obj):
 		
 	UpdateNameHierarchy(GetAllCollisionAndSocketsObj(bpy.context.selected_objects))
 	active = bpy.context.view_layer.objects.active
-	if active.ExportAsProxy == True:
+	if objSettings.ExportAsProxy == True:
 		ApplyProxyData(active)
 	
 	ApplyExportTransform(active)
 	
 	#This is temp and should me apply only if Unit scale = 1
-	if GetShoulRescaleRig() == True:
+	if GetShoulRescaleRig(settings) == True:
 				
-		rrf = GetRescaleRigFactor() #rigRescaleFactor
+		rrf = GetRescaleRigFactor(settings) #rigRescaleFactor
 		savedUnitLength = bpy.context.scene.unit_settings.scale_length
+		unitMutation = bfu_ExportJournal.JournalMutationBegin("unit_scale", {"scene": bpy.context.scene.name, "value": savedUnitLength})
 		bpy.context.scene.unit_settings.scale_length *= 1/rrf
 		ApplySkeletalExportScale(active, rrf)
 		
@@ -637,48 +940,54 @@ def ExportSingleSkeletalMesh(originalScene, dirpath, filename, obj):
 	absdirpath = bpy.path.abspath(dirpath)
 	VerifiDirs(absdirpath)
 	fullpath = os.path.join( absdirpath , filename )
+	stagedpath = GetStagedFilePath(fullpath)
 	meshType = GetAssetType(active)
 			
-	SetSocketsExportTransform(active)
+	SetSocketsExportTransform(active, settings)
 	RemoveDuplicatedSocketsTempName(active)
 
 	
 	#Set rename temporarily the Armature as "Armature"
-	oldArmatureName = RenameArmatureAsExportName(active)
+	armatureMutation = bfu_ExportJournal.JournalMutationBegin("armature_name", {"exportName": settings.exportArmatureName, "duplicate": active.name})
+	oldArmatureName = RenameArmatureAsExportName(active, settings)
 	
 	RemoveAllConsraints(active)
 	bpy.context.object.data.pose_position = 'REST'
 	
 	bpy.ops.export_scene.fbx(
-		filepath=fullpath,
+		filepath=stagedpath,
 		check_existing=False,
 		use_selection=True,
-		global_scale=GetObjExportScale(active),
+		global_scale=objSettings.exportGlobalScale,
 		object_types={'ARMATURE', 'EMPTY', 'CAMERA', 'LIGHT', 'MESH', 'OTHER'},
-		use_custom_props=addon_prefs.exportWithCustomProps,
+		use_custom_props=settings.exportWithCustomProps,
 		mesh_smooth_type="FACE",
 		add_leaf_bones=False,
-		use_armature_deform_only=active.exportDeformOnly,
+		use_armature_deform_only=objSettings.exportDeformOnly,
 		bake_anim=False,
-		use_metadata=addon_prefs.exportWithMetaData,
-		primary_bone_axis = active.exportPrimaryBaneAxis,
-		secondary_bone_axis = active.exporSecondaryBoneAxis,	
-		axis_forward = active.exportAxisForward,
-		axis_up = active.exportAxisUp,
+		use_metadata=settings.exportWithMetaData,
+		primary_bone_axis = objSettings.exportPrimaryBaneAxis,
+		secondary_bone_axis = objSettings.exporSecondaryBoneAxis,	
+		axis_forward = objSettings.exportAxisForward,
+		axis_up = objSettings.exportAxisUp,
 		bake_space_transform = False
 		)
+	CommitStagedFile(stagedpath, fullpath)
 	
 	#This is temp and should me apply only if Unit scale = 1
-	if GetShoulRescaleRig() == True:
+	if GetShoulRescaleRig(settings) == True:
 		#Reset Curve an unit
 		bpy.context.scene.unit_settings.scale_length = savedUnitLength
+		bfu_ExportJournal.JournalMutationEnd(unitMutation)
 		
 	#Reset armature name
 
-	ResetArmatureName(active, oldArmatureName)
+	ResetArmatureName(active, oldArmatureName, settings)
+	bfu_ExportJournal.JournalMutationEnd(armatureMutation)
 	bpy.ops.object.delete()
+	bfu_ExportJournal.JournalMutationEnd(duplicateMutation)
 	
-	RemoveSocketsTempName(obj)
+	RemoveSocketsTempName(obj, socketMutation)
 	
 	exportTime = time.process_time()-curr_time
 	MyAsset = originalScene.UnrealExportedAssetsList.add()
@@ -690,7 +999,34 @@ def ExportSingleSkeletalMesh(originalScene, dirpath, filename, obj):
 	return MyAsset
 
 
-def ExportSingleFbxCamera(originalScene, dirpath, filename, obj):
+def ExportSingleStaticMeshAlias(originalScene, dirpath, filename, obj, aliasOf):
+	#Record a StaticMesh identical to the already exported StaticMesh of the object aliasOf.
+	#Nothing is exported, the asset use the file of aliasOf.
+
+	MyAsset = originalScene.UnrealExportedAssetsList.add()
+	MyAsset.assetName = ValidFilenameForUnreal(filename)
+	MyAsset.assetType = "StaticMesh"
+	MyAsset.exportPath = bpy.path.abspath(dirpath)
+	MyAsset.exportTime = 0
+	MyAsset.object = obj
+	MyAsset.aliasOf = aliasOf
+	return MyAsset
+
+def ExportAutoLods(originalScene, dirpath, obj, settings = None):
+	#Export the auto generated levels of detail of a StaticMesh or SkeletalMesh
+	#Each lod is a decimated copy exported like the mesh
+
+	settings = bfu_ExportSettings.GetExportSettings(settings)
+	objSettings = settings.GetObject(obj)
+	for lodLevel, ratio in enumerate(objSettings.GetAutoLodRatios(), 1):
+		filename = GetAutoLodExportFileName(obj, lodLevel)
+		if objSettings.assetType == "SkeletalMesh":
+			MyAsset = ExportSingleSkeletalMesh(originalScene, dirpath, filename, obj, settings, ratio)
+		else:
+			MyAsset = ExportSingleStaticMesh(originalScene, dirpath, filename, obj, settings, ratio)
+		MyAsset.lodLevel = lodLevel
+
+def ExportSingleFbxCamera(originalScene, dirpath, filename, obj, settings = None):
 	'''
 	#####################################################
 			#CAMERA
@@ -699,7 +1035,8 @@ def ExportSingleFbxCamera(originalScene, dirpath, filename, obj):
 	#Export single camera
 
 	scene = bpy.context.scene
-	addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
+	settings = bfu_ExportSettings.GetExportSettings(settings)
+	objSettings = settings.GetObject(obj)
 	
 	filename = ValidFilename(filename)
 	if obj.type != 'CAMERA':
@@ -722,29 +1059,31 @@ def ExportSingleFbxCamera(originalScene, dirpath, filename, obj):
 	absdirpath = bpy.path.abspath(dirpath)
 	VerifiDirs(absdirpath)
 	fullpath = os.path.join( absdirpath , filename )
+	stagedpath = GetStagedFilePath(fullpath)
 
 	bpy.ops.export_scene.fbx(
-		filepath=fullpath,
+		filepath=stagedpath,
 		check_existing=False,
 		use_selection=True,
-		global_scale=GetObjExportScale(obj),
+		global_scale=objSettings.exportGlobalScale,
 		object_types={'CAMERA'},
-		use_custom_props=addon_prefs.exportWithCustomProps,
+		use_custom_props=settings.exportWithCustomProps,
 		add_leaf_bones=False,
-		use_armature_deform_only=obj.exportDeformOnly,
+		use_armature_deform_only=objSettings.exportDeformOnly,
 		bake_anim=True,
 		bake_anim_use_nla_strips=False,
 		bake_anim_use_all_actions=False,
 		bake_anim_force_startend_keying=True,
-		bake_anim_step=GetAnimSample(obj),
-		bake_anim_simplify_factor=obj.SimplifyAnimForExport,
-		use_metadata=addon_prefs.exportWithMetaData,
-		primary_bone_axis = obj.exportPrimaryBaneAxis,
-		secondary_bone_axis = obj.exporSecondaryBoneAxis,	
-		axis_forward = obj.exportAxisForward,
-		axis_up = obj.exportAxisUp,
+		bake_anim_step=objSettings.SampleAnimForExport,
+		bake_anim_simplify_factor=objSettings.SimplifyAnimForExport,
+		use_metadata=settings.exportWithMetaData,
+		primary_bone_axis = objSettings.exportPrimaryBaneAxis,
+		secondary_bone_axis = objSettings.exporSecondaryBoneAxis,	
+		axis_forward = objSettings.exportAxisForward,
+		axis_up = objSettings.exportAxisUp,
 		bake_space_transform = False
 		)
+	CommitStagedFile(stagedpath, fullpath)
 
 	#Reset camera scale
 	obj.delta_scale*=100
@@ -767,14 +1106,13 @@ def ExportSingleAdditionalTrackCamera(dirpath, filename, obj):
 
 	absdirpath = bpy.path.abspath(dirpath)
 	VerifiDirs(absdirpath)
-	AdditionalTrack = bfu_WriteText.WriteSingleCameraAdditionalTrack(obj)
-	return bfu_WriteText.ExportSingleText(AdditionalTrack, absdirpath, filename)
+	return bfu_WriteText.ExportSingleScript(lambda script: bfu_WriteText.WriteSingleCameraAdditionalTrack(obj, script), absdirpath, filename)
 
-def ExportSingleAdditionalParameterMesh(dirpath, filename, obj):
+def ExportSingleAdditionalParameterMesh(dirpath, filename, obj, settings = None):
 	#Export additional parameter from static and skeletal mesh track for ue4
 	#SocketsList
 
 	absdirpath = bpy.path.abspath(dirpath)
 	VerifiDirs(absdirpath)
-	AdditionalTrack = bfu_WriteText.WriteSingleMeshAdditionalParameter(obj)
+	AdditionalTrack = bfu_WriteText.WriteSingleMeshAdditionalParameter(obj, settings)
 	return bfu_WriteText.ExportSingleConfigParser(AdditionalTrack, absdirpath, filename)
@@ -0,0 +1,307 @@
+#====================== BEGIN GPL LICENSE BLOCK ============================
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.	 See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.	 If not, see <http://www.gnu.org/licenses/>.
+#  All rights reserved.
+#
+#======================= END GPL LICENSE BLOCK =============================
+
+
+import bpy
+import os
+import time
+import json
+
+import importlib
+from . import bfu_Basics
+importlib.reload(bfu_Basics)
+from .bfu_Basics import *
+
+from . import bfu_Utils
+importlib.reload(bfu_Utils)
+from .bfu_Utils import *
+
+
+journalFileName = "ExportJournal.jsonl"
+tempSceneName = "ue4-export_Temp"
+socketTempName = "_UE4Socket_TempName"
+armatureTempName = "ArmatureTemporarilyNameForUe4Export"
+
+currentJournal = None
+
+
+def GetJournalPath(scene = None):
+	#Return the path of the export journal of the scene
+
+	if scene is None:
+		scene = bpy.context.scene
+	return os.path.join(bpy.path.abspath(scene.export_other_file_path), journalFileName)
+
+
+def GetJournalExist(scene = None):
+	#Return True if a unfinished export journal exist for the scene
+
+	return os.path.isfile(GetJournalPath(scene))
+
+
+class ExportJournal():
+	#On-disk journal of an export.
+	#Each line is a json event written and flushed as soon as it happens,
+	#so after a crash the file still describes what was exported and what was modified.
+	#With a filepath None nothing is written on disk.
+
+	def __init__(self, filepath, originalScene):
+		self.filepath = filepath
+		self.originalScene = originalScene
+		self.doneAssets = {} #AssetKey: [Exported asset data]
+		self.pendingMutations = {} #MutationId: Mutation event
+		self.nextMutationId = 0
+		self.currentAssetKey = None
+		self.currentAssetIndex = 0
+
+	def Load(self):
+		#Read the journal of a previous export. A truncated last line is ignored.
+
+		self.doneAssets = {}
+		self.pendingMutations = {}
+		if self.filepath is None or not os.path.isfile(self.filepath):
+			return False
+		with open(self.filepath, "r") as file:
+			for line in file:
+				try:
+					event = json.loads(line)
+				except ValueError:
+					continue
+				if event["event"] == "done":
+					self.doneAssets[event["key"]] = event["assets"]
+				elif event["event"] == "mutation_begin":
+					self.pendingMutations[event["id"]] = event
+					self.nextMutationId = max(self.nextMutationId, event["id"]+1)
+				elif event["event"] == "mutation_end":
+					self.pendingMutations.pop(event["id"], None)
+		return True
+
+	def Write(self, event):
+		#Append an event and force it to the disk
+
+		if self.filepath is None:
+			return
+		with open(self.filepath, "a") as file:
+			file.write(json.dumps(event)+"\n")
+			file.flush()
+			os.fsync(file.fileno())
+
+	def Begin(self, resume = False):
+		#Start a new journal. When resuming the done assets are kept and
+		#the mutations already cleaned are dropped.
+
+		if self.filepath is None:
+			return
+		VerifiDirs(os.path.dirname(self.filepath))
+		events = [{"event": "begin", "time": time.time(), "blend": bpy.data.filepath, "resume": resume}]
+		if resume:
+			for key, assets in self.doneAssets.items():
+				events.append({"event": "done", "key": key, "assets": assets})
+		else:
+			self.doneAssets = {}
+		self.pendingMutations = {}
+		text = "".join(json.dumps(event)+"\n" for event in events)
+		WriteTextFileIfChanged(text, self.filepath)
+
+	def WritePlan(self, plan):
+		#Record the export plan, the done events are keyed by the ids of his assets
+
+		self.Write({"event": "plan", "assets": [asset.ToDict() for asset in plan]})
+
+	def End(self):
+		#The export is complete, the journal is no longer needed
+
+		if self.filepath is not None and os.path.isfile(self.filepath):
+			os.remove(self.filepath)
+
+	def StartAsset(self, key):
+		#Return False if the asset was already exported by a previous run.
+		#In this case his exported assets are added back to the list.
+
+		if key in self.doneAssets:
+			for assetData in self.doneAssets[key]:
+				MyAsset = self.originalScene.UnrealExportedAssetsList.add()
+				MyAsset.assetName = assetData["assetName"]
+				MyAsset.assetType = assetData["assetType"]
+				MyAsset.exportPath = assetData["exportPath"]
+				MyAsset.exportTime = assetData["exportTime"]
+				MyAsset.lodLevel = assetData.get("lodLevel", 0)
+				MyAsset.aliasOf = assetData.get("aliasOf", "")
+				MyAsset.animKeys = assetData.get("animKeys", 0)
+				MyAsset.animRawKeys = assetData.get("animRawKeys", 0)
+				MyAsset.animTakes = assetData.get("animTakes", "")
+				if assetData["object"] in bpy.data.objects:
+					MyAsset.object = bpy.data.objects[assetData["object"]]
+			print("Skip "+key+" (already exported)")
+			return False
+		self.currentAssetKey = key
+		self.currentAssetIndex = len(self.originalScene.UnrealExportedAssetsList)
+		return True
+
+	def EndAsset(self):
+		#Record the assets exported since StartAsset()
+
+		assets = []
+		for MyAsset in self.originalScene.UnrealExportedAssetsList[self.currentAssetIndex:]:
+			assets.append({
+				"assetName": MyAsset.assetName,
+				"assetType": MyAsset.assetType,
+				"exportPath": MyAsset.exportPath,
+				"exportTime": MyAsset.exportTime,
+				"lodLevel": MyAsset.lodLevel,
+				"aliasOf": MyAsset.aliasOf,
+				"animKeys": MyAsset.animKeys,
+				"animRawKeys": MyAsset.animRawKeys,
+				"animTakes": MyAsset.animTakes,
+				"object": MyAsset.object.name if MyAsset.object is not None else "",
+				})
+		self.doneAssets[self.currentAssetKey] = assets
+		self.Write({"event": "done", "key": self.currentAssetKey, "assets": assets})
+		self.currentAssetKey = None
+
+	def MutationBegin(self, kind, data):
+		#Record a scene modification that must be reverted
+
+		mutationId = self.nextMutationId
+		self.nextMutationId += 1
+		event = {"event": "mutation_begin", "id": mutationId, "kind": kind, "data": data}
+		self.pendingMutations[mutationId] = event
+		self.Write(event)
+		return mutationId
+
+	def MutationEnd(self, mutationId):
+		#The scene modification was reverted
+
+		if mutationId in self.pendingMutations:
+			del self.pendingMutations[mutationId]
+			self.Write({"event": "mutation_end", "id": mutationId})
+
+
+def SetCurrentJournal(journal):
+	global currentJournal
+	currentJournal = journal
+
+
+def JournalMutationBegin(kind, data):
+	#Record a scene modification in the current journal if an export is running
+
+	if currentJournal is not None:
+		return currentJournal.MutationBegin(kind, data)
+	return None
+
+
+def JournalMutationEnd(mutationId):
+	if currentJournal is not None and mutationId is not None:
+		currentJournal.MutationEnd(mutationId)
+
+
+def CleanExportLeftovers(journal = None):
+	#Revert the scene modifications of an interrupted export.
+	#The pending mutations of the journal are reverted in reverse order,
+	#then the file is scanned for the leftovers who are not in the journal.
+
+	mutations = []
+	if journal is not None:
+		mutations = sorted(journal.pendingMutations.values(), key=lambda event: event["id"], reverse=True)
+
+	def RemoveTempScene(name, userSceneName = None):
+		if name not in bpy.data.scenes:
+			return
+		tempScene = bpy.data.scenes[name]
+		if bpy.context.scene == tempScene:
+			if userSceneName is not None and userSceneName in bpy.data.scenes:
+				SetActiveScene(bpy.data.scenes[userSceneName])
+			else:
+				for scene in bpy.data.scenes:
+					if scene != tempScene:
+						SetActiveScene(scene)
+						break
+		#Duplicated objects only used by the temp scene
+		tempObjects = [obj for obj in tempScene.objects if len(obj.users_scene) == 1]
+		bpy.data.scenes.remove(tempScene)
+		for obj in tempObjects:
+			bpy.data.objects.remove(obj)
+
+	for mutation in mutations:
+		kind = mutation["kind"]
+		data = mutation["data"]
+		if kind == "temp_scene":
+			RemoveTempScene(data["name"], data["scene"])
+
+		elif kind == "action_rescale":
+			#The location curves of all the actions are still scaled for the export
+			RescaleAllActionCurve(1/data["factor"])
+
+		elif kind == "unit_scale":
+			if data["scene"] in bpy.data.scenes:
+				bpy.data.scenes[data["scene"]].unit_settings.scale_length = data["value"]
+
+		elif kind == "armature_name":
+			#The duplicate take back his name before the original armature, else the original become exportName.001
+			duplicateName = data.get("duplicate")
+			if duplicateName is not None and duplicateName not in bpy.data.objects and data["exportName"] in bpy.data.objects:
+				bpy.data.objects[data["exportName"]].name = duplicateName
+			if armatureTempName in bpy.data.objects:
+				bpy.data.objects[armatureTempName].name = data["exportName"]
+
+		elif kind == "duplicates":
+			#The duplicates are linked in the collections of the user scene too, the temp scene does not remove them
+			for name in data["objects"]:
+				for duplicateName in (name, name+"_UEProxyChild"):
+					if duplicateName in bpy.data.objects:
+						bpy.data.objects.remove(bpy.data.objects[duplicateName])
+
+		elif kind == "socket_temp_name":
+			for name in data["sockets"]:
+				if name+socketTempName in bpy.data.objects:
+					bpy.data.objects[name+socketTempName].name = name
+
+		elif kind == "hide_state":
+			for name, hideSelect, hideViewport in data["objects"]:
+				if name in bpy.data.objects:
+					bpy.data.objects[name].hide_select = hideSelect
+					bpy.data.objects[name].hide_viewport = hideViewport
+
+		elif kind == "multi_take_actions":
+			ResetMultiTakeActions(data)
+
+		elif kind == "actions":
+			baseActionName = set(data["base"])
+			for action in list(bpy.data.actions):
+				if action.name not in baseActionName and action.users == 0:
+					bpy.data.actions.remove(action)
+
+	#Leftovers without journal
+	RemoveTempScene(tempSceneName)
+	for obj in list(bpy.data.objects):
+		if obj.name.endswith(socketTempName):
+			obj.name = obj.name[:-len(socketTempName)]
+	for action in bpy.data.actions:
+		if action.library is None:
+			RemoveMultiTakeExcludedCurve(action)
+
+	#Staged files of the exporters that raised
+	scene = bpy.context.scene
+	for folder in set([
+		scene.export_static_file_path,
+		scene.export_skeletal_file_path,
+		scene.export_alembic_file_path,
+		scene.export_camera_file_path,
+		scene.export_other_file_path,
+		]):
+		RemoveStagedFiles(bpy.path.abspath(folder))
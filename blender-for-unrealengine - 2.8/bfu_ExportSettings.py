@@ -0,0 +1,259 @@
+#====================== BEGIN GPL LICENSE BLOCK ============================
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.	 See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.	 If not, see <http://www.gnu.org/licenses/>.
+#  All rights reserved.
+#
+#======================= END GPL LICENSE BLOCK =============================
+
+
+import bpy
+import types
+
+import importlib
+from . import bfu_Utils
+importlib.reload(bfu_Utils)
+from .bfu_Utils import *
+
+
+class ReadOnlySettings():
+	#Base of the settings snapshots. The values are set once in the constructor
+	#and can be pickled or converted to a dict to be sent to another process.
+
+	__slots__ = ()
+
+	def __init__(self, values):
+		for name in self.__slots__:
+			object.__setattr__(self, name, values[name])
+
+	def __setattr__(self, name, value):
+		raise AttributeError(type(self).__name__+" is read only")
+
+	def __delattr__(self, name):
+		raise AttributeError(type(self).__name__+" is read only")
+
+	def __getstate__(self):
+		return self.ToDict()
+
+	def __setstate__(self, state):
+		for name in self.__slots__:
+			object.__setattr__(self, name, state[name])
+
+	def __repr__(self):
+		return type(self).__name__+"("+str(self.ToDict())+")"
+
+	def ToDict(self):
+		return {name: getattr(self, name) for name in self.__slots__}
+
+	@classmethod
+	def FromDict(cls, data):
+		return cls(data)
+
+
+class ObjectExportSettings(ReadOnlySettings):
+	#Export properties of a single object
+
+	propertyNames = (
+		"ExportEnum",
+		"ExportAsAlembic",
+		"ExportAsLod",
+		"AutoGenerateLod",
+		"AutoLodCount",
+		"AutoLodRatios",
+		"ForceStaticMesh",
+		"ExportAsProxy",
+		"exportFolderName",
+		"exportDeformOnly",
+		"exportActionEnum",
+		"ExportActionsAsTakes",
+		"AnimStartEndTimeEnum",
+		"StartFramesOffset",
+		"EndFramesOffset",
+		"AnimCustomStartTime",
+		"AnimCustomEndTime",
+		"SampleAnimForExport",
+		"SimplifyAnimForExport",
+		"StripConstantAnimChannels",
+		"ExportNLA",
+		"NLAAnimName",
+		"exportGlobalScale",
+		"exportAxisForward",
+		"exportAxisUp",
+		"exportPrimaryBaneAxis",
+		"exporSecondaryBoneAxis",
+		)
+
+	__slots__ = ("name", "assetType") + propertyNames
+
+	@classmethod
+	def FromObject(cls, obj):
+		values = {name: getattr(obj, name) for name in cls.propertyNames}
+		values["AutoLodRatios"] = tuple(obj.AutoLodRatios)
+		values["name"] = obj.name
+		values["assetType"] = GetAssetType(obj)
+		return cls(values)
+
+	def GetAutoLodRatios(self):
+		#Return the ratio of each level of detail to generate at the export
+		if self.AutoGenerateLod == False or self.ExportAsLod == True:
+			return []
+		if self.assetType != "StaticMesh" and self.assetType != "SkeletalMesh":
+			return []
+		return list(self.AutoLodRatios[:self.AutoLodCount])
+
+
+class ExportSettings(ReadOnlySettings):
+	#Snapshot of the addon preferences, the scene export settings and the
+	#resolved settings of the objects. It is built once at the export start
+	#and passed through the export functions.
+
+	prefsNames = (
+		"bakeArmatureAction",
+		"useFastArmatureBake",
+		"correctExtremUVScale",
+		"removeSkeletonRootBone",
+		"skeletonRootBoneName",
+		"rescaleFullRigAtExport",
+		"newRigScale",
+		"staticSocketsAdd90X",
+		"rescaleSocketsAtExport",
+		"staticSocketsImportedSize",
+		"skeletalSocketsImportedSize",
+		"ignoreNLAForAction",
+		"exportWithCustomProps",
+		"exportWithMetaData",
+		"revertExportPath",
+		"useGeneratedScripts",
+		"use20TabScript",
+		"useBudgetCheck",
+		"budgetStaticMeshTriangles",
+		"budgetSkeletalMeshTriangles",
+		"budgetMaterials",
+		"budgetUVChannels",
+		"budgetBoneInfluences",
+		"budgetBones",
+		)
+
+	sceneNames = (
+		"static_export",
+		"static_collection_export",
+		"static_collection_export_mode",
+		"static_mesh_deduplication",
+		"skeletal_export",
+		"anin_export",
+		"alembic_export",
+		"camera_export",
+		"text_ExportLog",
+		"text_ImportAssetScript",
+		"text_ImportSequenceScript",
+		"text_AdditionalData",
+		"text_AdditionalDataAsManifest",
+		"export_static_file_path",
+		"export_skeletal_file_path",
+		"export_alembic_file_path",
+		"export_camera_file_path",
+		"export_other_file_path",
+		"anim_subfolder_name",
+		"skeletal_prefix_export_name",
+		"unreal_import_location",
+		)
+
+	resolvedNames = (
+		"sceneName",
+		"unitScaleLength",
+		"shouldRescaleRig",
+		"rescaleRigFactor",
+		"shouldRescaleSocket",
+		"rescaleSocketFactor",
+		"exportArmatureName",
+		"useAdditionalDataManifest",
+		"objects",
+		)
+
+	__slots__ = prefsNames + sceneNames + resolvedNames
+
+	@classmethod
+	def FromScene(cls, scene = None, withObjects = True):
+		#Build the snapshot of the scene
+		#Without withObjects the objects are not captured, GetObject() read them when they are asked
+
+		if scene is None:
+			scene = bpy.context.scene
+		addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
+
+		values = {name: getattr(addon_prefs, name) for name in cls.prefsNames}
+		values.update({name: getattr(scene, name) for name in cls.sceneNames})
+		values["sceneName"] = scene.name
+		values["unitScaleLength"] = scene.unit_settings.scale_length
+
+		#The rescale is resolved with the user unit scale, before the export change it
+		if addon_prefs.rescaleFullRigAtExport == "auto":
+			values["shouldRescaleRig"] = scene.unit_settings.scale_length != 0.01
+			values["rescaleRigFactor"] = 100 * scene.unit_settings.scale_length
+		else:
+			values["shouldRescaleRig"] = addon_prefs.rescaleFullRigAtExport == "custom_rescale"
+			values["rescaleRigFactor"] = addon_prefs.newRigScale
+
+		if addon_prefs.rescaleSocketsAtExport == "auto":
+			values["shouldRescaleSocket"] = scene.unit_settings.scale_length != 0.01
+			values["rescaleSocketFactor"] = 1/(100*scene.unit_settings.scale_length)
+		else:
+			values["shouldRescaleSocket"] = addon_prefs.rescaleSocketsAtExport == "custom_rescale"
+			values["rescaleSocketFactor"] = addon_prefs.staticSocketsImportedSize
+
+		if addon_prefs.removeSkeletonRootBone == True:
+			values["exportArmatureName"] = "Armature"
+		else:
+			values["exportArmatureName"] = addon_prefs.skeletonRootBoneName
+
+		#The manifest is only written with the additional data and the generated scripts
+		values["useAdditionalDataManifest"] = (scene.text_AdditionalData == True and
+			scene.text_AdditionalDataAsManifest == True and addon_prefs.useGeneratedScripts == True)
+
+		if withObjects == True:
+			values["objects"] = types.MappingProxyType({obj.name: ObjectExportSettings.FromObject(obj) for obj in scene.objects})
+		else:
+			values["objects"] = types.MappingProxyType({})
+		return cls(values)
+
+	def ToDict(self):
+		data = ReadOnlySettings.ToDict(self)
+		data["objects"] = {name: objSettings.ToDict() for name, objSettings in self.objects.items()}
+		return data
+
+	def __setstate__(self, state):
+		ReadOnlySettings.__setstate__(self, state)
+		object.__setattr__(self, "objects", types.MappingProxyType({name: ObjectExportSettings.FromDict(data) for name, data in state["objects"].items()}))
+
+	@classmethod
+	def FromDict(cls, data):
+		data = dict(data)
+		data["objects"] = types.MappingProxyType({name: ObjectExportSettings.FromDict(objData) for name, objData in data["objects"].items()})
+		return cls(data)
+
+	def GetObject(self, obj):
+		#Return the settings of a object. Objects created after the snapshot
+		#(temporary objects of the export) are read directly.
+
+		if obj.name in self.objects:
+			return self.objects[obj.name]
+		return ObjectExportSettings.FromObject(obj)
+
+
+def GetExportSettings(settings = None):
+	#Return the given settings or a new snapshot of the current scene.
+	#The new snapshot does not capture the objects, a standalone call stay O(1)
+
+	if settings is None:
+		return ExportSettings.FromScene(withObjects = False)
+	return settings
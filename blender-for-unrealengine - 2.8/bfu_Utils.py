@@ -20,6 +20,11 @@
 import bpy
 import fnmatch
 import mathutils
+import enum
+import json
+import hashlib
+import struct
+import numpy
 
 import importlib
 from . import bfu_Basics
@@ -62,7 +67,7 @@ def GetExportDesiredChilds(obj):
 	DesiredObj = []
 	for child in GetRecursiveChilds(obj):
 		if child.ExportEnum != "dont_export":
-			if child.name in bpy.context.window.view_layer.objects:
+			if child.name in bpy.context.view_layer.objects:
 				DesiredObj.append(child)
 		
 			
@@ -85,16 +90,77 @@ def RescaleStretchLengthConsraints(obj, scale):
 			if c.type == "STRETCH_TO":
 				c.rest_length *= scale #Can be bigger than 10?... wtf
 
-def GetAllCollisionObj():
-	#Get any object that can be understood as a collision or a socket by unreal
+def GetIsCollisionObj(obj):
+	#Return True if the object can be understood as a collision by unreal
 
-	colObjs = [obj for obj in bpy.context.scene.objects if
-		fnmatch.fnmatchcase(obj.name, "UBX*") or
+	return (fnmatch.fnmatchcase(obj.name, "UBX*") or
 		fnmatch.fnmatchcase(obj.name, "UCP*") or
 		fnmatch.fnmatchcase(obj.name, "USP*") or
-		fnmatch.fnmatchcase(obj.name, "UCX*")]
+		fnmatch.fnmatchcase(obj.name, "UCX*"))
+
+def GetAllCollisionObj():
+	#Get any object that can be understood as a collision or a socket by unreal
+
+	colObjs = [obj for obj in bpy.context.scene.objects if GetIsCollisionObj(obj)]
 	return colObjs
 
+def GetCollectionArray(collection, attribute, itemSize = 1, dtype = numpy.float32):
+	#Read a attribute of all items of a bpy collection in a numpy array
+	values = numpy.empty(len(collection)*itemSize, dtype=dtype)
+	collection.foreach_get(attribute, values)
+	return values
+
+def GetCollectionFloatArray(collection, attribute, itemSize = 1):
+	return GetCollectionArray(collection, attribute, itemSize, numpy.float32)
+
+def SyncNamedItemList(itemList, names):
+	#Update a CollectionProperty of named items to contain the names in the same order.
+	#The items already in the list are kept with their values, only the
+	#missing ones are added and the unknown ones removed.
+
+	nameSet = set(names)
+	for index in range(len(itemList)-1, -1, -1): #Remove from the end to keep the indexes
+		if itemList[index].name not in nameSet:
+			itemList.remove(index)
+
+	knownNames = set(item.name for item in itemList)
+	for name in names:
+		if name not in knownNames:
+			itemList.add().name = name
+			knownNames.add(name)
+
+	for targetIndex, name in enumerate(names):
+		if itemList[targetIndex].name != name:
+			itemList.move(itemList.find(name), targetIndex)
+
+def GetSortedTimelineMarkers(scene):
+	#Return the timeline markers sorted by frame (in timeline order for a same frame)
+	#and the markers that use the same frame as the previous one
+	sortedMarkers = sorted(scene.timeline_markers, key=lambda marker: marker.frame)
+	overlappedMarkers = []
+	for x in range(1, len(sortedMarkers)):
+		if sortedMarkers[x].frame == sortedMarkers[x-1].frame:
+			overlappedMarkers.append(sortedMarkers[x])
+	return (sortedMarkers, overlappedMarkers)
+
+def GetMarkerSceneSections(scene):
+	#Return the camera cut sections [StartFrame, EndFrame, Camera] from the timeline markers
+
+	#If the scene don't use marker
+	if len(scene.timeline_markers) < 1:
+		return ([[scene.frame_start, scene.frame_end+1, scene.camera]])
+
+	markersOrderly = [marker for marker in GetSortedTimelineMarkers(scene)[0] if marker.frame < scene.frame_end+1]
+	sectionCuts = []
+	for x in range(len(markersOrderly)):
+		startTime = markersOrderly[x].frame
+		if x+1 != len(markersOrderly):
+			EndTime = markersOrderly[x+1].frame
+		else:
+			EndTime = scene.frame_end+1
+		sectionCuts.append([startTime, EndTime, markersOrderly[x].camera])
+	return sectionCuts
+
 def GetCollectionToExport(scene):
 	colExport = []
 	for col in scene.CollectionExportList:
@@ -118,11 +184,10 @@ def GetActionToExport(obj):
 				return [obj.animation_data.action]
 	
 	elif obj.exportActionEnum == "export_specific_list":
+		useActionNames = set(targetAction.name for targetAction in obj.exportActionList if targetAction.use == True)
 		for action in bpy.data.actions:
-			for targetAction in obj.exportActionList:
-				if targetAction.use == True:
-					if targetAction.name == action.name:
-						TargetActionToExport.append(action)
+			if action.name in useActionNames:
+				TargetActionToExport.append(action)
 
 	elif obj.exportActionEnum == "export_specific_prefix":
 		for action in bpy.data.actions:
@@ -132,14 +197,66 @@ def GetActionToExport(obj):
 
 	elif obj.exportActionEnum == "export_auto":
 		#This will cheak if the action contains the same bones of the armature
-		objBoneNames = [bone.name for bone in obj.data.bones]
-		for action in bpy.data.actions:
-			actionBoneNames = [group.name for group in action.groups]
-			if ChecksRelationship(actionBoneNames, objBoneNames):
-				TargetActionToExport.append(action)
+		TargetActionToExport = GetActionsByGroupNames([bone.name for bone in obj.data.bones])
 
 	return TargetActionToExport
 
+actionGroupIndexCache = [] #[ActionGroupIndex] when built
+
+class ActionGroupIndex():
+	#Group names of all actions and the reverse index group name -> action names
+
+	__slots__ = (
+		"actionNames",
+		"actionGroups",
+		"actionsByGroup",
+		)
+
+	def __init__(self):
+		self.actionNames = []
+		self.actionGroups = {} #ActionName: frozenset(GroupNames)
+		self.actionsByGroup = {} #GroupName: set(ActionNames)
+		for action in bpy.data.actions:
+			groupNames = frozenset(group.name for group in action.groups)
+			self.actionNames.append(action.name)
+			self.actionGroups[action.name] = groupNames
+			for groupName in groupNames:
+				self.actionsByGroup.setdefault(groupName, set()).add(action.name)
+
+	def GetActionsWithGroups(self, groupNames):
+		#Return the actions that have at least one of the groups, in the bpy.data.actions order
+		#Return None if one of them was renamed or removed since the index was built
+		actionNames = set()
+		for groupName in groupNames:
+			if groupName in self.actionsByGroup:
+				actionNames.update(self.actionsByGroup[groupName])
+		actions = [bpy.data.actions.get(name) for name in self.actionNames if name in actionNames]
+		if None in actions:
+			return None
+		return actions
+
+def GetActionGroupIndex():
+	#Return the ActionGroupIndex, built again if the number of actions changed
+	#The cache is also cleared by the depsgraph handler of bfu_CheckPotentialError
+	#and at the start of each export (the group changes of unused actions are not in the depsgraph updates)
+
+	if len(actionGroupIndexCache) > 0:
+		if len(actionGroupIndexCache[0].actionNames) == len(bpy.data.actions):
+			return actionGroupIndexCache[0]
+	actionGroupIndexCache[:] = [ActionGroupIndex()]
+	return actionGroupIndexCache[0]
+
+def GetActionsByGroupNames(groupNames):
+	#Return the actions that have a group with one of the names
+	actions = GetActionGroupIndex().GetActionsWithGroups(groupNames)
+	if actions is None:
+		ClearActionGroupIndex()
+		actions = GetActionGroupIndex().GetActionsWithGroups(groupNames)
+	return actions
+
+def ClearActionGroupIndex():
+	actionGroupIndexCache.clear()
+
 def GetDesiredActionStartEndTime(obj, action):
 	#Returns desired action or camera anim start/end time
 	#Return start with index 0 and end with index 1
@@ -176,7 +293,7 @@ def GetActionType(action):
 
 def GetIsAnimation(type):
 	#return True if type(string) is a animation
-	if (type == "NlAnim" or type == "Action" or type == "Pose"):
+	if (type == "NlAnim" or type == "Action" or type == "Pose" or type == "MultiTakeAnim"):
 		return True
 	return False
 
@@ -335,9 +452,9 @@ def CorrectExtremeUV(stepScale = 2):
 			obj.data.update()
 	
 
-def ApplyExportTransform(obj):
+def GetExportMatrix(obj):
+	#Return the world matrix of obj at the export
 	newMatrix = obj.matrix_world @ mathutils.Matrix.Translation((0,0,0))
-	saveScale = obj.scale * 1
 
 	#Ref
 	if obj.MoveToCenterForExport == True: #Moves object to the center of the scene for export	
@@ -358,8 +475,11 @@ def ApplyExportTransform(obj):
 	mat_rot = eul.to_matrix()
 	mat_loc = mathutils.Matrix.Translation(loc)
 	AddMat = mat_loc @ mat_rot.to_4x4()
-	
-	obj.matrix_world = newMatrix @ AddMat
+	return newMatrix @ AddMat
+
+def ApplyExportTransform(obj):
+	saveScale = obj.scale * 1
+	obj.matrix_world = GetExportMatrix(obj)
 	obj.scale = saveScale
 	
 	
@@ -428,8 +548,93 @@ def RescaleAllActionCurve(scale):
 					key.handle_left[1] *=scale
 					key.handle_right[1] *=scale
 
+class AssetType(enum.Enum):
+	#Type of the assets to export. The values are the names used in the log and the import scripts.
+
+	COLLECTION_STATICMESH = "Collection StaticMesh"
+	STATICMESH = "StaticMesh"
+	SKELETALMESH = "SkeletalMesh"
+	ALEMBIC = "Alembic"
+	NLANIM = "NlAnim"
+	ACTION = "Action"
+	POSE = "Pose"
+	MULTITAKE = "MultiTakeAnim"
+	CAMERA = "Camera"
+
+
+class AssetToExport():
+	#Record of the export plan. It only hold names and resolved values so it can
+	#be compared between two exports, saved in json and sent to another process.
+
+	__slots__ = (
+		"id",
+		"type",
+		"objectName",
+		"actionName",
+		"collectionName",
+		"exportDir",
+		"fileName",
+		"frameRange",
+		"aliasOf",
+		"animTakes",
+		)
+
+	def __init__(self, type, objectName = None, actionName = None, collectionName = None, exportDir = "", fileName = "", frameRange = None, aliasOf = None, animTakes = None):
+		self.type = type
+		self.objectName = objectName
+		self.actionName = actionName
+		self.collectionName = collectionName
+		self.exportDir = exportDir
+		self.fileName = fileName
+		self.frameRange = frameRange
+		self.aliasOf = aliasOf #Name of the object of the identical asset exported in place of this one
+		self.animTakes = animTakes #Names of the actions exported as takes of a MultiTakeAnim
+		self.id = GetAssetToExportId(type, objectName, actionName, collectionName)
+
+	@property
+	def obj(self):
+		#Return the live object or None
+		if self.objectName is None:
+			return None
+		return bpy.data.objects.get(self.objectName)
+
+	@property
+	def action(self):
+		#Return the live action or None
+		if self.actionName is None:
+			return None
+		return bpy.data.actions.get(self.actionName)
+
+	def ToDict(self):
+		data = {name: getattr(self, name) for name in self.__slots__}
+		data["type"] = self.type.value
+		return data
+
+	@classmethod
+	def FromDict(cls, data):
+		frameRange = tuple(data["frameRange"]) if data["frameRange"] is not None else None
+		animTakes = tuple(data["animTakes"]) if data.get("animTakes") is not None else None
+		return cls(AssetType(data["type"]), data["objectName"], data["actionName"], data["collectionName"], data["exportDir"], data["fileName"], frameRange, data.get("aliasOf"), animTakes)
+
+
+def GetAssetToExportId(type, objectName, actionName, collectionName):
+	#Stable id of a asset, the same asset have the same id between two exports
+
+	key = "|".join([type.value, str(objectName), str(actionName), str(collectionName)])
+	return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def GetExportPlanJson(plan):
+	#Return the export plan as json text
+	return json.dumps([asset.ToDict() for asset in plan], indent=1)
+
+
+def GetExportPlanFromJson(text):
+	return [AssetToExport.FromDict(data) for data in json.loads(text)]
+
+
 def GetFinalAssetToExport():
-	#Returns all assets that will be exported
+	#Returns all assets that will be exported (list of AssetToExport)
 	
 	def getHaveParentToExport(obj):
 		if obj.parent is not None:
@@ -441,26 +646,24 @@ def GetFinalAssetToExport():
 			return None
 
 	scene = bpy.context.scene
-	TargetAssetToExport = [] #Obj, Action, type
-	class AssetToExport:
-		def __init__(self, obj, action, type):
-			self.obj = obj
-			self.action = action
-			self.type = type
+	TargetAssetToExport = [] #AssetToExport
 
 	if scene.export_ExportOnlySelected == True:
 		objList = []
+		objSet = set()
 		collectionList = []
-		recuList = GetAllobjectsByExportType("export_recursive")
+		recuList = set(GetAllobjectsByExportType("export_recursive"))
 		
 		for obj in bpy.context.selected_objects:
 			if obj in recuList:
-				if obj not in objList:
+				if obj not in objSet:
 					objList.append(obj)
+					objSet.add(obj)
 			parentTarget = getHaveParentToExport(obj)
 			if parentTarget is not None:
-				if parentTarget not in objList:
+				if parentTarget not in objSet:
 					objList.append(parentTarget)
+					objSet.add(parentTarget)
 		
 
 	else:
@@ -470,49 +673,250 @@ def GetFinalAssetToExport():
 	for collection in collectionList:
 		#Collection
 		if scene.static_collection_export:
-			TargetAssetToExport.append(AssetToExport(collection,None,"Collection StaticMesh"))
+			if scene.static_collection_export_mode == "layout":
+				fileName = GetCollectionLayoutFileName(collection)
+			else:
+				fileName = GetCollectionExportFileName(collection)
+			TargetAssetToExport.append(AssetToExport(AssetType.COLLECTION_STATICMESH, collectionName=collection,
+				exportDir=GetCollectionExportDir(), fileName=fileName))
 			
 		
 	for obj in objList:
+		assetType = GetAssetType(obj)
 
-		if GetAssetType(obj) == "Alembic":
+		if assetType == "Alembic":
 			#Alembic
 			if scene.alembic_export:
-				TargetAssetToExport.append(AssetToExport(obj,None,"Alembic"))
+				TargetAssetToExport.append(AssetToExport(AssetType.ALEMBIC, obj.name,
+					exportDir=GetObjExportDir(obj), fileName=GetObjExportFileName(obj, ".abc"),
+					frameRange=(scene.frame_start+obj.StartFramesOffset, scene.frame_end+obj.EndFramesOffset)))
 
-		if GetAssetType(obj) == "SkeletalMesh":
+		if assetType == "SkeletalMesh":
+			exportDir = GetObjExportDir(obj)
+			animExportDir = os.path.join(exportDir, scene.anim_subfolder_name)
 			
 			#SkeletalMesh
 			if scene.skeletal_export:
-				TargetAssetToExport.append(AssetToExport(obj,None,"SkeletalMesh"))
+				TargetAssetToExport.append(AssetToExport(AssetType.SKELETALMESH, obj.name,
+					exportDir=exportDir, fileName=GetObjExportFileName(obj)))
 
 			#NLA
 			if scene.anin_export:
 				if obj.ExportNLA:
-					TargetAssetToExport.append(AssetToExport(obj,obj.animation_data,"NlAnim"))
+					TargetAssetToExport.append(AssetToExport(AssetType.NLANIM, obj.name,
+						exportDir=animExportDir, fileName=GetNLAExportFileName(obj),
+						frameRange=(scene.frame_start+obj.StartFramesOffset, scene.frame_end+1+obj.EndFramesOffset)))
 			
 			
+			#Actions as takes of one FBX
+			if scene.anin_export and obj.ExportActionsAsTakes:
+				animTakes = tuple(action.name for action in GetActionToExport(obj))
+				if len(animTakes) > 0:
+					TargetAssetToExport.append(AssetToExport(AssetType.MULTITAKE, obj.name,
+						exportDir=animExportDir, fileName=GetMultiTakeExportFileName(obj),
+						animTakes=animTakes))
+
 			for action in GetActionToExport(obj):
-				#Action
-				if scene.anin_export:
-					if GetActionType(action) == "Action":
-						TargetAssetToExport.append(AssetToExport(obj,action,"Action"))
-
-				#Pose
-				if scene.anin_export:
-					if GetActionType(action) == "Pose":
-						TargetAssetToExport.append(AssetToExport(obj,action,"Pose"))
+				#Action and Pose
+				if scene.anin_export and not obj.ExportActionsAsTakes:
+					actionType = AssetType(GetActionType(action))
+					frameRange = GetDesiredActionStartEndTime(obj, action)
+					TargetAssetToExport.append(AssetToExport(actionType, obj.name, action.name,
+						exportDir=animExportDir, fileName=GetActionExportFileName(obj, action),
+						frameRange=tuple(frameRange) if frameRange is not None else None))
+
 		#Camera
-		if GetAssetType(obj) == "Camera" and scene.camera_export:
-			TargetAssetToExport.append(AssetToExport(obj,None,"Camera"))
+		if assetType == "Camera" and scene.camera_export:
+			frameRange = (scene.frame_start, scene.frame_end)
+			if obj.animation_data is not None:
+				frameRange = GetDesiredActionStartEndTime(obj, obj.animation_data.action)
+			TargetAssetToExport.append(AssetToExport(AssetType.CAMERA, obj.name,
+				exportDir=GetObjExportDir(obj), fileName=GetObjExportFileName(obj),
+				frameRange=tuple(frameRange)))
 
 		#StaticMesh
-		if GetAssetType(obj) == "StaticMesh" and scene.static_export:
-				TargetAssetToExport.append(AssetToExport(obj,None,"StaticMesh"))
+		if assetType == "StaticMesh" and scene.static_export:
+				TargetAssetToExport.append(AssetToExport(AssetType.STATICMESH, obj.name,
+					exportDir=GetObjExportDir(obj), fileName=GetObjExportFileName(obj)))
 
 	return TargetAssetToExport
 
 
+#Import options of the StaticMesh that must be identical to share the same asset
+staticMeshImportPropertyNames = (
+	"AutoGenerateCollision",
+	"CollisionTraceFlag",
+	"GenerateLightmapUVs",
+	"MaterialSearchLocation",
+	"UseStaticMeshLODGroup",
+	"StaticMeshLODGroup",
+	"UseStaticMeshLightMapRes",
+	"StaticMeshLightMapRes",
+	"VertexColorImportOption",
+	)
+
+def GetMeshContentHash(obj, depsgraph):
+	#Hash of the evaluated mesh of obj: geometry, normals, UVs and vertex colors
+
+	objEval = obj.evaluated_get(depsgraph)
+	mesh = objEval.to_mesh()
+	try:
+		hasher = hashlib.sha1()
+		hasher.update(GetCollectionFloatArray(mesh.vertices, "co", 3).tobytes())
+		hasher.update(GetCollectionArray(mesh.loops, "vertex_index", 1, numpy.int32).tobytes())
+		hasher.update(GetCollectionArray(mesh.polygons, "loop_total", 1, numpy.int32).tobytes())
+		hasher.update(GetCollectionArray(mesh.polygons, "material_index", 1, numpy.int32).tobytes())
+		hasher.update(GetCollectionArray(mesh.polygons, "use_smooth", 1, bool).tobytes())
+		hasher.update(GetCollectionArray(mesh.edges, "use_edge_sharp", 1, bool).tobytes())
+		if mesh.has_custom_normals:
+			mesh.calc_normals_split()
+			hasher.update(GetCollectionFloatArray(mesh.loops, "normal", 3).tobytes())
+		for uvLayer in mesh.uv_layers:
+			hasher.update(uvLayer.name.encode("utf-8"))
+			hasher.update(GetCollectionFloatArray(uvLayer.data, "uv", 2).tobytes())
+		for colorLayer in mesh.vertex_colors:
+			hasher.update(colorLayer.name.encode("utf-8"))
+			hasher.update(GetCollectionFloatArray(colorLayer.data, "color", 4).tobytes())
+		return hasher.hexdigest()
+	finally:
+		objEval.to_mesh_clear()
+
+def GetStaticMeshDeduplicationKey(obj, mode, settings, depsgraph, contentHashes):
+	#Return a key that is the same for two StaticMesh that give the same exported file
+	#or None if obj can not share his asset. mode is "data" (same mesh datablock)
+	#or "geometry" (same mesh content). contentHashes cache the hash of each mesh datablock.
+
+	def GetRoundedMatrix(matrix):
+		return tuple(round(value, 5) for row in matrix for value in row)
+
+	def GetContentKey(meshObj):
+		if meshObj.type != "MESH":
+			return meshObj.type
+		materials = tuple(slot.material.name if slot.material is not None else "" for slot in meshObj.material_slots)
+		shareData = len(meshObj.modifiers) == 0
+		if mode == "data":
+			if shareData == False:
+				return None
+			return (meshObj.data.name, materials)
+		if shareData == False:
+			return (GetMeshContentHash(meshObj, depsgraph), materials)
+		if meshObj.data not in contentHashes:
+			contentHashes[meshObj.data] = GetMeshContentHash(meshObj, depsgraph)
+		return (contentHashes[meshObj.data], materials)
+
+	contentKey = GetContentKey(obj)
+	if obj.ExportAsProxy == True or contentKey is None:
+		return None
+	objSettings = dict(settings.GetObject(obj).ToDict())
+	del objSettings["name"]
+	key = [
+		tuple(sorted(objSettings.items())),
+		tuple(getattr(obj, name) for name in staticMeshImportPropertyNames),
+		tuple(lod.name if lod is not None else "" for lod in (obj.Ue4Lod1, obj.Ue4Lod2, obj.Ue4Lod3, obj.Ue4Lod4, obj.Ue4Lod5)),
+		GetRoundedMatrix(GetExportMatrix(obj)),
+		tuple(round(value, 5) for value in obj.scale),
+		contentKey,
+		]
+
+	#The childs are exported with the object, the collisions are named from the object
+	inverseMatrix = obj.matrix_world.inverted()
+	for child in sorted(GetExportDesiredChilds(obj), key=lambda child: child.name.replace(obj.name, "", 1)):
+		childContentKey = GetContentKey(child)
+		if childContentKey is None:
+			return None
+		key.append((child.name.replace(obj.name, "", 1), GetRoundedMatrix(inverseMatrix @ child.matrix_world), childContentKey))
+	return tuple(key)
+
+def DeduplicateStaticMeshes(plan, mode, settings):
+	#Make the StaticMesh assets of the plan identical to a previous one alias of it.
+	#A alias is not exported and use the file of the first asset.
+	#Return the number of alias
+
+	if mode == "none":
+		return 0
+	depsgraph = bpy.context.evaluated_depsgraph_get()
+	contentHashes = {}
+	canonicalAssets = {}
+	aliasCount = 0
+	for asset in plan:
+		obj = asset.obj
+		if asset.type != AssetType.STATICMESH or obj is None:
+			continue
+		key = GetStaticMeshDeduplicationKey(obj, mode, settings, depsgraph, contentHashes)
+		if key is None:
+			continue
+		canonical = canonicalAssets.setdefault(key, asset)
+		if canonical is not asset:
+			asset.aliasOf = canonical.objectName
+			asset.exportDir = canonical.exportDir
+			asset.fileName = canonical.fileName
+			aliasCount += 1
+	return aliasCount
+
+
+def GetCollectionInstances(collection, matrix = None, depth = 0):
+	#Return (obj, world matrix) for each mesh of the collection, the collection
+	#instances inside the collection are expanded. Collisions and sockets are
+	#exported with their owner and are not instances.
+	#The childs of a mesh are exported in the FBX of this mesh and are not instances too.
+
+	if matrix is None:
+		matrix = mathutils.Matrix.Identity(4)
+	matrix = matrix @ mathutils.Matrix.Translation(-collection.instance_offset)
+	instances = []
+	collisionsAndSockets = set(GetAllCollisionAndSocketsObj(collection.all_objects))
+	objs = [obj for obj in collection.all_objects if obj.ExportEnum != "dont_export" and obj not in collisionsAndSockets]
+	exportedChilds = set()
+	for obj in objs:
+		if obj.type == "MESH":
+			exportedChilds.update(GetExportDesiredChilds(obj))
+	for obj in objs:
+		if obj in exportedChilds:
+			continue
+		if obj.type == "MESH":
+			instances.append((obj, matrix @ obj.matrix_world))
+		elif obj.instance_type == "COLLECTION" and obj.instance_collection is not None and depth < 16:
+			instances.extend(GetCollectionInstances(obj.instance_collection, matrix @ obj.matrix_world, depth+1))
+	return instances
+
+def GetLayoutMeshKey(obj):
+	#Objects with the same key are instances of the same mesh in a layout.
+	#A object with modifiers or exported childs is a unique mesh.
+
+	if len(obj.modifiers) > 0 or len(GetExportDesiredChilds(obj)) > 0:
+		return ("object", obj.name)
+	materials = tuple(slot.material.name if slot.material is not None else "" for slot in obj.material_slots)
+	return ("data", obj.data.name, materials)
+
+def GetUnrealLayoutMatrices(matrices, locationScale):
+	#Convert Blender world matrices (N,4,4) to Unreal matrices (N,4,3).
+	#The rows are the X, Y and Z axes then the location like a Unreal FMatrix.
+	#Unreal is Blender with the Y axis mirrored and the locations in centimeters.
+
+	matrices = numpy.asarray(matrices, dtype=numpy.float64).reshape(-1, 4, 4)
+	mirror = numpy.array([1.0, -1.0, 1.0])
+	linear = matrices[:, :3, :3] * mirror[None, :, None] * mirror[None, None, :]
+	unrealMatrices = numpy.empty((len(matrices), 4, 3), dtype=numpy.float32)
+	unrealMatrices[:, :3, :] = linear.transpose(0, 2, 1)
+	unrealMatrices[:, 3, :] = matrices[:, :3, 3] * mirror * locationScale
+	return unrealMatrices
+
+def GetLayoutData(meshPaths, meshIds, unrealMatrices):
+	#Return the binary layout file:
+	#"BFUL", version, mesh count, instance count (uint32)
+	#the mesh paths (uint16 length + utf-8), padded to 4 bytes
+	#the mesh id of each instance (uint32) then the matrix of each instance (4x3 float32)
+
+	data = bytearray(struct.pack("<4sIII", b"BFUL", 1, len(meshPaths), len(meshIds)))
+	for meshPath in meshPaths:
+		encodedPath = meshPath.encode("utf-8")
+		data += struct.pack("<H", len(encodedPath)) + encodedPath
+	data += bytes(-len(data) % 4)
+	data += numpy.asarray(meshIds, dtype="<u4").tobytes()
+	data += numpy.asarray(unrealMatrices, dtype="<f4").tobytes()
+	return bytes(data)
+
+
 def ValidFilenameForUnreal(filename):
 	# valid file name for unreal assets
 	extension = os.path.splitext(filename)[1]
@@ -550,7 +954,23 @@ def GetCollectionExportFileName(collection, fileType = ".fbx"):
 	scene = bpy.context.scene
 	return scene.static_prefix_export_name+collection+fileType
 
+def GetCollectionLayoutFileName(collection, fileType = ".bin"):
+	#Generate the file name of the instance layout of a collection
+
+	scene = bpy.context.scene
+	return scene.static_prefix_export_name+collection+"_Layout"+fileType
+
+def GetCollectionLayoutMeshFileName(collection, obj, fileType = ".fbx"):
+	#Generate the file name of a unique mesh of a collection layout
+
+	scene = bpy.context.scene
+	return scene.static_prefix_export_name+collection+"_"+obj.name+fileType
+
 		
+def GetAutoLodExportFileName(obj, lodLevel, fileType = ".fbx"):
+	#Generate the file name of a auto generated level of detail
+	return GetObjExportFileName(obj, "_LOD"+str(lodLevel)+fileType)
+
 def GetObjExportFileName(obj, fileType = ".fbx"):
 	#Generate assset file name
 
@@ -596,6 +1016,69 @@ def GetNLAExportFileName(obj, fileType = ".fbx"):
 		
 	return scene.anim_prefix_export_name+ArmatureName+obj.NLAAnimName+fileType
 
+def GetMultiTakeExportFileName(obj, fileType = ".fbx"):
+	#Generate the file name of the FBX that contain all the actions of a armature
+
+	scene = bpy.context.scene
+	return scene.anim_prefix_export_name+obj.name+"_Takes"+fileType
+
+def GetMultiTakeName(action, settings = None):
+	#Return the take name written by the FBX exporter for a action of the exported armature
+
+	return GetDesiredExportArmatureName(settings)+"|"+action.name
+
+#Data path of the curve that exclude a action from the takes of a multi take FBX
+multiTakeExcludedPath = "bfu_excluded_take"
+
+def GetMultiTakeActionsState(obj, actions):
+	#Return the changes of SetMultiTakeActions, the state is saved in the export journal
+	#excluded: the actions that are not takes, ranges: (action name, desired start, desired end, saved use_frame_range, frame_start, frame_end)
+
+	takeNames = set(action.name for action in actions)
+	state = {"excluded": [], "ranges": []}
+	for action in bpy.data.actions:
+		if action.name not in takeNames and action.library is None:
+			state["excluded"].append(action.name)
+	#Blender 2.8 to 3.0 have no manual frame range, the takes use the keyframe range of the action
+	if hasattr(bpy.types.Action, "use_frame_range"):
+		for action in actions:
+			if action.library is None:
+				startTime, endTime = GetDesiredActionStartEndTime(obj, action)
+				state["ranges"].append((action.name, startTime, endTime, action.use_frame_range, action.frame_start, action.frame_end))
+	return state
+
+def SetMultiTakeActions(state):
+	#The FBX exporter with bake_anim_use_all_actions write a take for each action with only valid curves for the armature.
+	#The excluded actions get a curve that can not be resolved and the takes use the manual frame range of the actions.
+
+	for name in state["excluded"]:
+		action = bpy.data.actions[name]
+		if action.fcurves.find(multiTakeExcludedPath) is None:
+			action.fcurves.new(multiTakeExcludedPath)
+	for name, startTime, endTime, useFrameRange, frameStart, frameEnd in state["ranges"]:
+		action = bpy.data.actions[name]
+		action.use_frame_range = True
+		action.frame_start = startTime
+		action.frame_end = endTime
+
+def ResetMultiTakeActions(state):
+	#Revert SetMultiTakeActions
+
+	for name in state["excluded"]:
+		if name in bpy.data.actions:
+			RemoveMultiTakeExcludedCurve(bpy.data.actions[name])
+	for name, startTime, endTime, useFrameRange, frameStart, frameEnd in state["ranges"]:
+		if name in bpy.data.actions:
+			action = bpy.data.actions[name]
+			action.frame_start = frameStart
+			action.frame_end = frameEnd
+			action.use_frame_range = useFrameRange
+
+def RemoveMultiTakeExcludedCurve(action):
+	fcurve = action.fcurves.find(multiTakeExcludedPath)
+	if fcurve is not None:
+		action.fcurves.remove(fcurve)
+
 def GetImportAssetScriptCommand():
 	scene = bpy.context.scene
 	fileName = scene.file_import_asset_script_name
@@ -607,6 +1090,24 @@ def GetImportAssetScriptCommand():
 	else:
 		return 'py "'+fullpath+'"' #Vania
 
+def GetAdditionalDataManifestPath():
+	#Return the path of the manifest with the additional parameters of all the meshes
+	scene = bpy.context.scene
+	absdirpath = bpy.path.abspath(scene.export_other_file_path)
+	return os.path.join( absdirpath , scene.file_additional_data_manifest_name )
+
+def GetImportLayoutScriptCommand():
+	scene = bpy.context.scene
+	fileName = scene.file_import_layout_script_name
+	absdirpath = bpy.path.abspath(scene.export_other_file_path)
+	fullpath = os.path.join( absdirpath , fileName )
+
+	addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
+	if addon_prefs.use20TabScript == True:
+		return 'unreal_engine.py_exec(r"'+fullpath+'")' #20tab
+	else:
+		return 'py "'+fullpath+'"' #Vania
+
 def GetImportSequencerScriptCommand():
 	scene = bpy.context.scene
 	fileName = scene.file_import_sequencer_script_name
@@ -624,7 +1125,9 @@ def GetAnimSample(obj):
 	#return 1000 #Debug
 	return obj.SampleAnimForExport
 
-def GetDesiredExportArmatureName():
+def GetDesiredExportArmatureName(settings = None):
+	if settings is not None:
+		return settings.exportArmatureName
 	addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
 	if addon_prefs.removeSkeletonRootBone == True:
 		return "Armature"
@@ -635,12 +1138,12 @@ def GetObjExportScale(obj):
 	return obj.exportGlobalScale
 	
 	
-def RenameArmatureAsExportName(obj):
+def RenameArmatureAsExportName(obj, settings = None):
 	#Rename temporarily the Armature as DefaultArmature
 	
 	scene = bpy.context.scene
 	oldArmatureName = None
-	newArmatureName = GetDesiredExportArmatureName()
+	newArmatureName = GetDesiredExportArmatureName(settings)
 	if obj.name != newArmatureName:
 		oldArmatureName = obj.name
 		#Avoid same name for two armature
@@ -649,14 +1152,14 @@ def RenameArmatureAsExportName(obj):
 		obj.name = newArmatureName
 	return oldArmatureName
 
-def ResetArmatureName(obj, oldArmatureName):
+def ResetArmatureName(obj, oldArmatureName, settings = None):
 	#Reset armature name
 
 	scene = bpy.context.scene
 	if oldArmatureName is not None:
 		obj.name = oldArmatureName
 		if "ArmatureTemporarilyNameForUe4Export" in scene.objects:
-			scene.objects["ArmatureTemporarilyNameForUe4Export"].name = GetDesiredExportArmatureName()
+			scene.objects["ArmatureTemporarilyNameForUe4Export"].name = GetDesiredExportArmatureName(settings)
 			
 
 def GenerateUe4Name(name):
@@ -672,11 +1175,8 @@ def GenerateUe4Name(name):
 			return False
 
 		#Checks if an object uses this name. (If not is a valid name)
-		for obj in bpy.context.scene.objects:
-			if testedName == obj.name:
-				return False
-
-		return True
+		#The names are unique in bpy.data.objects so it is a direct lookup
+		return bpy.data.objects.get(testedName) is None
 
 	newName = ""
 	if IsValidName(name):
@@ -854,6 +1354,82 @@ def CorrectBadProperty():
 			UpdatedProp += 1
 	return UpdatedProp
 
+boneTopologyCache = {} #ArmatureName: BoneTopology
+
+class BoneTopology():
+	#Hierarchy of the bones of a armature built in one pass over data.bones.
+	#The bones are stored by name.
+
+	__slots__ = (
+		"boneCount",
+		"parent",
+		"children",
+		"roots",
+		"deformBones",
+		"root",
+		"depth",
+		"firstDeformParent",
+		)
+
+	def __init__(self, armature):
+		self.parent = {}
+		self.deformBones = []
+		for bone in armature.bones:
+			self.parent[bone.name] = bone.parent.name if bone.parent is not None else None
+			if bone.use_deform == True:
+				self.deformBones.append(bone.name)
+		self.boneCount = len(self.parent)
+
+		self.children = {name: [] for name in self.parent}
+		self.roots = []
+		for name, parentName in self.parent.items():
+			if parentName is None:
+				self.roots.append(name)
+			else:
+				self.children[parentName].append(name)
+
+		#Same result as getRootBoneParent() and getFirstDeformBoneParent()
+		self.root = {}
+		self.depth = {}
+		self.firstDeformParent = {}
+		deformBones = set(self.deformBones)
+		for rootName in self.roots:
+			self.root[rootName] = rootName
+			self.depth[rootName] = 0
+			self.firstDeformParent[rootName] = rootName
+			stack = [rootName]
+			while stack:
+				name = stack.pop()
+				for child in self.children[name]:
+					self.root[child] = rootName
+					self.depth[child] = self.depth[name] + 1
+					self.firstDeformParent[child] = child if child in deformBones else self.firstDeformParent[name]
+					stack.append(child)
+
+	def GetDeformRoots(self):
+		#Return the root bones of the deform bones
+		deformRoots = []
+		for name in self.deformBones:
+			if self.root[name] not in deformRoots:
+				deformRoots.append(self.root[name])
+		return deformRoots
+
+def GetBoneTopology(armature):
+	#Return the BoneTopology of a armature data, built only if the armature changed
+	#The cache is cleared by the depsgraph handler of bfu_CheckPotentialError
+
+	topology = boneTopologyCache.get(armature.name)
+	if topology is None or topology.boneCount != len(armature.bones):
+		topology = BoneTopology(armature)
+		boneTopologyCache[armature.name] = topology
+	return topology
+
+def ClearBoneTopologyCache(armatureName = None):
+	if armatureName is None:
+		boneTopologyCache.clear()
+	else:
+		boneTopologyCache.pop(armatureName, None)
+
 def GetVertexWithZeroWeight(Armature, Mesh):
 	vertices = []
 	for vertex in Mesh.data.vertices:
@@ -866,278 +1442,6 @@ def GetVertexWithZeroWeight(Armature, Mesh):
 			vertices.append(vertex)
 	return vertices
 
-def UpdateUnrealPotentialError():
-	#Find and reset list of all potential error in scene
-
-
-	PotentialErrors = bpy.context.scene.potentialErrorList
-	PotentialErrors.clear()
-
-	#prepares the data to avoid unnecessary loops
-	objToCheck = []
-	for Asset in GetFinalAssetToExport():
-		if Asset.obj in GetAllobjectsByExportType("export_recursive"):
-			if Asset.obj not in objToCheck:
-				objToCheck.append(Asset.obj)
-			for child in GetExportDesiredChilds(Asset.obj):
-				if child not in objToCheck:
-					objToCheck.append(child)
-
-	MeshTypeToCheck = []
-	for obj in objToCheck:
-		if obj.type == 'MESH':
-			MeshTypeToCheck.append(obj)
-
-	MeshTypeWithoutCol = [] # is Mesh Type To Check Without Collision
-	for obj in MeshTypeToCheck:
-		if not CheckIsCollision(obj):
-			MeshTypeWithoutCol.append(obj)
-
-	def CheckObjType():
-	#Check if objects use a non-recommended type
-		for obj in objToCheck:
-			if obj.type == "SURFACE" or obj.type == "META" or obj.type == "FONT":
-				MyError = PotentialErrors.add()
-				MyError.name = obj.name
-				MyError.type = 1
-				MyError.text = 'Object "'+obj.name+'" is a '+obj.type+'. The object of the type SURFACE, META and FONT is not recommended.'
-				MyError.object = obj
-				MyError.correctRef = "ConvertToMesh"
-				MyError.correctlabel = 'Convert to mesh'
-
-	def CheckShapeKeys():
-		for obj in MeshTypeToCheck:
-			if obj.data.shape_keys is not None:
-				#Check that no modifiers is destructive for the key shapes
-				if len(obj.data.shape_keys.key_blocks) > 0:
-					for modif in obj.modifiers:
-						if modif.type != "ARMATURE" :
-							MyError = PotentialErrors.add()
-							MyError.name = obj.name
-							MyError.type = 2
-							MyError.object = obj
-							MyError.itemName = modif.name
-							MyError.text = 'In object "'+obj.name+'" the modifier '+modif.type+' named "'+modif.name+'" can destroy shape keys. Please use only Armature modifier with shape keys.'
-							MyError.correctRef = "RemoveModfier"
-							MyError.correctlabel = 'Remove modifier'
-
-				#Check that the key shapes are not out of bounds for Unreal
-				for key in obj.data.shape_keys.key_blocks:
-					#Min
-					if key.slider_min < -5:
-						MyError = PotentialErrors.add()
-						MyError.name = obj.name
-						MyError.type = 1
-						MyError.object = obj
-						MyError.itemName = key.name
-						MyError.text = 'In object "'+obj.name+'" the shape key "'+key.name+'" is out of bounds for Unreal. The min range of must not be inferior to -5.'
-						MyError.correctRef = "SetKeyRangeMin"
-						MyError.correctlabel = 'Set min range to -5'
-
-					#Max
-					if key.slider_max > 5:
-						MyError = PotentialErrors.add()
-						MyError.name = obj.name
-						MyError.type = 1
-						MyError.object = obj
-						MyError.itemName = key.name
-						MyError.text = 'In object "'+obj.name+'" the shape key "'+key.name+'" is out of bounds for Unreal. The max range of must not be superior to 5.'
-						MyError.correctRef = "SetKeyRangeMax"
-						MyError.correctlabel = 'Set max range to -5'
-
-	def CheckUVMaps():
-		#Check that the objects have at least one UV map valid
-		for obj in MeshTypeWithoutCol:
-			if len(obj.data.uv_layers) < 1:
-				MyError = PotentialErrors.add()
-				MyError.name = obj.name
-				MyError.type = 1
-				MyError.text = 'Object "'+obj.name+'" does not have any UV Layer.'
-				MyError.object = obj
-				MyError.correctRef = "CreateUV"
-				MyError.correctlabel = 'Create Smart UV Project'
-
-	def CheckBadStaicMeshExportedLikeSkeletalMesh():
-		#Check if the correct object is defined as exportable
-		for obj in MeshTypeToCheck:
-			for modif in obj.modifiers:
-				if modif.type == "ARMATURE" :
-					if obj.ExportEnum == "export_recursive":
-						MyError = PotentialErrors.add()
-						MyError.name = obj.name
-						MyError.type = 1
-						MyError.text = 'In object "'+obj.name+'" the modifier '+modif.type+' named "'+modif.name+'" will not be applied when exported with StaticMesh assets.\nNote: with armature if you want export objets as skeletal mesh you need set only the armature as export_recursive not the childs'
-						MyError.object = obj
-
-	def CheckArmatureModNumber():
-		#check that there is no more than one Modifier ARMATURE at the same time
-		for obj in MeshTypeToCheck:
-			ArmatureModifiers = 0
-			for modif in obj.modifiers:
-				if modif.type == "ARMATURE" :
-					ArmatureModifiers = ArmatureModifiers + 1
-			if ArmatureModifiers > 1:
-				MyError = PotentialErrors.add()
-				MyError.name = obj.name
-				MyError.type = 2
-				MyError.text = 'In object "'+obj.name+'" there are several Armature modifiers at the same time. Please use only one Armature modifier.'
-				MyError.object = obj
-
-	def CheckArmatureModData():
-		#check the parameter of Modifier ARMATURE
-		for obj in MeshTypeToCheck:
-			for modif in obj.modifiers:
-				if modif.type == "ARMATURE" :
-					if modif.use_deform_preserve_volume == True:
-						MyError = PotentialErrors.add()
-						MyError.name = obj.name
-						MyError.type = 2
-						MyError.text = 'In object "'+obj.name+'" the modifier '+modif.type+' named "'+modif.name+'". The parameter Preserve Volume must be set to False.'
-						MyError.object = obj
-						MyError.itemName = modif.name
-						MyError.correctRef = "PreserveVolume"
-						MyError.correctlabel = 'Set Preserve Volume to False'
-
-	def CheckArmatureBoneData():
-		#check the parameter of the ARMATURE bones
-		for obj in objToCheck:
-			if GetAssetType(obj) == "SkeletalMesh":
-				for bone in obj.data.bones:
-					if bone.bbone_segments > 1:
-						MyError = PotentialErrors.add()
-						MyError.name = obj.name
-						MyError.type = 2
-						MyError.text = 'In object3 "'+obj.name+'" the bone named "'+bone.name+'". The parameter Bendy Bones / Segments must be set to 1.'
-						MyError.object = obj
-						MyError.itemName = bone.name
-						MyError.correctRef = "BoneSegments"
-						MyError.correctlabel = 'Set Bone Segments to 1'
-
-					if bone.use_inherit_scale == False:
-						MyError = PotentialErrors.add()
-						MyError.name = obj.name
-						MyError.type = 2
-						MyError.text = 'In object2 "'+obj.name+'" the bone named "'+bone.name+'". The parameter Inherit Scale must be set to True.'
-						MyError.object = obj
-						MyError.itemName = bone.name
-						MyError.correctRef = "InheritScale"
-						MyError.correctlabel = 'Set Inherit Scale to True'
-
-	def CheckArmatureValidChild():
-		#Check that skeleton also has a mesh to export
-		for obj in objToCheck:
-			if GetAssetType(obj) == "SkeletalMesh":
-				childs = GetExportDesiredChilds(obj)
-				validChild = 0
-				for child in childs:
-					if child.type == "MESH":
-						validChild += 1
-				if obj.ExportAsProxy == True:
-					if obj.ExportProxyChild is not None:
-						validChild += 1
-				if validChild < 1:
-					MyError = PotentialErrors.add()
-					MyError.name = obj.name
-					MyError.type = 2
-					MyError.text = 'Object "'+obj.name+'" is an Armature and does not have any valid children.'
-					MyError.object = obj
-
-	def CheckArmatureMultipleRoots():
-		#Check that skeleton have multiples roots
-		for obj in objToCheck:
-			if GetAssetType(obj) == "SkeletalMesh":
-			
-				rootBones = []
-				if obj.exportDeformOnly == False:	
-					for bone in obj.data.bones:
-						if bone.parent == None:
-							rootBones.append(bone)
-				
-				
-				if obj.exportDeformOnly == True:	
-					for bone in obj.data.bones:
-						if bone.use_deform == True:
-							rootBone = getRootBoneParent(bone)
-							if rootBone not in rootBones:
-								rootBones.append(bone)
-
-
-
-							
-							
-							
-				if len(rootBones) > 1:
-					MyError = PotentialErrors.add()
-					MyError.name = obj.name
-					MyError.type = 2
-					MyError.text = 'Object "'+obj.name+'" have Multiple roots bones. Unreal only support single root bone.'
-					MyError.text += '\nRoot bones: '
-					for rootBone in rootBones:
-						MyError.text += rootBone.name+' '
-					MyError.object = obj
-
-	def CheckMarkerOverlay():
-		#Check that there is no overlap with the Marker
-		usedFrame = []
-		for marker in bpy.context.scene.timeline_markers:
-			if marker.frame in usedFrame:
-				MyError = PotentialErrors.add()
-				MyError.type = 2
-				MyError.text = 'In the scene timeline the frame "'+str(marker.frame)+'" contains overlaped Markers\n To avoid camera conflict in the generation of sequencer you must use max one marker per frame '
-			else:
-				usedFrame.append(marker.frame)
-
-
-	def CheckVertexGroupWeight():
-		#Check that all vertex have a weight
-		for obj in objToCheck:
-			if GetAssetType(obj) == "SkeletalMesh":
-				childs = GetExportDesiredChilds(obj)
-				for child in childs:
-					if child.type == "MESH":
-						#Result data
-						VertexWithZeroWeight = GetVertexWithZeroWeight(obj, child)
-						if len(VertexWithZeroWeight) > 0:
-							MyError = PotentialErrors.add()
-							MyError.name = child.name
-							MyError.type = 1
-							MyError.text = 'Object named "'+child.name+'" contains '+str(len(VertexWithZeroWeight))+' vertex with zero cumulative valid weight.'
-							MyError.text += '\nNote: Vertex groups must have a bone with the same name to be valid.'
-							MyError.object = child
-							MyError.vertexErrorType = "VertexWithZeroWeight"
-
-
-	def CheckZeroScaleKeyframe():
-		#Check that animations do not use a invalid value
-		for obj in objToCheck:
-			if GetAssetType(obj) == "SkeletalMesh":
-				for action in GetActionToExport(obj):
-					for fcurve in action.fcurves:
-						if fcurve.data_path.split(".")[-1] == "scale":
-							for key in fcurve.keyframe_points:
-								xCurve, yCurve = key.co
-								if key.co[1] == 0:
-									MyError = PotentialErrors.add()
-									MyError.type = 2
-									MyError.text = 'In action "'+action.name+'" at frame '+str(key.co[0])+', the bone named "'+fcurve.data_path.split('"')[1]+'" has a zero value in scale transform. This is invalid in Unreal.'
-
-
-	CheckObjType()
-	CheckShapeKeys()
-	CheckUVMaps()
-	CheckBadStaicMeshExportedLikeSkeletalMesh()
-	CheckArmatureModNumber()
-	CheckArmatureModData()
-	CheckArmatureBoneData()
-	CheckArmatureValidChild()
-	CheckArmatureMultipleRoots()
-	CheckMarkerOverlay()
-	CheckVertexGroupWeight()
-	CheckZeroScaleKeyframe()
-
-	return PotentialErrors
-
-
 def SelectPotentialErrorObject(errorIndex):
 	#Select potential error
 
@@ -1179,114 +1483,137 @@ def SelectPotentialErrorVertex(errorIndex):
 	bpy.ops.view3d.view_selected()
 	return obj
 
-def TryToCorrectPotentialError(errorIndex):
-	#Try to correct potential error
+def SaveCorrectContext():
+	#Save the selection, the mode and the collections visibility before a correction
+	#All the collections are made visible and selectable
 
-	scene = bpy.context.scene
-	error = scene.potentialErrorList[errorIndex]
-	global successCorrect
-	successCorrect = False
-	#----------------------------------------Save data
-	UserActive = bpy.context.active_object #Save current active object
-	UserMode = None
-	if UserActive and UserActive.mode != 'OBJECT' and bpy.ops.object.mode_set.poll():
-		UserMode = UserActive.mode #Save current mode
+	saved = {}
+	saved["active"] = bpy.context.active_object #Save current active object
+	saved["mode"] = None
+	if saved["active"] and saved["active"].mode != 'OBJECT' and bpy.ops.object.mode_set.poll():
+		saved["mode"] = saved["active"].mode #Save current mode
 		bpy.ops.object.mode_set(mode='OBJECT')
-	UserSelected = bpy.context.selected_objects #Save current selected objects
+	saved["selected"] = bpy.context.selected_objects.copy() #Save current selected objects
 
-	UsedViewLayerCollectionHideViewport = []
-	UsedCollectionHideViewport = []
-	UsedCollectionHideselect = []
+	saved["collections"] = {}
+	layerCollections = bpy.context.view_layer.layer_collection.children
 	for collection in bpy.data.collections: #Save previous collections visibility
-		try:
-			UsedViewLayerCollectionHideViewport.append(view_layer.layer_collection.children[collection.name].hide_viewport)
-		except:
-			print(collection.name," not found in layer_collection")
-			pass
-		UsedCollectionHideViewport.append(collection.hide_viewport)
-		UsedCollectionHideselect.append(collection.hide_select)
+		layerHideViewport = None
+		if collection.name in layerCollections:
+			layerHideViewport = layerCollections[collection.name].hide_viewport
+		saved["collections"][collection.name] = (layerHideViewport, collection.hide_viewport, collection.hide_select)
 		SetCollectionUse(collection)
+	return saved
 
-	#----------------------------------------
-	print("Start correct")
-	def SelectObj(obj):
-		bpy.ops.object.select_all(action='DESELECT')
-		obj.select_set(True)
-		bpy.context.view_layer.objects.active = obj
+def RestoreCorrectContext(saved):
+	#Reset the data saved by SaveCorrectContext()
 
+	scene = bpy.context.scene
+	layerCollections = bpy.context.view_layer.layer_collection.children
+	for collection in bpy.data.collections:
+		if collection.name in saved["collections"]:
+			layerHideViewport, hideViewport, hideSelect = saved["collections"][collection.name]
+			if layerHideViewport is not None and collection.name in layerCollections:
+				layerCollections[collection.name].hide_viewport = layerHideViewport
+			collection.hide_viewport = hideViewport
+			collection.hide_select = hideSelect
+
+	bpy.ops.object.select_all(action='DESELECT')
+	for obj in saved["selected"]: #Resets previous selected object if still exist
+		if not is_deleted(obj) and obj.name in scene.objects:
+			obj.select_set(True)
+	UserActive = saved["active"]
+	if UserActive is not None and is_deleted(UserActive):
+		UserActive = None
+	bpy.context.view_layer.objects.active = UserActive #Resets previous active object
+	if UserActive and saved["mode"] and bpy.ops.object.mode_set.poll():
+		bpy.ops.object.mode_set(mode=saved["mode"]) #Resets previous mode
+
+def ApplyErrorCorrection(correctRef, targets):
+	#Apply a correction to a list of (object, itemName)
+	#The corrections done with an operator are applied one time to all the objects
+	#Return the number of targets corrected
+
+	def SelectObjs(objs):
+		bpy.ops.object.select_all(action='DESELECT')
+		for obj in objs:
+			obj.select_set(True)
+		bpy.context.view_layer.objects.active = objs[0]
 
-	#Correction list
+	objs = []
+	for obj, itemName in targets:
+		if obj is not None and obj not in objs:
+			objs.append(obj)
+	if len(objs) == 0:
+		return 0
 
-	if error.correctRef == "ConvertToMesh":
-		obj = error.object
-		SelectObj(obj)
+	if correctRef == "ConvertToMesh":
+		SelectObjs(objs)
 		bpy.ops.object.convert(target='MESH')
-		successCorrect = True
-
-	if error.correctRef == "SetKeyRangeMin":
-		obj = error.object
-		key = obj.data.shape_keys.key_blocks[error.itemName]
-		key.slider_min = -5
-		successCorrect = True
-
-	if error.correctRef == "SetKeyRangeMax":
-		obj = error.object
-		key = obj.data.shape_keys.key_blocks[error.itemName]
-		key.slider_max = 5
-		successCorrect = True
-
-	if error.correctRef == "CreateUV":
-		obj = error.object
-		SelectObj(obj)
+		return len(targets)
+
+	if correctRef == "CreateUV":
+		SelectObjs(objs)
 		bpy.ops.uv.smart_project()
-		successCorrect = True
-
-	if error.correctRef == "RemoveModfier":
-		obj = error.object
-		mod = obj.modifiers[error.itemName]
-		obj.modifiers.remove(mod)
-		successCorrect = True
-
-	if error.correctRef == "PreserveVolume":
-		obj = error.object
-		mod = obj.modifiers[error.itemName]
-		mod.use_deform_preserve_volume = False
-		successCorrect = True
-
-	if error.correctRef == "BoneSegments":
-		obj = error.object
-		bone = obj.data.bones[error.itemName]
-		bone.bbone_segments = 1
-		successCorrect = True
-
-	if error.correctRef == "InheritScale":
-		obj = error.object
-		bone = obj.data.bones[error.itemName]
-		bone.use_inherit_scale = True
-		successCorrect = True
+		return len(targets)
 
-	#----------------------------------------Reset data
-	for x, collection in enumerate(bpy.data.collections):
-		try:
-			view_layer.layer_collection.children[collection.name].hide_viewport = UsedViewLayerCollectionHideViewport[x]
-		except:
-			print(collection.name," not found in layer_collection")
-			pass
-		collection.hide_viewport = UsedCollectionHideViewport[x]
-		collection.hide_select = UsedCollectionHideselect[x]
+	corrected = 0
+	for obj, itemName in targets:
+		if obj is None:
+			continue
 
-	bpy.ops.object.select_all(action='DESELECT')
-	for obj in UserSelected: #Resets previous selected object if still exist
-		if obj.name in scene.objects:
-			obj.select_set(True)
-	bpy.context.view_layer.objects.active = UserActive #Resets previous active object
-	if UserActive and UserMode and bpy.ops.object.mode_set.poll():
-		bpy.ops.object.mode_set(mode=UserMode) #Resets previous mode
+		if correctRef == "SetKeyRangeMin":
+			if obj.data.shape_keys is not None and itemName in obj.data.shape_keys.key_blocks:
+				obj.data.shape_keys.key_blocks[itemName].slider_min = -5
+				corrected += 1
+
+		elif correctRef == "SetKeyRangeMax":
+			if obj.data.shape_keys is not None and itemName in obj.data.shape_keys.key_blocks:
+				obj.data.shape_keys.key_blocks[itemName].slider_max = 5
+				corrected += 1
+
+		elif correctRef == "RemoveModfier":
+			if itemName in obj.modifiers:
+				obj.modifiers.remove(obj.modifiers[itemName])
+				corrected += 1
+
+		elif correctRef == "PreserveVolume":
+			if itemName in obj.modifiers:
+				obj.modifiers[itemName].use_deform_preserve_volume = False
+				corrected += 1
+
+		elif correctRef == "BoneSegments":
+			if itemName in obj.data.bones:
+				obj.data.bones[itemName].bbone_segments = 1
+				corrected += 1
+
+		elif correctRef == "InheritScale":
+			if itemName in obj.data.bones:
+				obj.data.bones[itemName].use_inherit_scale = True
+				corrected += 1
+
+	return corrected
+
+def TryToCorrectPotentialError(errorIndex):
+	#Try to correct potential error
+
+	scene = bpy.context.scene
+	error = scene.potentialErrorList[errorIndex]
+	correctRef = error.correctRef
+	#----------------------------------------Save data
+	saved = SaveCorrectContext()
+
+	#----------------------------------------
+	print("Start correct")
+	successCorrect = ApplyErrorCorrection(correctRef, [(error.object, error.itemName)]) > 0
+
+	#----------------------------------------Reset data
+	RestoreCorrectContext(saved)
 	#----------------------------------------
 
 	if successCorrect == True:
 		scene.potentialErrorList.remove(errorIndex)
-		print("end correct, Error: " + error.correctRef)
+		print("end correct, Error: " + correctRef)
 		return "Corrected"
 	print("end correct, Error not found")
 	return "Correct fail"
@@ -0,0 +1,204 @@
+#====================== BEGIN GPL LICENSE BLOCK ============================
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.	 See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.	 If not, see <http://www.gnu.org/licenses/>.
+#  All rights reserved.
+#
+#======================= END GPL LICENSE BLOCK =============================
+
+
+
+import bpy
+import os
+
+
+import importlib
+from . import bfu_Basics
+importlib.reload(bfu_Basics)
+from .bfu_Basics import *
+
+from . import bfu_Utils
+importlib.reload(bfu_Utils)
+from .bfu_Utils import *
+
+from . import bfu_ExportSettings
+importlib.reload(bfu_ExportSettings)
+
+
+def WriteImportLayoutScript(use20tab = False, script = None, settings = None):
+	#Generate a script for spawn the collection layouts in the current Ue4 level
+	#Each unique mesh of a layout is a InstancedStaticMeshComponent of one actor
+	#The script is streamed in the ScriptEmitter, without emitter the text is returned
+
+	if script is None:
+		script = ScriptEmitter()
+		WriteImportLayoutScript(use20tab, script, settings)
+		return script.GetText()
+
+	#Comment
+	script.Write("#This script was generated with the addons Blender for UnrealEngine : https://github.com/xavier150/Blender-For-UnrealEngine-Addons" + "\n")
+	script.Write("#This script will spawn in the current level the collection layouts as instanced static meshes" + "\n")
+	script.Write("#The StaticMeshs of the layouts must be imported before with the import assets script" + "\n")
+	if use20tab == True:
+		script.Write("#The script must be used in Unreal Engine Editor with UnrealEnginePython : https://github.com/20tab/UnrealEnginePython" + "\n")
+	else:
+		script.Write("#The script must be used in Unreal Engine Editor with Python plugins : https://docs.unrealengine.com/en-US/Engine/Editor/ScriptingAndAutomation/Python" + "\n")
+	script.Write("#Use this command : " + GetImportLayoutScriptCommand() + "\n")
+	script.Write("\n")
+	script.Write("\n")
+
+	script.Write("def CheckTasks():" + "\n")
+	with script.Indented():
+		if use20tab == True:
+			script.Write("return True" + "\n")
+		else:
+			script.Write("import unreal" + "\n")
+
+			script.Write("if hasattr(unreal, 'EditorLevelLibrary') == False:" + "\n")
+			script.Write("\t" + "print('--------------------------------------------------\\n /!\ Warning: Editor Scripting Utilities should be activated.\\n Plugin > Scripting > Editor Scripting Utilities.')" + "\n")
+			script.Write("\t" + "return False" + "\n")
+
+			script.Write("if hasattr(unreal, 'SubobjectDataSubsystem') == False:" + "\n")
+			script.Write("\t" + "print('--------------------------------------------------\\n /!\ Warning: The components can not be added with python in this version of Unreal Engine.')" + "\n")
+			script.Write("\t" + "return False" + "\n")
+
+			script.Write("return True" + "\n")
+
+	script.Write("def ImportLayouts():" + "\n")
+	with script.Indented():
+		WriteImportLayoutScriptBody(script, use20tab, settings)
+
+	script.Write("if CheckTasks() == True:" + "\n")
+	script.Write("\t" + "print(ImportLayouts())" + "\n")
+
+def WriteImportLayoutScriptBody(script, use20tab = False, settings = None):
+	#Write the body of the ImportLayouts() function
+	scene = bpy.context.scene
+	settings = bfu_ExportSettings.GetExportSettings(settings)
+
+	#Import
+	script.Write("import os.path" + "\n")
+	script.Write("import math" + "\n")
+	script.Write("import struct" + "\n")
+	if use20tab == True:
+		script.Write("import unreal_engine as ue" + "\n")
+		script.Write("from unreal_engine.classes import Actor, SceneComponent, InstancedStaticMeshComponent" + "\n")
+		script.Write("from unreal_engine import FTransform, FRotator, FVector" + "\n")
+	else:
+		script.Write("import unreal" + "\n")
+	script.Write("\n")
+	script.Write("\n")
+
+	#Prepare var
+	script.Write("unrealImportLocation = r'/Game/" + settings.unreal_import_location + "'" + "\n")
+	script.Write("Layouts = [" + "\n")
+	for asset in scene.UnrealExportedAssetsList:
+		if asset.assetType == "Layout":
+			layoutName = os.path.splitext(asset.assetName)[0]
+			script.Write("\t" + "(r'" + layoutName + "', r'" + os.path.join(asset.exportPath, asset.assetName) + "')," + "\n")
+	script.Write("\t" + "]" + "\n")
+	script.Write("\n")
+	script.Write("\n")
+
+	#Prepare def
+	script.Write("def ReadLayout(FileLoc):" + "\n")
+	with script.Indented():
+		script.Write("#Return the mesh paths, the mesh id of each instance and the 4x3 matrices of all the instances" + "\n")
+		script.Write("with open(FileLoc, 'rb') as LayoutFile:" + "\n")
+		script.Write("\t" + "data = LayoutFile.read()" + "\n")
+		script.Write("magic, version, meshCount, instanceCount = struct.unpack_from('<4sIII', data, 0)" + "\n")
+		script.Write("if magic != b'BFUL' or version != 1:" + "\n")
+		script.Write("\t" + "print('/!\ '+FileLoc+' is not a valid layout file')" + "\n")
+		script.Write("\t" + "return [], [], []" + "\n")
+		script.Write("offset = 16" + "\n")
+		script.Write("meshPaths = []" + "\n")
+		script.Write("for x in range(meshCount):" + "\n")
+		script.Write("\t" + "length = struct.unpack_from('<H', data, offset)[0]" + "\n")
+		script.Write("\t" + "meshPaths.append(data[offset+2:offset+2+length].decode('utf-8'))" + "\n")
+		script.Write("\t" + "offset += 2+length" + "\n")
+		script.Write("offset += -offset % 4" + "\n")
+		script.Write("meshIds = struct.unpack_from('<'+str(instanceCount)+'I', data, offset)" + "\n")
+		script.Write("matrices = struct.unpack_from('<'+str(instanceCount*12)+'f', data, offset+4*instanceCount)" + "\n")
+		script.Write("return meshPaths, meshIds, matrices" + "\n")
+	script.Write("\n")
+
+	script.Write("def GetInstanceTransform(matrices, index):" + "\n")
+	with script.Indented():
+		script.Write("#Return the location, rotation (roll, pitch, yaw) and scale of a instance like FMatrix::Rotator()" + "\n")
+		script.Write("m = matrices[index*12:index*12+12]" + "\n")
+		script.Write("axes = [list(m[0:3]), list(m[3:6]), list(m[6:9])]" + "\n")
+		script.Write("scale = [max(math.sqrt(a[0]*a[0]+a[1]*a[1]+a[2]*a[2]), 1e-8) for a in axes]" + "\n")
+		script.Write("x, y, z = [[v/s for v in a] for a, s in zip(axes, scale)]" + "\n")
+		script.Write("if x[0]*(y[1]*z[2]-y[2]*z[1]) - x[1]*(y[0]*z[2]-y[2]*z[0]) + x[2]*(y[0]*z[1]-y[1]*z[0]) < 0: #Mirrored" + "\n")
+		script.Write("\t" + "scale[0] = -scale[0]" + "\n")
+		script.Write("\t" + "x = [-v for v in x]" + "\n")
+		script.Write("pitch = math.atan2(x[2], math.sqrt(x[0]*x[0]+x[1]*x[1]))" + "\n")
+		script.Write("yaw = math.atan2(x[1], x[0])" + "\n")
+		script.Write("syAxis = (-math.sin(yaw), math.cos(yaw))" + "\n")
+		script.Write("roll = math.atan2(z[0]*syAxis[0]+z[1]*syAxis[1], y[0]*syAxis[0]+y[1]*syAxis[1])" + "\n")
+		script.Write("return list(m[9:12]), [math.degrees(roll), math.degrees(pitch), math.degrees(yaw)], scale" + "\n")
+	script.Write("\n")
+
+	script.Write("def SpawnLayout(LayoutName, FileLoc):" + "\n")
+	with script.Indented():
+		script.Write("meshPaths, meshIds, matrices = ReadLayout(FileLoc)" + "\n")
+		if use20tab == True:
+			script.Write("world = ue.get_editor_world()" + "\n")
+			script.Write("actor = world.actor_spawn(Actor)" + "\n")
+			script.Write("actor.set_actor_label(LayoutName)" + "\n")
+			script.Write("root = actor.add_actor_root_component(SceneComponent, 'Root')" + "\n")
+		else:
+			script.Write("actor = unreal.EditorLevelLibrary.spawn_actor_from_class(unreal.Actor, unreal.Vector(0, 0, 0))" + "\n")
+			script.Write("actor.set_actor_label(LayoutName)" + "\n")
+			script.Write("subsystem = unreal.get_engine_subsystem(unreal.SubobjectDataSubsystem)" + "\n")
+			script.Write("rootHandle = subsystem.k2_gather_subobject_data_for_instance(actor)[0]" + "\n")
+
+		#One InstancedStaticMeshComponent by unique mesh
+		script.Write("components = []" + "\n")
+		script.Write("for meshPath in meshPaths:" + "\n")
+		with script.Indented():
+			script.Write("assetPath = os.path.join(unrealImportLocation, meshPath).replace('\\\\','/')" + "\n")
+			script.Write("assetPath = assetPath+'.'+assetPath.split('/')[-1]" + "\n")
+			if use20tab == True:
+				script.Write("mesh = ue.find_asset(assetPath)" + "\n")
+			else:
+				script.Write("mesh = unreal.load_asset(assetPath)" + "\n")
+			script.Write("if mesh is None:" + "\n")
+			script.Write("\t" + "print('/!\ StaticMesh not found: '+assetPath+' (Import the assets first)')" + "\n")
+			script.Write("\t" + "components.append(None)" + "\n")
+			script.Write("\t" + "continue" + "\n")
+			if use20tab == True:
+				script.Write("component = actor.add_actor_component(InstancedStaticMeshComponent, assetPath.split('.')[-1], root)" + "\n")
+				script.Write("component.SetStaticMesh(mesh)" + "\n")
+			else:
+				script.Write("handle, failReason = subsystem.add_new_subobject(unreal.AddNewSubobjectParams(parent_handle=rootHandle, new_class=unreal.InstancedStaticMeshComponent))" + "\n")
+				script.Write("component = unreal.SubobjectDataBlueprintFunctionLibrary.get_object(unreal.SubobjectDataBlueprintFunctionLibrary.get_data(handle))" + "\n")
+				script.Write("component.set_static_mesh(mesh)" + "\n")
+			script.Write("components.append(component)" + "\n")
+
+		script.Write("for index, meshId in enumerate(meshIds):" + "\n")
+		with script.Indented():
+			script.Write("if components[meshId] is None:" + "\n")
+			script.Write("\t" + "continue" + "\n")
+			script.Write("location, rotation, scale = GetInstanceTransform(matrices, index)" + "\n")
+			if use20tab == True:
+				script.Write("components[meshId].AddInstance(FTransform(FVector(*location), FRotator(*rotation), FVector(*scale)))" + "\n")
+			else:
+				script.Write("components[meshId].add_instance(unreal.Transform(unreal.Vector(*location), unreal.Rotator(*rotation), unreal.Vector(*scale)))" + "\n")
+		script.Write("print('Layout '+LayoutName+' spawned with '+str(len(meshIds))+' instance(s) of '+str(len(meshPaths))+' mesh(es)')" + "\n")
+		script.Write("return actor" + "\n")
+	script.Write("\n")
+
+	script.Write("for LayoutName, FileLoc in Layouts:" + "\n")
+	script.Write("\t" + "SpawnLayout(LayoutName, FileLoc)" + "\n")
+	script.Write("return 'Spawned layout(s): '+str(len(Layouts))" + "\n")
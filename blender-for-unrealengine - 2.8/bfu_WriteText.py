@@ -19,6 +19,8 @@
 
 import bpy
 import time
+import io
+import json
 import configparser
 from math import degrees, radians
 from mathutils import Matrix
@@ -33,12 +35,24 @@ from . import bfu_Utils
 importlib.reload(bfu_Utils)
 from .bfu_Utils import *
 
+from . import bfu_AssetBudget
+importlib.reload(bfu_AssetBudget)
+
+from . import bfu_Animation
+importlib.reload(bfu_Animation)
+
+from . import bfu_ExportSettings
+importlib.reload(bfu_ExportSettings)
+
 from . import bfu_WriteImportAssetScript
 importlib.reload(bfu_WriteImportAssetScript)
 
 from . import bfu_WriteImportSequencerScript
 importlib.reload(bfu_WriteImportSequencerScript)
 
+from . import bfu_WriteImportLayoutScript
+importlib.reload(bfu_WriteImportLayoutScript)
+
 
 def ExportSingleText(text, dirpath, filename):
 	#Export single text
@@ -50,8 +64,23 @@ def ExportSingleText(text, dirpath, filename):
 	VerifiDirs(absdirpath)
 	fullpath = os.path.join( absdirpath , filename )
 
-	with open(fullpath, "w") as file:
-		file.write(text)
+	WriteTextFileIfChanged(text, fullpath)
+
+	exportTime = time.process_time()-curr_time
+	return([filename,"TextFile",absdirpath,exportTime]) #[AssetName , AssetType , ExportPath, ExportTime]
+
+def ExportSingleScript(writeFunction, dirpath, filename):
+	#Export single text written by writeFunction(ScriptEmitter)
+	#The text is streamed in the file and never built in memory
+
+	filename = ValidFilename(filename)
+	curr_time = time.process_time()
+
+	absdirpath = bpy.path.abspath(dirpath)
+	VerifiDirs(absdirpath)
+	fullpath = os.path.join( absdirpath , filename )
+
+	WriteScriptFileIfChanged(writeFunction, fullpath)
 
 	exportTime = time.process_time()-curr_time
 	return([filename,"TextFile",absdirpath,exportTime]) #[AssetName , AssetType , ExportPath, ExportTime]
@@ -66,16 +95,25 @@ def ExportSingleConfigParser(config, dirpath, filename):
 	VerifiDirs(absdirpath)
 	fullpath = os.path.join( absdirpath , filename )
 
-	with open(fullpath, "w") as configfile:
-		config.write(configfile)
+	configText = io.StringIO()
+	config.write(configText)
+	WriteTextFileIfChanged(configText.getvalue(), fullpath)
 
 	exportTime = time.process_time()-curr_time
 	return([filename,"TextFile",absdirpath,exportTime]) #[AssetName , AssetType , ExportPath, ExportTime]
 
-def WriteExportLog():
+def WriteExportLog(script = None, settings = None, budgets = None):
 	#Write Export log with exported assets in scene.UnrealExportedAssetsList
+	#Without ScriptEmitter the text is returned
+	#budgets is the list of AssetBudget if they are already computed for this export
+
+	if script is None:
+		script = ScriptEmitter()
+		WriteExportLog(script, settings, budgets)
+		return script.GetText()
 
 	scene = bpy.context.scene
+	settings = bfu_ExportSettings.GetExportSettings(settings)
 	StaticNum = 0
 	SkeletalNum = 0
 	AlembicNum = 0
@@ -103,9 +141,9 @@ def WriteExportLog():
 	AssetNumberByType += str(CameraNum)+" Camera(s) | "
 	AssetNumberByType += str(OtherNum)+" Other(s)" + "\n"
 
-	ExportLog = "..." + "\n"
-	ExportLog += AssetNumberByType
-	ExportLog += "\n"
+	script.Write("..." + "\n")
+	script.Write(AssetNumberByType)
+	script.Write("\n")
 	for asset in scene.UnrealExportedAssetsList:
 
 		if (asset.assetType == "NlAnim"):
@@ -117,38 +155,77 @@ def WriteExportLog():
 		elif (asset.assetType == "Pose"):
 			primaryInfo = "Animation"
 			secondaryInfo = "(Pose)"
+		elif (asset.assetType == "MultiTakeAnim"):
+			primaryInfo = "Animation"
+			secondaryInfo = "(Multi take, "+str(len(json.loads(asset.animTakes)))+" actions)"
 		else:
 			primaryInfo = asset.assetType
-			secondaryInfo = " (LOD)" if asset.object.ExportAsLod == True else ""
-
-		ExportLog +=("["+primaryInfo+"]"+secondaryInfo+" -> "+"\""+asset.assetName+"\" exported in "+str(asset.exportTime)+" sec.\n")
-		ExportLog +=(asset.exportPath + "\n")
-		ExportLog += "\n"
-
-	return ExportLog
-
-
-def WriteImportPythonHeadComment(use20tab = False, useSequencer = False):
+			secondaryInfo = " (LOD)" if asset.lodLevel > 0 or (asset.object is not None and asset.object.ExportAsLod == True) else ""
+			if asset.aliasOf != "":
+				secondaryInfo = " (Alias of "+asset.aliasOf+")"
+
+		script.Write("["+primaryInfo+"]"+secondaryInfo+" -> "+"\""+asset.assetName+"\" exported in "+str(asset.exportTime)+" sec.\n")
+		script.Write(asset.exportPath + "\n")
+		if asset.animRawKeys > 0:
+			keys = str(asset.animKeys)+" / "+str(asset.animRawKeys)
+			size = bfu_Animation.GetBytesText(asset.animKeys*bfu_Animation.fbxBytesPerKey)
+			script.Write("Estimated keys: "+keys+" ("+size+")" + "\n")
+		script.Write("\n")
+
+	if settings.useBudgetCheck == True:
+		WriteBudgetTable(script, settings, budgets)
+
+
+def WriteBudgetTable(script, settings = None, budgets = None):
+	#Write the runtime cost of the exported StaticMesh and SkeletalMesh
+	#The values over the budget are marked with "!"
+
+	if budgets is None:
+		budgets = bfu_AssetBudget.GetExportedAssetBudgets()
+	if len(budgets) == 0:
+		return
+	limits = bfu_AssetBudget.GetBudgetLimits(settings)
+	labels = [label for name, label, staticLimit, skeletalLimit in bfu_AssetBudget.budgetStats]
+	nameWidth = max([len("Asset")] + [len(budget.name) for budget in budgets])
+	columnWidth = max(len(label) for label in labels) + 2
+
+	script.Write("Performance budget:" + "\n")
+	script.Write("Asset".ljust(nameWidth)+"  "+"Type".ljust(12)+"".join(label.rjust(columnWidth) for label in labels) + "\n")
+	overrunNum = 0
+	for budget in budgets:
+		overruns = set(name for name, label, value, limit in budget.GetOverruns(limits))
+		overrunNum += 1 if len(overruns) > 0 else 0
+		line = budget.name.ljust(nameWidth)+"  "+budget.assetType.ljust(12)
+		for name, label, staticLimit, skeletalLimit in bfu_AssetBudget.budgetStats:
+			value = getattr(budget, name)
+			if isinstance(value, bool):
+				value = "Yes" if value else "No"
+			line += (str(value)+("!" if name in overruns else "")).rjust(columnWidth)
+		script.Write(line + "\n")
+	script.Write(str(overrunNum)+" asset(s) over the budget." + "\n")
+	script.Write("\n")
+
+
+def WriteImportPythonHeadComment(script, use20tab = False, useSequencer = False):
 
 	scene = bpy.context.scene
 
 	#Comment
-	ImportScript = "#This script was generated with the addons Blender for UnrealEngine : https://github.com/xavier150/Blender-For-UnrealEngine-Addons" + "\n"
+	script.Write("#This script was generated with the addons Blender for UnrealEngine : https://github.com/xavier150/Blender-For-UnrealEngine-Addons" + "\n")
 	if useSequencer == True:
-		ImportScript += "#It will import into Unreal Engine all the assets of type StaticMesh, SkeletalMesh, Animation and Pose" + "\n"
+		script.Write("#It will import into Unreal Engine all the assets of type StaticMesh, SkeletalMesh, Animation and Pose" + "\n")
 	else:
-		ImportScript += "#This script will import in unreal all camera in target sequencer" + "\n"
+		script.Write("#This script will import in unreal all camera in target sequencer" + "\n")
 	if use20tab == True:
-		ImportScript += "#The script must be used in Unreal Engine Editor with UnrealEnginePython : https://github.com/20tab/UnrealEnginePython" + "\n"
+		script.Write("#The script must be used in Unreal Engine Editor with UnrealEnginePython : https://github.com/20tab/UnrealEnginePython" + "\n")
 	else:
-		ImportScript += "#The script must be used in Unreal Engine Editor with Python plugins : https://docs.unrealengine.com/en-US/Engine/Editor/ScriptingAndAutomation/Python" + "\n"
+		script.Write("#The script must be used in Unreal Engine Editor with Python plugins : https://docs.unrealengine.com/en-US/Engine/Editor/ScriptingAndAutomation/Python" + "\n")
 	if useSequencer == True:
-		ImportScript += "#Use this command : " + GetImportSequencerScriptCommand() + "\n"
+		script.Write("#Use this command : " + GetImportSequencerScriptCommand() + "\n")
 	else:
-		ImportScript += "#Use this command : " + GetImportAssetScriptCommand() + "\n"
-	ImportScript += "\n"
-	ImportScript += "\n"
-	return ImportScript
+		script.Write("#Use this command : " + GetImportAssetScriptCommand() + "\n")
+	script.Write("\n")
+	script.Write("\n")
 
 def WriteExportedAssetsDetail():
 	#Generate a config file for import assets in Ue4
@@ -198,11 +275,13 @@ def WriteExportedAssetsDetail():
 			fbx_path = (os.path.join(asset.exportPath, asset.assetName))
 			config.set(AssetSectionName, animOption+'_fbx_path', fbx_path)
 			config.set(AssetSectionName, animOption+'_import_path', os.path.join(obj.exportFolderName, scene.anim_subfolder_name) )
+			if asset.assetType == "MultiTakeAnim":
+				config.set(AssetSectionName, animOption+'_takes', asset.animTakes)
 
 
 	AssetForImport = []
 	for asset in scene.UnrealExportedAssetsList:
-		if (asset.assetType == "StaticMesh"
+		if asset.aliasOf == "" and (asset.assetType == "StaticMesh"
 		or asset.assetType == "SkeletalMesh"
 		or GetIsAnimation(asset.assetType)):
 			AssetForImport.append(asset)
@@ -223,7 +302,14 @@ def WriteExportedAssetsDetail():
 	#Import asset
 	return config
 
-def WriteSingleCameraAdditionalTrack(obj):
+def WriteSingleCameraAdditionalTrack(obj, script = None):
+	#Write the camera keys, the frames are evaluated while the keys are written.
+	#Without ScriptEmitter the text is returned
+
+	if script is None:
+		script = ScriptEmitter()
+		WriteSingleCameraAdditionalTrack(obj, script)
+		return script.GetText()
 
 	def getCameraFocusDistance(Camera, Target):
 		transA = Camera.matrix_world.copy()
@@ -237,24 +323,22 @@ def WriteSingleCameraAdditionalTrack(obj):
 	def getAllCamDistKeys(Camera, Target):
 		scene = bpy.context.scene
 		saveFrame = scene.frame_current #Save current frame
-		keys = []
-		for frame in range(scene.frame_start, scene.frame_end+1):
-			scene.frame_set(frame)
-			v = getCameraFocusDistance(Camera, Target)
-			keys.append((frame,v))
-		scene.frame_set(saveFrame)	#Resets previous start frame
-		return keys
+		try:
+			for frame in range(scene.frame_start, scene.frame_end+1):
+				scene.frame_set(frame)
+				yield (frame, getCameraFocusDistance(Camera, Target))
+		finally:
+			scene.frame_set(saveFrame)	#Resets previous start frame
 
 	def getAllKeysByMatrix(obj):
 		scene = bpy.context.scene
 		saveFrame = scene.frame_current #Save current frame
-		keys = []
-		for frame in range(scene.frame_start, scene.frame_end+1):
-			scene.frame_set(frame)
-			v = obj.matrix_world*1
-			keys.append((frame,v))
-		scene.frame_set(saveFrame)	#Resets previous start frame
-		return keys
+		try:
+			for frame in range(scene.frame_start, scene.frame_end+1):
+				scene.frame_set(frame)
+				yield (frame, obj.matrix_world)
+		finally:
+			scene.frame_set(saveFrame)	#Resets previous start frame
 
 	def getOneKeysByFcurves(obj,DataPath, DataValue, Frame, IsData = True):
 		scene = bpy.context.scene
@@ -274,7 +358,6 @@ def WriteSingleCameraAdditionalTrack(obj):
 
 	def getAllKeysByFcurves(obj,DataPath, DataValue, IsData = True):
 		scene = bpy.context.scene
-		keys = []
 		f = None
 		if IsData:
 			if obj.data.animation_data is not None:
@@ -288,23 +371,24 @@ def WriteSingleCameraAdditionalTrack(obj):
 
 		if f is not None:
 			for frame in range(scene.frame_start, scene.frame_end+1):
-				v = f.evaluate(frame)
-				keys.append((frame,v))
-			return keys
-		return[(scene.frame_start,DataValue)]
+				yield (frame, f.evaluate(frame))
+		else:
+			yield (scene.frame_start, DataValue)
 
 	scene = bpy.context.scene
-	ImportScript = ";This file was generated with the addons Blender for UnrealEngine : https://github.com/xavier150/Blender-For-UnrealEngine-Addons" + "\n"
-	ImportScript += ";This file contains additional Camera animation informations that is not supported with .fbx files" + "\n"
-	ImportScript += ";The script must be used in Unreal Engine Editor with UnrealEnginePython : https://github.com/20tab/UnrealEnginePython" + "\n"
-	ImportScript += "\n\n\n"
+	script.Write(";This file was generated with the addons Blender for UnrealEngine : https://github.com/xavier150/Blender-For-UnrealEngine-Addons" + "\n")
+	script.Write(";This file contains additional Camera animation informations that is not supported with .fbx files" + "\n")
+	script.Write(";The script must be used in Unreal Engine Editor with UnrealEnginePython : https://github.com/20tab/UnrealEnginePython" + "\n")
+	script.Write("\n\n\n")
 
 	#Write TransformMatrix keys
-	ImportScript += "[Transform]" + "\n"
+	script.Write("[Transform]" + "\n")
+	axisCorrection = Matrix.Rotation(radians(90.0), 4, 'Y') @ Matrix.Rotation(radians(-90.0), 4, 'X')
+	locationScale = 100 * bpy.context.scene.unit_settings.scale_length
 	for key in getAllKeysByMatrix(obj):
 		#GetWorldPostion
-		matrix = key[1] @ Matrix.Rotation(radians(90.0), 4, 'Y') @ Matrix.Rotation(radians(-90.0), 4, 'X')
-		l = matrix.to_translation() * 100 * bpy.context.scene.unit_settings.scale_length
+		matrix = key[1] @ axisCorrection
+		l = matrix.to_translation() * locationScale
 		r = matrix.to_euler()
 		s = matrix.to_scale()
 
@@ -314,21 +398,19 @@ def WriteSingleCameraAdditionalTrack(obj):
 
 
 		transform = [array_location[0], array_location[1], array_location[2], array_rotation[0], array_rotation[1], array_rotation[2], array_scale[0], array_scale[1], array_scale[2]]
-		strTransform = ""
-		for t in transform:
-			strTransform += str(t)+","
-		ImportScript += str(key[0])+": " + strTransform + "\n"
-	ImportScript += "\n\n\n"
+		strTransform = "".join(str(t)+"," for t in transform)
+		script.Write(str(key[0])+": " + strTransform + "\n")
+	script.Write("\n\n\n")
 
 	#Write FocalLength keys
-	ImportScript += "[FocalLength]" + "\n"
+	script.Write("[FocalLength]" + "\n")
 	for key in getAllKeysByFcurves(obj,"lens",obj.data.lens):
 		#Fov type return auto to lens
-		ImportScript += str(key[0])+": "+str(key[1]) + "\n"
-	ImportScript += "\n\n\n"
+		script.Write(str(key[0])+": "+str(key[1]) + "\n")
+	script.Write("\n\n\n")
 
 	#Write FocusDistance keys
-	ImportScript += "[FocusDistance]" + "\n"
+	script.Write("[FocusDistance]" + "\n")
 	if obj.data.dof.focus_object is None:
 		DataKeys = getAllKeysByFcurves(obj,"dof.focus_distance",obj.data.dof.focus_distance)
 	else:
@@ -336,90 +418,72 @@ def WriteSingleCameraAdditionalTrack(obj):
 	for key in DataKeys:
 		CorrectedValue = key[1]*100
 		if CorrectedValue > 0:
-			ImportScript += str(key[0])+": "+str(CorrectedValue) + "\n"
+			script.Write(str(key[0])+": "+str(CorrectedValue) + "\n")
 		else:
-			ImportScript += str(key[0])+": "+str(100000) + "\n" #100000 is default value in ue4
-	ImportScript += "\n\n\n"
+			script.Write(str(key[0])+": "+str(100000) + "\n") #100000 is default value in ue4
+	script.Write("\n\n\n")
 
 	#Write Aperture (Depth of Field) keys
-	ImportScript += "[Aperture]" + "\n"
+	script.Write("[Aperture]" + "\n")
 	if scene.render.engine == "BLENDER_EEVEE" or scene.render.engine == "CYCLES" or scene.render.engine == "BLENDER_WORKBENCH":
 		DataKeys = getAllKeysByFcurves(obj,"dof.aperture_fstop",obj.data.dof.aperture_fstop)
 		for key in DataKeys:
-			ImportScript += str(key[0])+": "+str(key[1]) + "\n"
+			script.Write(str(key[0])+": "+str(key[1]) + "\n")
 
 	else:
-		ImportScript += "0: 21\n" #21 is default value in ue4
-	ImportScript += "\n\n\n"
+		script.Write("0: 21\n") #21 is default value in ue4
+	script.Write("\n\n\n")
 
 	#Write Spawned keys
-	ImportScript += "[Spawned]" + "\n"
+	script.Write("[Spawned]" + "\n")
 	lastKeyValue = None
 	for key in getAllKeysByFcurves(obj,"hide_viewport",obj.hide_viewport, False):
 		boolKey = (key[1] < 1) #Inversed for convert hide to spawn
 		if lastKeyValue is None:
-			ImportScript += str(key[0])+": "+str(boolKey) + "\n"
+			script.Write(str(key[0])+": "+str(boolKey) + "\n")
 			lastKeyValue = boolKey
 		else:
 			if boolKey != lastKeyValue:
-				ImportScript += str(key[0])+": "+str(boolKey) + "\n"
+				script.Write(str(key[0])+": "+str(boolKey) + "\n")
 				lastKeyValue = boolKey
-	ImportScript += "\n\n\n"
-
-	return ImportScript
-
-def WriteSingleMeshAdditionalParameter(obj):
+	script.Write("\n\n\n")
 
-	scene = bpy.context.scene
-	config = configparser.ConfigParser(allow_no_value=True)
-	sockets = []
-	for socket in GetSocketDesiredChild(obj):
-		sockets.append(socket)
 
-	#Comment
-	config.add_section('Comment')
-	config.set('Comment', '; This file was generated with the addons Blender for UnrealEngine : https://github.com/xavier150/Blender-For-UnrealEngine-Addons')
-	config.set('Comment', '; This file contains Additional StaticMesh and SkeletalMesh parameters informations that is not supported with .fbx files')
-	config.set('Comment', '; The script must be used in Unreal Engine Editor with UnrealEnginePython : https://github.com/20tab/UnrealEnginePython')
+def GetMeshAdditionalParameter(obj, settings = None):
+	#Return the additional parameters of a StaticMesh or SkeletalMesh
+	#{"LevelOfDetail": [lod file path, ...], "Sockets": [[SocketName, BoneName, Location, Rotation, Scale], ...]}
 
-	#Defaultsettings
-	config.add_section('DefaultSettings')
-	#config.set('Defaultsettings', 'SocketNumber', str(len(sockets)))
+	settings = bfu_ExportSettings.GetExportSettings(settings)
+	parameter = {}
 
 	#Level of detail
-	config.add_section("LevelOfDetail")
-	if obj.Ue4Lod1 is not None:
-		loc = os.path.join(GetObjExportDir(obj.Ue4Lod1, True), GetObjExportFileName(obj.Ue4Lod1))
-		config.set('LevelOfDetail', 'lod_1', str(loc))
-	if obj.Ue4Lod2 is not None:
-		loc = os.path.join(GetObjExportDir(obj.Ue4Lod2, True), GetObjExportFileName(obj.Ue4Lod2))
-		config.set('LevelOfDetail', 'lod_2', str(loc))
-	if obj.Ue4Lod3 is not None:
-		loc = os.path.join(GetObjExportDir(obj.Ue4Lod3, True), GetObjExportFileName(obj.Ue4Lod3))
-		config.set('LevelOfDetail', 'lod_3', str(loc))
-	if obj.Ue4Lod4 is not None:
-		loc = os.path.join(GetObjExportDir(obj.Ue4Lod4, True), GetObjExportFileName(obj.Ue4Lod4))
-		config.set('LevelOfDetail', 'lod_4', str(loc))
-	if obj.Ue4Lod5 is not None:
-		loc = os.path.join(GetObjExportDir(obj.Ue4Lod5, True), GetObjExportFileName(obj.Ue4Lod5))
-		config.set('LevelOfDetail', 'lod_5', str(loc))
+	lods = []
+	autoLodRatios = settings.GetObject(obj).GetAutoLodRatios()
+	if len(autoLodRatios) > 0:
+		for lodLevel in range(1, len(autoLodRatios)+1):
+			lods.append(os.path.join(GetObjExportDir(obj, True), GetAutoLodExportFileName(obj, lodLevel)))
+	else:
+		for lod in (obj.Ue4Lod1, obj.Ue4Lod2, obj.Ue4Lod3, obj.Ue4Lod4, obj.Ue4Lod5):
+			if lod is not None:
+				lods.append(os.path.join(GetObjExportDir(lod, True), GetObjExportFileName(lod)))
+	parameter["LevelOfDetail"] = lods
 
 	#Sockets
 	if GetAssetType(obj) == "SkeletalMesh":
 
-		config.add_section('Sockets')
-		config.set('Sockets', '; SocketName, BoneName, Location, Rotation, Scale')
-		addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
-
-		for i, socket in enumerate(sockets):
+		sockets = []
+		resetArmatures = set()
+		for socket in GetSocketDesiredChild(obj):
 			SocketName = socket.name[7:] if socket.name.startswith("SOCKET_") else socket.name
 
 			if socket.parent.exportDeformOnly == True:
-				b = getFirstDeformBoneParent(socket.parent.data.bones[socket.parent_bone])
+				b = socket.parent.data.bones[GetBoneTopology(socket.parent.data).firstDeformParent[socket.parent_bone]]
 			else:
 				b = socket.parent.data.bones[socket.parent_bone]
 
-			ResetArmaturePose(socket.parent)
+			if socket.parent not in resetArmatures:
+				ResetArmaturePose(socket.parent)
+				resetArmatures.add(socket.parent)
 			#GetRelativePostion
 			bml = b.matrix_local #Bone
 			am = socket.parent.matrix_world #Armature
@@ -427,42 +491,109 @@ def WriteSingleMeshAdditionalParameter(obj):
 			RelativeMatrix = (bml.inverted() @ am.inverted() @ em)
 			l = RelativeMatrix.to_translation()
 			r = RelativeMatrix.to_euler()
-			s = socket.scale*addon_prefs.skeletalSocketsImportedSize
+			s = socket.scale*settings.skeletalSocketsImportedSize
 
 			#Convet to array for configparser and convert value for Unreal
 			array_location = [l[0], l[1]*-1, l[2]]
 			array_rotation = [degrees(r[0]), degrees(r[1])*-1, degrees(r[2])*-1]
 			array_scale = [s[0], s[1], s[2]]
 
-			MySocket = [SocketName, b.name.replace('.','_'), array_location, array_rotation, array_scale]
-			config.set('Sockets', 'socket_'+str(i), str(MySocket))
+			sockets.append([SocketName, b.name.replace('.','_'), array_location, array_rotation, array_scale])
+		parameter["Sockets"] = sockets
+
+	return parameter
+
+def WriteSingleMeshAdditionalParameter(obj, settings = None):
+
+	parameter = GetMeshAdditionalParameter(obj, settings)
+	config = configparser.ConfigParser(allow_no_value=True)
+
+	#Comment
+	config.add_section('Comment')
+	config.set('Comment', '; This file was generated with the addons Blender for UnrealEngine : https://github.com/xavier150/Blender-For-UnrealEngine-Addons')
+	config.set('Comment', '; This file contains Additional StaticMesh and SkeletalMesh parameters informations that is not supported with .fbx files')
+	config.set('Comment', '; The script must be used in Unreal Engine Editor with UnrealEnginePython : https://github.com/20tab/UnrealEnginePython')
+
+	#Defaultsettings
+	config.add_section('DefaultSettings')
+	#config.set('Defaultsettings', 'SocketNumber', str(len(sockets)))
+
+	#Level of detail
+	config.add_section("LevelOfDetail")
+	for i, loc in enumerate(parameter["LevelOfDetail"]):
+		config.set('LevelOfDetail', 'lod_'+str(i+1), str(loc))
+
+	#Sockets
+	if "Sockets" in parameter:
 
+		config.add_section('Sockets')
+		config.set('Sockets', '; SocketName, BoneName, Location, Rotation, Scale')
+		for i, MySocket in enumerate(parameter["Sockets"]):
+			config.set('Sockets', 'socket_'+str(i), str(MySocket))
 
 	return config
 
-def WriteAllTextFiles():
+def WriteAdditionalDataManifest(script = None, settings = None):
+	#Write the additional parameters of all the exported meshes in one json manifest
+	#indexed by object name. The assets are written one by one in the ScriptEmitter.
+	#Without ScriptEmitter the text is returned
+
+	if script is None:
+		script = ScriptEmitter()
+		WriteAdditionalDataManifest(script, settings)
+		return script.GetText()
 
 	scene = bpy.context.scene
-	if scene.text_ExportLog:
-		Text = WriteExportLog()
-		if Text is not None:
-			Filename = scene.file_export_log_name
-			ExportSingleText(Text, scene.export_other_file_path, Filename)
+	settings = bfu_ExportSettings.GetExportSettings(settings)
 
-	#Import script
-	if scene.text_ImportAssetScript:
-		addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
-		Text = bfu_WriteImportAssetScript.WriteImportAssetScript(addon_prefs.use20TabScript)
-		if Text is not None:
-			Filename = scene.file_import_asset_script_name
-			ExportSingleText(Text, scene.export_other_file_path, Filename)
+	script.Write("{" + "\n")
+	script.Write('\t"Comment": ' + json.dumps("This file was generated with the addons Blender for UnrealEngine : https://github.com/xavier150/Blender-For-UnrealEngine-Addons") + "," + "\n")
+	script.Write('\t"Assets": {')
+	separator = "\n"
+	writtenObjects = set()
+	for asset in scene.UnrealExportedAssetsList:
+		obj = asset.object
+		if asset.assetType not in ("StaticMesh", "SkeletalMesh") or asset.lodLevel > 0 or obj is None or obj.name in writtenObjects:
+			continue
+		if asset.assetType == "StaticMesh" and settings.GetObject(obj).ExportAsLod == True:
+			continue
+		writtenObjects.add(obj.name)
+		if asset.aliasOf != "":
+			parameter = {"AliasOf": asset.aliasOf}
+		else:
+			parameter = GetMeshAdditionalParameter(obj, settings)
+		parameter["AssetType"] = asset.assetType
+		parameter["FilePath"] = os.path.join(asset.exportPath, asset.assetName)
+		script.Write(separator + "\t\t" + json.dumps(obj.name) + ": " + json.dumps(parameter, sort_keys=True))
+		separator = "," + "\n"
+	script.Write("\n" + "\t}" + "\n")
+	script.Write("}" + "\n")
 
-	if scene.text_ImportSequenceScript:
-		addon_prefs = bpy.context.preferences.addons["blender-for-unrealengine"].preferences
-		Text = bfu_WriteImportSequencerScript.WriteImportSequencerScript(addon_prefs.use20TabScript)
-		if Text is not None:
-			Filename = scene.file_import_sequencer_script_name
-			ExportSingleText(Text, scene.export_other_file_path, Filename)
+def WriteAllTextFiles(settings = None, budgets = None):
+
+	scene = bpy.context.scene
+	settings = bfu_ExportSettings.GetExportSettings(settings)
+	if settings.text_ExportLog:
+		Filename = scene.file_export_log_name
+		ExportSingleScript(lambda script: WriteExportLog(script, settings, budgets), scene.export_other_file_path, Filename)
+
+	#Import script
+	if settings.text_ImportAssetScript:
+		Filename = scene.file_import_asset_script_name
+		ExportSingleScript(lambda script: bfu_WriteImportAssetScript.WriteImportAssetScript(settings.use20TabScript, script, settings), scene.export_other_file_path, Filename)
+
+	if settings.text_ImportSequenceScript:
+		Filename = scene.file_import_sequencer_script_name
+		ExportSingleScript(lambda script: bfu_WriteImportSequencerScript.WriteImportSequencerScript(settings.use20TabScript, script), scene.export_other_file_path, Filename)
+
+	if settings.text_ImportAssetScript and any(asset.assetType == "Layout" for asset in scene.UnrealExportedAssetsList):
+		Filename = scene.file_import_layout_script_name
+		ExportSingleScript(lambda script: bfu_WriteImportLayoutScript.WriteImportLayoutScript(settings.use20TabScript, script, settings), scene.export_other_file_path, Filename)
+
+	#Additional data of all the meshes
+	if settings.useAdditionalDataManifest:
+		Filename = scene.file_additional_data_manifest_name
+		ExportSingleScript(lambda script: WriteAdditionalDataManifest(script, settings), scene.export_other_file_path, Filename)
 
 	#ConfigParser
 	'''